@@ -3,6 +3,9 @@ from .settings import *  # pylint: disable-all
 # Use in-memory cache
 CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 
+# Disable local versioned caches
+MISAGO_LOCAL_CACHE_SIZE = 0
+
 # Disable Celery backend
 CELERY_BROKER_URL = None
 
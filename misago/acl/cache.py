@@ -1,22 +1,16 @@
-from django.core.cache import cache
-
 from . import ACL_CACHE
-from ..cache.versions import invalidate_cache
+from ..cache.versionedcache import VersionedCache
+
+acl_cache = VersionedCache(ACL_CACHE)
 
 
 def get_acl_cache(user, cache_versions):
-    key = get_cache_key(user, cache_versions)
-    return cache.get(key)
+    return acl_cache.get(cache_versions, user.acl_key)
 
 
 def set_acl_cache(user, cache_versions, user_acl):
-    key = get_cache_key(user, cache_versions)
-    cache.set(key, user_acl)
-
-
-def get_cache_key(user, cache_versions):
-    return "acl_%s_%s" % (user.acl_key, cache_versions[ACL_CACHE])
+    acl_cache.set(cache_versions, user_acl, user.acl_key)
 
 
 def clear_acl_cache():
-    invalidate_cache(ACL_CACHE)
+    acl_cache.invalidate()
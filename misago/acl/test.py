@@ -1,3 +1,4 @@
+import copy
 from contextlib import ContextDecorator, ExitStack, contextmanager
 from unittest.mock import patch
 
@@ -21,7 +22,8 @@ class patch_user_acl(ContextDecorator, ExitStack):
         self.acl_patch = acl_patch
 
     def patched_get_user_acl(self, user, cache_versions):
-        user_acl = get_user_acl(user, cache_versions)
+        # Patch mutable copy of ACL to keep shared ACL unchanged
+        user_acl = copy.deepcopy(get_user_acl(user, cache_versions).copy())
         self.apply_acl_patches(user, user_acl)
         return user_acl
 
@@ -1,3 +1,5 @@
+import pytest
+
 from ..useracl import get_user_acl
 
 
@@ -102,3 +104,31 @@ def test_getter_is_not_setting_new_cache_if_cache_is_set(
 
     get_user_acl(anonymous_user, cache_versions)
     cache_set.assert_not_called()
+
+
+def test_getter_is_not_mutating_cached_acl(mocker, cache_versions, user):
+    cached_acl = {}
+    mocker.patch("django.core.cache.cache.get", return_value=cached_acl)
+
+    get_user_acl(user, cache_versions)
+    assert cached_acl == {}
+
+
+def test_user_acl_is_read_only(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    with pytest.raises(TypeError):
+        acl["user_id"] = 123
+
+
+def test_user_acl_keeps_user_data_separate_from_shared_acl(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    assert acl["user_id"] == user.id
+    assert "user_id" not in acl.shared_acl
+    assert acl["categories"] is acl.shared_acl["categories"]
+
+
+def test_user_acl_copy_is_dict(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    acl_copy = acl.copy()
+    assert isinstance(acl_copy, dict)
+    assert acl_copy == acl
@@ -1,5 +1,8 @@
 import json
 
+from django.test import override_settings
+
+from .. import useracl
 from ..useracl import get_user_acl, serialize_user_acl
 
 
@@ -12,3 +15,34 @@ def test_user_acl_is_json_serializeable(cache_versions, user):
     acl = get_user_acl(user, cache_versions)
     serialized_acl = serialize_user_acl(acl)
     assert json.dumps(serialized_acl)
+
+
+def test_serialized_user_acl_includes_user_data(cache_versions, user):
+    acl = get_user_acl(user, cache_versions)
+    serialized_acl = serialize_user_acl(acl)
+    assert serialized_acl["user_id"] == user.id
+    assert "cache_versions" not in serialized_acl
+
+
+def test_serialized_user_acl_excludes_cache_versions_from_patched_acl(
+    cache_versions, user
+):
+    acl = get_user_acl(user, cache_versions).copy()
+    serialized_acl = serialize_user_acl(acl)
+    assert serialized_acl["user_id"] == user.id
+    assert "cache_versions" not in serialized_acl
+
+
+@override_settings(MISAGO_LOCAL_CACHE_SIZE=10)
+def test_serialized_shared_acl_is_reused_for_users_with_same_acl_key(
+    mocker, cache_versions, user, other_user
+):
+    serializer = mocker.spy(useracl, "serialize_acl")
+
+    user_acl = get_user_acl(user, cache_versions)
+    other_user_acl = get_user_acl(other_user, cache_versions)
+    assert user_acl.cache_key == other_user_acl.cache_key
+
+    assert serialize_user_acl(user_acl)["user_id"] == user.id
+    assert serialize_user_acl(other_user_acl)["user_id"] == other_user.id
+    serializer.assert_called_once()
@@ -1,28 +1,91 @@
 import copy
+from collections.abc import Mapping
 
 from . import buildacl
-from .cache import get_acl_cache, set_acl_cache
+from .cache import acl_cache, get_acl_cache, set_acl_cache
 from .providers import providers
+from ..cache.versionedcache import LocalCache, register_local_cache
+
+serialized_acl_cache = register_local_cache(LocalCache())
+
+
+class UserACL(Mapping):
+    """Read-only user ACL.
+
+    Combines ACL shared by all users with same roles with thin overlay of
+    user's own data. Shared part is never copied or changed.
+    """
+
+    __slots__ = ("cache_key", "shared_acl", "user_data")
+
+    def __init__(self, cache_key, shared_acl, user_data):
+        self.cache_key = cache_key
+        self.shared_acl = shared_acl
+        self.user_data = user_data
+
+    def __getitem__(self, key):
+        if key in self.user_data:
+            return self.user_data[key]
+        return self.shared_acl[key]
+
+    def __contains__(self, key):
+        return key in self.user_data or key in self.shared_acl
+
+    def __iter__(self):
+        yield from self.user_data
+        for key in self.shared_acl:
+            if key not in self.user_data:
+                yield key
+
+    def __len__(self):
+        return len(self.shared_acl.keys() | self.user_data.keys())
+
+    def __repr__(self):
+        return "<UserACL %s>" % self.cache_key
+
+    def copy(self):
+        return dict(self)
 
 
 def get_user_acl(user, cache_versions):
-    user_acl = get_acl_cache(user, cache_versions)
-    if user_acl is None:
-        user_acl = buildacl.build_acl(user.get_roles())
-        set_acl_cache(user, cache_versions, user_acl)
-    user_acl["user_id"] = user.id
-    user_acl["is_authenticated"] = bool(user.is_authenticated)
-    user_acl["is_anonymous"] = bool(user.is_anonymous)
-    user_acl["is_staff"] = user.is_staff
-    user_acl["is_superuser"] = user.is_superuser
-    user_acl["cache_versions"] = cache_versions.copy()
-    return user_acl
+    shared_acl = get_acl_cache(user, cache_versions)
+    if shared_acl is None:
+        shared_acl = buildacl.build_acl(user.get_roles())
+        set_acl_cache(user, cache_versions, shared_acl)
+
+    return UserACL(
+        acl_cache.get_cache_key(cache_versions, user.acl_key),
+        shared_acl,
+        {
+            "user_id": user.id,
+            "is_authenticated": bool(user.is_authenticated),
+            "is_anonymous": bool(user.is_anonymous),
+            "is_staff": user.is_staff,
+            "is_superuser": user.is_superuser,
+            "cache_versions": cache_versions.copy(),
+        },
+    )
 
 
 def serialize_user_acl(user_acl):
     """serialize authenticated user's ACL"""
-    serialized_acl = copy.deepcopy(user_acl)
+    if not isinstance(user_acl, UserACL):
+        return serialize_acl(user_acl)
+
+    serialized_acl = serialized_acl_cache.get(user_acl.cache_key)
+    if serialized_acl is None:
+        serialized_acl = serialize_acl(user_acl.shared_acl)
+        serialized_acl_cache.set(user_acl.cache_key, serialized_acl)
+
+    serialized_acl = serialized_acl.copy()
+    serialized_acl.update(user_acl.user_data)
     serialized_acl.pop("cache_versions")
+    return serialized_acl
+
+
+def serialize_acl(acl):
+    serialized_acl = copy.deepcopy(dict(acl))
+    serialized_acl.pop("cache_versions", None)
 
     for serializer in providers.get_user_acl_serializers():
         serializer(serialized_acl)
@@ -41,6 +41,7 @@ class NotificationSerializer(serializers.ModelSerializer):
             "createdAt": data["created_at"],
             "actor": actor_data,
             "actorName": obj.actor_name,
+            "actorsCount": obj.actors_count,
             "message": registry.get_message(obj),
             "url": obj.get_absolute_url(),
         }
@@ -1,11 +1,11 @@
-from .versions import get_cache_versions
+from .versions import get_cache_versions_snapshot
 
 
 def cache_versions_middleware(get_response):
     """Sets request.cache_versions attribute with dict of cache versions."""
 
     def middleware(request):
-        request.cache_versions = get_cache_versions()
+        request.cache_versions = get_cache_versions_snapshot()
         return get_response(request)
 
     return middleware
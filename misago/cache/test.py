@@ -1,4 +1,4 @@
-from .versions import get_cache_versions
+from .versions import clear_cache_versions_snapshot, get_cache_versions
 
 
 class assert_invalidates_cache:
@@ -6,6 +6,7 @@ class assert_invalidates_cache:
         self.cache = cache
 
     def __enter__(self):
+        clear_cache_versions_snapshot()
         self.versions = get_cache_versions()
         return self
 
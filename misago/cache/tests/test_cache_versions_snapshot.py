@@ -0,0 +1,81 @@
+from django.test import override_settings
+
+from ..models import CacheVersion
+from ..test import assert_invalidates_cache
+from ..versions import (
+    clear_cache_versions_snapshot,
+    get_cache_versions_snapshot,
+    invalidate_all_caches,
+    invalidate_cache,
+)
+
+
+def test_snapshot_returns_cache_versions(cache_version):
+    cache_versions = get_cache_versions_snapshot()
+    assert cache_versions[cache_version.cache] == cache_version.version
+
+
+def test_snapshot_is_reused_until_cleared(django_assert_num_queries, cache_version):
+    get_cache_versions_snapshot()
+    with django_assert_num_queries(0):
+        get_cache_versions_snapshot()
+
+    clear_cache_versions_snapshot()
+    with django_assert_num_queries(1):
+        get_cache_versions_snapshot()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=5)
+def test_snapshot_is_refreshed_when_its_expired(
+    mocker, django_assert_num_queries, cache_version
+):
+    monotonic = mocker.patch("misago.cache.versions.monotonic", return_value=100)
+    get_cache_versions_snapshot()
+
+    monotonic.return_value = 104
+    with django_assert_num_queries(0):
+        get_cache_versions_snapshot()
+
+    monotonic.return_value = 106
+    with django_assert_num_queries(1):
+        get_cache_versions_snapshot()
+
+
+@override_settings(MISAGO_CACHE_VERSIONS_TTL=0)
+def test_snapshot_is_disabled_if_ttl_is_zero(django_assert_num_queries, cache_version):
+    with django_assert_num_queries(2):
+        get_cache_versions_snapshot()
+        get_cache_versions_snapshot()
+
+
+def test_snapshot_returns_copy_of_versions(cache_version):
+    get_cache_versions_snapshot()[cache_version.cache] = "changed"
+    cache_versions = get_cache_versions_snapshot()
+    assert cache_versions[cache_version.cache] == cache_version.version
+
+
+def test_invalidating_cache_clears_snapshot(cache_version):
+    get_cache_versions_snapshot()
+    invalidate_cache(cache_version.cache)
+
+    cache_versions = get_cache_versions_snapshot()
+    updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+    assert cache_versions[cache_version.cache] == updated_cache_version.version
+
+
+def test_invalidating_all_caches_clears_snapshot(cache_version):
+    get_cache_versions_snapshot()
+    invalidate_all_caches()
+
+    cache_versions = get_cache_versions_snapshot()
+    updated_cache_version = CacheVersion.objects.get(cache=cache_version.cache)
+    assert cache_versions[cache_version.cache] == updated_cache_version.version
+
+
+def test_assert_invalidates_cache_works_with_snapshot(cache_version):
+    old_versions = get_cache_versions_snapshot()
+    with assert_invalidates_cache(cache_version.cache):
+        invalidate_cache(cache_version.cache)
+
+    new_versions = get_cache_versions_snapshot()
+    assert old_versions[cache_version.cache] != new_versions[cache_version.cache]
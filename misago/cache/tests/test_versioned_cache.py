@@ -0,0 +1,152 @@
+import pytest
+
+from ..test import assert_invalidates_cache
+from ..versionedcache import (
+    LocalCache,
+    VersionedCache,
+    clear_versioned_caches,
+    get_versioned_caches_stats,
+    register_local_cache,
+)
+
+CACHE_NAME = "test_cache"
+
+
+@pytest.fixture
+def cache_get(mocker):
+    return mocker.patch("django.core.cache.cache.get", return_value={"test": True})
+
+
+@pytest.fixture
+def cache_set(mocker):
+    return mocker.patch("django.core.cache.cache.set")
+
+
+@pytest.fixture
+def versioned_cache():
+    return VersionedCache(CACHE_NAME, maxsize=2)
+
+
+@pytest.fixture
+def cache_versions():
+    return {CACHE_NAME: "abcdefgh"}
+
+
+def test_local_cache_returns_none_for_missing_key():
+    local_cache = LocalCache(2)
+    assert local_cache.get("key") is None
+    assert local_cache.misses == 1
+
+
+def test_local_cache_returns_stored_value():
+    local_cache = LocalCache(2)
+    local_cache.set("key", "value")
+    assert local_cache.get("key") == "value"
+    assert local_cache.hits == 1
+
+
+def test_local_cache_evicts_least_recently_used_value():
+    local_cache = LocalCache(2)
+    local_cache.set("a", 1)
+    local_cache.set("b", 2)
+    local_cache.get("a")
+    local_cache.set("c", 3)
+
+    assert local_cache.get("a") == 1
+    assert local_cache.get("b") is None
+    assert local_cache.get("c") == 3
+    assert len(local_cache) == 2
+
+
+def test_local_cache_with_zero_maxsize_is_not_storing_values():
+    local_cache = LocalCache(0)
+    local_cache.set("key", "value")
+    assert local_cache.get("key") is None
+
+
+def test_local_cache_doesnt_return_values_after_being_disabled():
+    local_cache = LocalCache(2)
+    local_cache.set("key", "value")
+    local_cache._maxsize = 0
+    assert local_cache.get("key") is None
+
+
+def test_registered_local_cache_is_cleared_with_versioned_caches():
+    local_cache = register_local_cache(LocalCache(2))
+    local_cache.set("key", "value")
+
+    clear_versioned_caches()
+    assert local_cache.get("key") is None
+
+
+def test_local_cache_reports_stats():
+    local_cache = LocalCache(2)
+    local_cache.set("key", "value")
+    local_cache.get("key")
+    local_cache.get("other")
+
+    assert local_cache.get_stats() == {
+        "size": 1,
+        "maxsize": 2,
+        "hits": 1,
+        "misses": 1,
+    }
+
+
+def test_versioned_cache_reads_value_from_shared_cache_once(
+    cache_get, versioned_cache, cache_versions
+):
+    assert versioned_cache.get(cache_versions) == {"test": True}
+    assert versioned_cache.get(cache_versions) == {"test": True}
+    cache_get.assert_called_once_with("test_cache_abcdefgh")
+
+
+def test_versioned_cache_is_not_storing_missing_value_locally(
+    cache_get, versioned_cache, cache_versions
+):
+    cache_get.return_value = None
+    assert versioned_cache.get(cache_versions) is None
+    assert versioned_cache.get(cache_versions) is None
+    assert cache_get.call_count == 2
+
+
+def test_versioned_cache_sets_value_in_shared_and_local_cache(
+    cache_get, cache_set, versioned_cache, cache_versions
+):
+    versioned_cache.set(cache_versions, {"test": "local"})
+    cache_set.assert_called_once_with("test_cache_abcdefgh", {"test": "local"})
+
+    assert versioned_cache.get(cache_versions) == {"test": "local"}
+    cache_get.assert_not_called()
+
+
+def test_versioned_cache_key_includes_optional_key(
+    cache_get, versioned_cache, cache_versions
+):
+    versioned_cache.get(cache_versions, "key")
+    cache_get.assert_called_once_with("test_cache_key_abcdefgh")
+
+
+def test_versioned_cache_is_not_returning_value_for_other_version(
+    cache_get, cache_set, versioned_cache, cache_versions
+):
+    versioned_cache.set(cache_versions, {"test": "local"})
+    assert versioned_cache.get({CACHE_NAME: "changed"}) == {"test": True}
+    cache_get.assert_called_once_with("test_cache_changed")
+
+
+def test_versioned_cache_invalidates_cache_version(cache_version):
+    versioned_cache = VersionedCache(cache_version.cache)
+    with assert_invalidates_cache(cache_version.cache):
+        versioned_cache.invalidate()
+
+
+def test_versioned_caches_stats_are_reported(
+    cache_get, versioned_cache, cache_versions
+):
+    versioned_cache.get(cache_versions)
+    versioned_cache.get(cache_versions)
+
+    stats = get_versioned_caches_stats()
+    assert stats[CACHE_NAME]["hits"] == 1
+    assert stats[CACHE_NAME]["misses"] == 1
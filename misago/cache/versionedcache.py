@@ -0,0 +1,143 @@
+from collections import OrderedDict
+from threading import Lock
+
+from django.core.cache import cache
+
+from ..conf import settings
+from .versions import invalidate_cache
+
+versioned_caches = []
+local_caches = []
+
+
+class LocalCache:
+    """Bounded, thread-safe LRU cache of objects kept in worker's memory.
+
+    Objects stored in this cache are shared between requests handled by the
+    worker and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize=None):
+        self._maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def maxsize(self):
+        if self._maxsize is None:
+            return settings.MISAGO_LOCAL_CACHE_SIZE
+        return self._maxsize
+
+    def get(self, key):
+        if not self.maxsize:
+            return None  # Don't return values stored when cache was enabled
+
+        with self._lock:
+            try:
+                value = self._items[key]
+            except KeyError:
+                self.misses += 1
+                return None
+
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        maxsize = self.maxsize
+        if not maxsize:
+            return
+
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self):
+        return {
+            "size": len(self._items),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+class VersionedCache:
+    """Two-tier cache for objects invalidated with cache versions.
+
+    Objects are looked up in worker's local LRU cache first and in Django's
+    shared cache after that. Cache keys include cache's current version, so
+    objects stored for older versions are never returned and get evicted
+    from local cache as new ones are added.
+    """
+
+    def __init__(self, cache_name, maxsize=None):
+        self.cache_name = cache_name
+        self.local_cache = LocalCache(maxsize)
+
+        versioned_caches.append(self)
+
+    def get(self, cache_versions, key=None):
+        cache_key = self.get_cache_key(cache_versions, key)
+
+        value = self.local_cache.get(cache_key)
+        if value is None:
+            value = cache.get(cache_key)
+            if value is not None:
+                self.local_cache.set(cache_key, value)
+
+        return value
+
+    def set(self, cache_versions, value, key=None):
+        cache_key = self.get_cache_key(cache_versions, key)
+        cache.set(cache_key, value)
+        self.local_cache.set(cache_key, value)
+
+    def get_cache_key(self, cache_versions, key=None):
+        version = cache_versions[self.cache_name]
+        if key is None:
+            return "%s_%s" % (self.cache_name, version)
+        return "%s_%s_%s" % (self.cache_name, key, version)
+
+    def invalidate(self):
+        invalidate_cache(self.cache_name)
+
+    def clear_local_cache(self):
+        self.local_cache.clear()
+
+    def get_stats(self):
+        return self.local_cache.get_stats()
+
+
+def get_versioned_caches_stats():
+    return {i.cache_name: i.get_stats() for i in versioned_caches}
+
+
+def register_local_cache(local_cache):
+    """Registers standalone local cache to be cleared with versioned caches.
+
+    Use for local caches keyed by cache versions, which don't need shared
+    cache behind them.
+    """
+    local_caches.append(local_cache)
+    return local_cache
+
+
+def clear_versioned_caches():
+    for versioned_cache in versioned_caches:
+        versioned_cache.clear_local_cache()
+    for local_cache in local_caches:
+        local_cache.clear()
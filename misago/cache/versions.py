@@ -1,16 +1,68 @@
+from threading import Lock
+from time import monotonic
+
+from django.db import transaction
+
+from ..conf import settings
 from .models import CacheVersion
 from .utils import generate_version_string
 
+_snapshot_lock = Lock()
+_snapshot = None
+_snapshot_generation = 0
+
 
 def get_cache_versions():
     queryset = CacheVersion.objects.all()
     return {i.cache: i.version for i in queryset}
 
 
+def get_cache_versions_snapshot():
+    """Returns dict of cache versions from worker's in-process snapshot.
+
+    Snapshot is refreshed from database when it's older than
+    MISAGO_CACHE_VERSIONS_TTL seconds, or when this worker invalidates a cache.
+    Setting MISAGO_CACHE_VERSIONS_TTL to 0 disables the snapshot.
+    """
+    ttl = settings.MISAGO_CACHE_VERSIONS_TTL
+    if not ttl:
+        return get_cache_versions()
+
+    snapshot = _snapshot
+    if snapshot and snapshot[0] > monotonic():
+        return snapshot[1].copy()
+
+    return refresh_cache_versions_snapshot(ttl)
+
+
+def refresh_cache_versions_snapshot(ttl):
+    global _snapshot
+
+    generation = _snapshot_generation
+    expires_at = monotonic() + ttl
+    cache_versions = get_cache_versions()
+
+    with _snapshot_lock:
+        # Don't store versions that were read before cache was invalidated
+        if generation == _snapshot_generation:
+            _snapshot = (expires_at, cache_versions)
+
+    return cache_versions.copy()
+
+
+def clear_cache_versions_snapshot():
+    global _snapshot, _snapshot_generation
+
+    with _snapshot_lock:
+        _snapshot = None
+        _snapshot_generation += 1
+
+
 def invalidate_cache(cache_name):
     CacheVersion.objects.filter(cache=cache_name).update(
         version=generate_version_string()
     )
+    clear_snapshot_on_invalidation()
 
 
 def invalidate_all_caches():
@@ -18,3 +70,11 @@ def invalidate_all_caches():
         CacheVersion.objects.filter(cache=cache_name).update(
             version=generate_version_string()
         )
+    clear_snapshot_on_invalidation()
+
+
+def clear_snapshot_on_invalidation():
+    clear_cache_versions_snapshot()
+    # Clear snapshot again after commit, in case other thread has read old
+    # versions from database before transaction was committed.
+    transaction.on_commit(clear_cache_versions_snapshot)
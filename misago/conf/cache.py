@@ -1,22 +1,16 @@
-from django.core.cache import cache
-
 from . import SETTINGS_CACHE
-from ..cache.versions import invalidate_cache
+from ..cache.versionedcache import VersionedCache
+
+settings_cache = VersionedCache(SETTINGS_CACHE)
 
 
 def get_settings_cache(cache_versions):
-    key = get_cache_key(cache_versions)
-    return cache.get(key)
+    return settings_cache.get(cache_versions)
 
 
 def set_settings_cache(cache_versions, user_settings):
-    key = get_cache_key(cache_versions)
-    cache.set(key, user_settings)
-
-
-def get_cache_key(cache_versions):
-    return "%s_%s" % (SETTINGS_CACHE, cache_versions[SETTINGS_CACHE])
+    settings_cache.set(cache_versions, user_settings)
 
 
 def clear_settings_cache():
-    invalidate_cache(SETTINGS_CACHE)
+    settings_cache.invalidate()
@@ -25,6 +25,20 @@ MISAGO_ACL_EXTENSIONS = [
 ]
 
 
+# Max number of seconds for which cache versions may be kept in worker's memory
+# before being read from the database again. Workers read new versions right away
+# when they invalidate cache themselves. Set to 0 to read versions on every request.
+
+MISAGO_CACHE_VERSIONS_TTL = 5
+
+
+# Max number of objects that each versioned cache (eg. ACLs, settings or menus)
+# keeps deserialized in worker's memory in front of the shared cache.
+# Set to 0 to disable local caches.
+
+MISAGO_LOCAL_CACHE_SIZE = 128
+
+
 # Path to the directory that Misago should use to prepare user data downloads.
 # Should not be accessible from internet.
 
@@ -89,6 +103,24 @@ MISAGO_SEARCH_EXTENSIONS = [
 ]
 
 
+# Backend used to index and search posts
+# "misago.threads.searchbackends.PostgresSearchBackend" - searches posts in database
+# "misago.threads.searchbackends.LocalSearchBackend" - searches posts in on-disk
+# index stored in MISAGO_SEARCH_INDEX_PATH file, requires running rebuildpostssearch
+# command after it's enabled
+
+MISAGO_SEARCH_BACKEND = "misago.threads.searchbackends.PostgresSearchBackend"
+
+MISAGO_SEARCH_INDEX_PATH = None
+
+
+# For how long (in seconds) search results should be cached
+# Results are cached for users seeing same content, so later pages of results
+# and popular queries don't run the search again. Set to 0 to disable caching.
+
+MISAGO_SEARCH_RESULTS_CACHE_TTL = 60
+
+
 # Additional registration validators
 # https://misago.readthedocs.io/en/latest/developers/validating_registrations.html
 
@@ -130,11 +162,29 @@ MISAGO_ADMIN_SESSION_EXPIRATION = 60
 MISAGO_THREADS_ON_INDEX = True
 
 
+# How posts reads are written to the database:
+# "sync" - right away, while the request is handled
+# "buffered" - in batch after the response is sent
+# "celery" - in batch by the Celery task queued after the response is sent
+
+MISAGO_READTRACKER_WRITES = "sync"
+
+
 # How many notifications may be retrieved from the API in single request?
 
 MISAGO_NOTIFICATIONS_PAGE_LIMIT = 50
 
 
+# Coalesce repeated notifications about thread replies
+# When set to number of minutes bigger than zero, new reply in thread updates
+# user's unread reply notification for this thread created within this time
+# instead of creating new notification. Notification keeps pointing to first
+# reply, but shows latest reply's author and number of authors.
+# Set to 0 to disable coalescing
+
+MISAGO_NOTIFICATIONS_COALESCE_WINDOW = 0
+
+
 # How many unread notifications to track
 # Misago will not report report unread notifications count bigger than this
 # Example: if limit 50 and user has 56 unread notifications, UI will show "50+"
@@ -161,6 +211,19 @@ MISAGO_AVATAR_GALLERY = None
 MISAGO_AVATARS_SIZES = [400, 200, 150, 128, 100, 64, 50, 40, 32, 20]
 
 
+# Number of threads used to render avatar sizes in parallel
+# Set to 1 to render sizes one after another
+
+MISAGO_AVATARS_THREADS = 4
+
+
+# Store WebP version of every avatar size alongside PNG
+# Avatar server redirects browsers accepting WebP images to it
+
+MISAGO_AVATARS_WEBP = False
+MISAGO_AVATARS_WEBP_QUALITY = 85
+
+
 # Path to blank avatar image used for guests and removed users.
 
 MISAGO_BLANK_AVATAR = "misago/img/blank-avatar.png"
@@ -171,6 +234,26 @@ MISAGO_BLANK_AVATAR = "misago/img/blank-avatar.png"
 MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT = (500, 500)
 
 
+# How uploaded images thumbnails and WebP variants are created:
+# "sync" - thumbnail is created while the upload request is handled,
+#          WebP variants are not created
+# "celery" - thumbnail and WebP variants are created by the Celery task queued
+#            after the original image is stored. Recommended for live sites.
+
+MISAGO_ATTACHMENT_IMAGE_PROCESSING = "sync"
+
+
+# Quality of WebP variants of uploaded images
+
+MISAGO_ATTACHMENT_WEBP_QUALITY = 80
+
+
+# Create lossy WebP variants of full uploaded images and serve them instead of
+# originals to browsers accepting WebP. Thumbnails WebP variants are always used
+
+MISAGO_ATTACHMENT_WEBP_FULL_IMAGES = False
+
+
 # Length of secret used for attachments url tokens and filenames
 
 MISAGO_ATTACHMENT_SECRET_LENGTH = 64
@@ -182,6 +265,21 @@ MISAGO_ATTACHMENT_403_IMAGE = "misago/img/attachment-403.png"
 MISAGO_ATTACHMENT_404_IMAGE = "misago/img/attachment-404.png"
 
 
+# How attachments are served after permissions are checked:
+# "redirect" - browser is redirected to file's storage url
+# "x-accel-redirect" - response with X-Accel-Redirect header for Nginx
+# "x-sendfile" - response with X-Sendfile header for Apache or Lighttpd
+# "stream" - file is streamed by Django
+
+MISAGO_ATTACHMENT_SERVE_MODE = "redirect"
+
+
+# Url prefix of Nginx's internal location mapped to MEDIA_ROOT
+# Used by "x-accel-redirect" serve mode
+
+MISAGO_ATTACHMENT_INTERNAL_URL = "/protected/"
+
+
 # Available Moment.js locales
 
 MISAGO_MOMENT_JS_LOCALES = [
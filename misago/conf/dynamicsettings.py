@@ -6,6 +6,7 @@ class DynamicSettings:
     _overrides = {}
 
     def __init__(self, cache_versions):
+        self._lazy_values = {}
         self._settings = get_settings_cache(cache_versions)
         if self._settings is None:
             self._settings = get_settings_from_db()
@@ -26,10 +27,10 @@ class DynamicSettings:
             if self._settings[setting]["is_lazy"]:
                 if setting in self._overrides:
                     return self._overrides[setting]
-                if not self._settings[setting].get("real_value"):
+                if not self._lazy_values.get(setting):
                     real_value = Setting.objects.get(setting=setting).value
-                    self._settings[setting]["real_value"] = real_value
-                return self._settings[setting]["real_value"]
+                    self._lazy_values[setting] = real_value
+                return self._lazy_values[setting]
             raise ValueError("Setting %s is not lazy" % setting)
         except (KeyError, Setting.DoesNotExist):
             raise AttributeError("Setting %s is not defined" % setting)
@@ -3,6 +3,8 @@ from django.utils import timezone
 
 from .acl import ACL_CACHE, useracl
 from .admin.auth import authorize_admin
+from .cache.versionedcache import clear_versioned_caches
+from .cache.versions import clear_cache_versions_snapshot
 from .categories.models import Category
 from .conf import SETTINGS_CACHE
 from .conf.dynamicsettings import DynamicSettings
@@ -10,9 +12,11 @@ from .conf.staticsettings import StaticSettings
 from .menus import MENU_ITEMS_CACHE
 from .notifications.models import WatchedThread
 from .notifications.threads import ThreadNotifications
+from .readtracker.buffer import get_read_buffer
 from .socialauth import SOCIALAUTH_CACHE
 from .test import MisagoClient
 from .themes import THEME_CACHE
+from .threads import ATTACHMENT_TYPES_CACHE
 from .threads.models import Thread
 from .threads.test import post_thread, reply_thread
 from .users import BANS_CACHE
@@ -28,9 +32,31 @@ def get_cache_versions():
         SOCIALAUTH_CACHE: "abcdefgh",
         THEME_CACHE: "abcdefgh",
         MENU_ITEMS_CACHE: "abcdefgh",
+        ATTACHMENT_TYPES_CACHE: "abcdefgh",
     }
 
 
+@pytest.fixture(autouse=True)
+def reset_cache_versions_snapshot():
+    clear_cache_versions_snapshot()
+    yield
+    clear_cache_versions_snapshot()
+
+
+@pytest.fixture(autouse=True)
+def reset_versioned_caches():
+    clear_versioned_caches()
+    yield
+    clear_versioned_caches()
+
+
+@pytest.fixture(autouse=True)
+def reset_read_buffer():
+    get_read_buffer().pop()
+    yield
+    get_read_buffer().pop()
+
+
 @pytest.fixture
 def cache_versions():
     return get_cache_versions()
@@ -5,6 +5,8 @@ from django.utils.translation import get_language
 from ..conf import settings
 from .utils import get_host_from_address
 
+MAIL_BATCH_SIZE = 100
+
 
 def build_mail(recipient, subject, template, sender=None, context=None):
     context = context.copy() if context else {}
@@ -53,3 +55,48 @@ def mail_users(recipients, subject, template, sender=None, context=None):
 def send_messages(messages):
     connection = djmail.get_connection()
     connection.send_messages(messages)
+
+
+class MailQueue:
+    """Queues messages and sends them in batches over single connection.
+
+    Connection is opened on first flush and kept open until queue is closed.
+    """
+
+    def __init__(self, batch_size=MAIL_BATCH_SIZE, connection=None):
+        self.batch_size = batch_size
+        self.connection = connection
+        self.messages = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self):
+        return len(self.messages)
+
+    def append(self, message):
+        self.messages.append(message)
+        if len(self.messages) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.messages:
+            return
+
+        if not self.connection:
+            self.connection = djmail.get_connection()
+            self.connection.open()
+
+        messages = self.messages
+        self.messages = []
+        self.connection.send_messages(messages)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            if self.connection:
+                self.connection.close()
@@ -0,0 +1,57 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+from django.db import connections
+
+
+def map_batches(
+    func: Callable, batches: Iterable, processes: Optional[int] = None
+) -> Iterator:
+    """Calls func for every batch, yielding results in order of batches
+
+    If processes is other than 1, batches are processed in pool of processes.
+    Number of batches waiting for results is limited to twice the number of
+    processes, so batches iterator is consumed as work progresses.
+    """
+    if processes == 1:
+        for batch in batches:
+            yield func(batch)
+        return
+
+    processes = processes or os.cpu_count() or 1
+    max_pending = processes * 2
+
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        for batch_number, batch in enumerate(batches):
+            if not batch_number:
+                # Workers are forked on first submit and can't share connections
+                connections.close_all()
+
+            pending.append(executor.submit(func, batch))
+            if len(pending) >= max_pending:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+
+
+def read_checkpoint(checkpoint: Optional[str]) -> int:
+    if not checkpoint or not os.path.exists(checkpoint):
+        return 0
+
+    with open(checkpoint) as fp:
+        return int(fp.read().strip() or 0)
+
+
+def save_checkpoint(checkpoint: Optional[str], last_id: int):
+    if checkpoint:
+        with open(checkpoint, "w") as fp:
+            fp.write(str(last_id))
+
+
+def clear_checkpoint(checkpoint: Optional[str]):
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
@@ -6,7 +6,7 @@ from ...cache.versions import get_cache_versions
 from ...conf.dynamicsettings import DynamicSettings
 from ...conf.test import override_dynamic_settings
 from ...users.test import create_test_user
-from ..mail import build_mail, mail_user, mail_users
+from ..mail import MailQueue, build_mail, mail_user, mail_users
 
 
 class MailTests(TestCase):
@@ -73,3 +73,36 @@ class MailTests(TestCase):
                 spams_sent += 1
 
         self.assertEqual(spams_sent, len(test_users))
+
+    @override_dynamic_settings(forum_address="http://test.com/")
+    def test_mail_queue_sends_messages_in_batches(self):
+        """mail queue sends messages in batches over single connection"""
+        user = create_test_user("User", "user@example.com")
+
+        cache_versions = get_cache_versions()
+        settings = DynamicSettings(cache_versions)
+
+        connection = mail.get_connection()
+        with MailQueue(batch_size=2, connection=connection) as mail_queue:
+            for i in range(3):
+                mail_queue.append(
+                    build_mail(
+                        user,
+                        "Misago Test Mail %s" % i,
+                        "misago/emails/base",
+                        context={"settings": settings},
+                    )
+                )
+
+            self.assertEqual(len(mail.outbox), 2)
+            self.assertEqual(len(mail_queue), 1)
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(len(mail_queue), 0)
+
+    def test_mail_queue_without_messages_does_nothing(self):
+        """empty mail queue doesn't send messages"""
+        with MailQueue():
+            pass
+
+        self.assertEqual(len(mail.outbox), 0)
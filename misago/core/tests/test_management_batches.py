@@ -0,0 +1,32 @@
+from ..management.batches import (
+    clear_checkpoint,
+    map_batches,
+    read_checkpoint,
+    save_checkpoint,
+)
+
+
+def test_map_batches_yields_results_in_order():
+    assert list(map_batches(sum, [[1, 2], [3], [4, 5]], processes=1)) == [3, 3, 9]
+
+
+def test_map_batches_yields_results_in_order_from_processes_pool():
+    batches = [[i] * i for i in range(10)]
+    assert list(map_batches(sum, batches, processes=2)) == [i * i for i in range(10)]
+
+
+def test_checkpoint_is_saved_read_and_cleared(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint")
+    assert read_checkpoint(checkpoint) == 0
+
+    save_checkpoint(checkpoint, 42)
+    assert read_checkpoint(checkpoint) == 42
+
+    clear_checkpoint(checkpoint)
+    assert read_checkpoint(checkpoint) == 0
+
+
+def test_checkpoint_is_optional():
+    save_checkpoint(None, 42)
+    assert read_checkpoint(None) == 0
+    clear_checkpoint(None)
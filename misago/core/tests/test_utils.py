@@ -5,6 +5,7 @@ from django.urls import Resolver404, reverse
 from django.utils.functional import lazy, lazystr
 
 from ..utils import (
+    accepts_webp,
     clean_ids_list,
     clean_return_path,
     format_plaintext_for_html,
@@ -262,6 +263,23 @@ class IsRefererLocalTests(TestCase):
         self.assertFalse(is_referer_local(bad_request))
 
 
+class AcceptsWebpTests(TestCase):
+    def test_request_accepting_webp(self):
+        """accepts_webp returns true for request accepting webp images"""
+        request = RequestFactory().get("/", HTTP_ACCEPT="image/webp,*/*")
+        self.assertTrue(accepts_webp(request))
+
+    def test_request_not_accepting_webp(self):
+        """accepts_webp returns false for request not accepting webp images"""
+        request = RequestFactory().get("/", HTTP_ACCEPT="image/png,*/*")
+        self.assertFalse(accepts_webp(request))
+
+    def test_request_without_accept_header(self):
+        """accepts_webp returns false for request without accept header"""
+        request = RequestFactory().get("/")
+        self.assertFalse(accepts_webp(request))
+
+
 class GetExceptionMessageTests(TestCase):
     def test_no_args(self):
         """both of helper args are optional"""
@@ -139,6 +139,10 @@ def is_referer_local(request):
     return True
 
 
+def accepts_webp(request):
+    return "image/webp" in request.headers.get("accept", "")
+
+
 def get_exception_message(exception=None, default_message=None):
     if not exception:
         return default_message
@@ -7,4 +7,5 @@ post_search_filters = []
 post_validators = []
 
 markdown_extensions = []
+markup_transforms = []
 parsing_result_processors = []
@@ -5,3 +5,6 @@ class MisagoMarkupConfig(AppConfig):
     name = "misago.markup"
     label = "misago_markup"
     verbose_name = "Misago Markup"
+
+    def ready(self):
+        from . import signals as _  # noqa: F401
@@ -14,11 +14,16 @@ class QuoteExtension(markdown.Extension):
     def extendMarkdown(self, md):
         md.registerExtension(self)
 
+        self.block_processor = QuoteBlockProcessor(md.parser)
+
         md.preprocessors.register(QuotePreprocessor(md), "misago_bbcode_quote", 200)
         md.parser.blockprocessors.register(
-            QuoteBlockProcessor(md.parser), "misago_bbcode_quote", 90
+            self.block_processor, "misago_bbcode_quote", 90
         )
 
+    def reset(self):
+        self.block_processor.reset()
+
 
 class QuotePreprocessor(Preprocessor):
     QUOTE_BLOCK_RE = re.compile(
@@ -58,6 +63,9 @@ class QuotePreprocessor(Preprocessor):
 class QuoteBlockProcessor(BlockProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.reset()
+
+    def reset(self):
         self._title = None
         self._quote = 0
         self._children = []
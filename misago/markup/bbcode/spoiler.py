@@ -14,11 +14,16 @@ class SpoilerExtension(markdown.Extension):
     def extendMarkdown(self, md):
         md.registerExtension(self)
 
+        self.block_processor = SpoilerBlockProcessor(md.parser)
+
         md.preprocessors.register(SpoilerPreprocessor(md), "misago_bbcode_spoiler", 200)
         md.parser.blockprocessors.register(
-            SpoilerBlockProcessor(md.parser), "misago_bbcode_spoiler", 85
+            self.block_processor, "misago_bbcode_spoiler", 85
         )
 
+    def reset(self):
+        self.block_processor.reset()
+
 
 class SpoilerPreprocessor(Preprocessor):
     SPOILER_BLOCK_RE = re.compile(
@@ -42,6 +47,9 @@ class SpoilerPreprocessor(Preprocessor):
 class SpoilerBlockProcessor(BlockProcessor):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.reset()
+
+    def reset(self):
         self._spoiler = 0
         self._children = []
 
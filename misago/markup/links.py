@@ -5,6 +5,7 @@ from django.http import Http404
 from django.urls import resolve
 
 from .htmlparser import ElementNode, RootNode, TextNode
+from .transforms import NodeTransform, TransformContext, TransformsPipeline
 
 MISAGO_ATTACHMENT_VIEWS = ("misago:attachment", "misago:attachment-thumbnail")
 URL_RE = re.compile(
@@ -18,22 +19,19 @@ URL_RE = re.compile(
 
 
 def linkify_texts(node: Union[RootNode, ElementNode]):
-    # Skip link replacement in some nodes
-    if node.tag in ("pre", "code", "a"):
-        return
+    context = TransformContext(request=None, result={})
+    TransformsPipeline([LinkifyTransform()]).run(context, node)
+
+
+class LinkifyTransform(NodeTransform):
+    """Replaces URLs in texts with links"""
 
-    new_children = []
-    for child in node.children:
-        if isinstance(child, TextNode):
-            if URL_RE.search(child.text):
-                new_children += replace_links_in_text(child.text)
-            else:
-                new_children.append(child)
-        else:
-            new_children.append(child)
-            linkify_texts(child)
+    skip_tags = ("pre", "code", "a")
 
-    node.children = new_children
+    def transform_text(self, context, parent, node):
+        if URL_RE.search(node.text):
+            return replace_links_in_text(node.text)
+        return None
 
 
 def replace_links_in_text(text: str) -> list:
@@ -75,17 +73,18 @@ def clean_links(
     if isinstance(node, TextNode):
         return
 
-    for child in node.children:
-        if not isinstance(child, ElementNode):
-            continue
-
-        if child.tag == "a":
-            clean_link_node(request, result, child, force_shva)
-            clean_links(request, result, child, force_shva)
-        elif child.tag == "img":
-            clean_image_node(request, result, child, force_shva)
-        else:
-            clean_links(request, result, child, force_shva)
+    context = TransformContext(request=request, result=result, force_shva=force_shva)
+    TransformsPipeline([CleanLinksTransform()]).run(context, node)
+
+
+class CleanLinksTransform(NodeTransform):
+    """Cleans links and images, and stores them in parsing result"""
+
+    def transform_element(self, context, node):
+        if node.tag == "a":
+            clean_link_node(context.request, context.result, node, context.force_shva)
+        elif node.tag == "img":
+            clean_image_node(context.request, context.result, node, context.force_shva)
 
 
 def clean_link_node(
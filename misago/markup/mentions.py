@@ -1,61 +1,78 @@
 import re
-from typing import Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, Optional
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 
 from ..users.utils import slugify_username
-from .htmlparser import (
-    ElementNode,
-    RootNode,
-    TextNode,
-)
+from .htmlparser import ElementNode, TextNode
+from .transforms import NodeTransform, TransformContext, TransformsPipeline
 
 EXCLUDE_ELEMENTS = ("pre", "code", "a")
 USERNAME_RE = re.compile(r"@[0-9a-z_]+", re.IGNORECASE)
 MENTIONS_LIMIT = 32
 
+MENTIONS_CACHE_KEY = "misago-mention-%s"
+MENTIONS_CACHE_TTL = 3600 * 24
+
+# Users data resolved for many texts at once by preload_mentions
+preloaded_users_data: ContextVar[Optional[tuple[set, dict]]] = ContextVar(
+    "preloaded_users_data", default=None
+)
+
 
 def add_mentions(result, root_node):
-    if "@" not in result["parsed_text"]:
-        return
+    context = TransformContext(request=None, result=result)
+    TransformsPipeline([MentionsTransform()]).run(context, root_node)
 
-    mentions = set()  # usernames slugs
-    nodes = []
 
-    find_mentions(root_node, mentions, nodes)
+class MentionsTransform(NodeTransform):
+    """Finds mentions in texts and replaces them with links to users
 
-    if not mentions or len(mentions) > MENTIONS_LIMIT:
-        return  # No need to run mentions logic
+    Mentioned users are looked up in single query after the walk.
+    """
 
-    users_data = get_users_data(mentions)
-    if not users_data:
-        return  # Mentioned users don't exist
+    skip_tags = EXCLUDE_ELEMENTS
+
+    def __init__(self):
+        self.mentions = {}  # usernames slugs, in order of appearance
+        self.nodes = {}
+
+    def is_enabled(self, context):
+        return "@" in context.result["parsed_text"]
+
+    def transform_text(self, context, parent, node):
+        results = find_mentions_in_str(node.text)
+        if results:
+            self.mentions.update(dict.fromkeys(results))
+            self.nodes[id(parent)] = parent
+        return None
 
-    for node in nodes:
-        add_mentions_to_node(node, users_data)
+    def finalize(self, context, root_node):
+        if not self.mentions:
+            return  # No need to run mentions logic
 
-    result["mentions"] = [user[0] for user in users_data.values()]
+        # Only first mentions are resolved, rest is left as text
+        users_data = get_users_data(list(self.mentions)[:MENTIONS_LIMIT])
+        if not users_data:
+            return  # Mentioned users don't exist
 
+        for node in self.nodes.values():
+            new_children = []
+            for child in node.children:
+                if isinstance(child, TextNode):
+                    for new_node in add_mentions_to_text(child.text, users_data):
+                        if isinstance(new_node, ElementNode):
+                            context.visit(new_node, after=self)
+                        new_children.append(new_node)
+                else:
+                    new_children.append(child)
 
-def find_mentions(
-    node: Union[ElementNode, RootNode],
-    mentions: set,
-    nodes: set,
-):
-    if isinstance(node, ElementNode) and node.tag in EXCLUDE_ELEMENTS:
-        return
+            node.children = new_children
 
-    tracked_node = False
-    for child in node.children:
-        if isinstance(child, TextNode):
-            results = find_mentions_in_str(child.text)
-            if results:
-                mentions.update(results)
-                if not tracked_node:
-                    tracked_node = True
-                    nodes.append(node)
-        else:
-            find_mentions(child, mentions, nodes)
+        context.result["mentions"] = [user[0] for user in users_data.values()]
 
 
 def find_mentions_in_str(text: str):
@@ -63,10 +80,51 @@ def find_mentions_in_str(text: str):
     if not matches:
         return None
 
-    return set([slugify_username(match[1:]) for match in matches])
+    return list(dict.fromkeys(slugify_username(match[1:]) for match in matches))
 
 
-def get_users_data(mentions):
+def get_users_data(mentions: Iterable[str]) -> dict[str, tuple[int, str]]:
+    """Returns dict of users slugs to tuples with their IDs and usernames
+
+    Users are resolved from data preloaded with preload_mentions, cache and
+    the database, in this order. Users resolved from database are cached.
+    """
+    mentions = set(mentions)
+    users_data = {}
+
+    preloaded = preloaded_users_data.get()
+    if preloaded:
+        preloaded_mentions, preloaded_data = preloaded
+        for slug in mentions & preloaded_mentions:
+            if slug in preloaded_data:
+                users_data[slug] = preloaded_data[slug]
+        mentions -= preloaded_mentions
+
+    if not mentions:
+        return users_data
+
+    cached_data = cache.get_many([MENTIONS_CACHE_KEY % slug for slug in mentions])
+    for slug in list(mentions):
+        user_data = cached_data.get(MENTIONS_CACHE_KEY % slug)
+        if user_data:
+            users_data[slug] = tuple(user_data)
+            mentions.remove(slug)
+
+    if mentions:
+        queried_data = query_users_data(mentions)
+        cache.set_many(
+            {
+                MENTIONS_CACHE_KEY % slug: user_data
+                for slug, user_data in queried_data.items()
+            },
+            MENTIONS_CACHE_TTL,
+        )
+        users_data.update(queried_data)
+
+    return users_data
+
+
+def query_users_data(mentions: Iterable[str]) -> dict[str, tuple[int, str]]:
     User = get_user_model()
     users_data = {}
 
@@ -80,16 +138,24 @@ def get_users_data(mentions):
     return users_data
 
 
-def add_mentions_to_node(node, users_data):
-    new_children = []
+@contextmanager
+def preload_mentions(texts: Iterable[str]):
+    """Resolves mentions in texts with single query for parsing inside block"""
+    mentions = set()
+    for text in texts:
+        if "@" in text:
+            mentions.update(find_mentions_in_str(text) or [])
+
+    users_data = query_users_data(mentions) if mentions else {}
+    token = preloaded_users_data.set((mentions, users_data))
+    try:
+        yield
+    finally:
+        preloaded_users_data.reset(token)
 
-    for child in node.children:
-        if isinstance(child, TextNode):
-            new_children += add_mentions_to_text(child.text, users_data)
-        else:
-            new_children.append(child)
 
-    node.children = new_children
+def clear_mentions_cache(slugs: Iterable[str]):
+    cache.delete_many([MENTIONS_CACHE_KEY % slug for slug in slugs])
 
 
 def add_mentions_to_text(text: str, users_data):
@@ -1,17 +1,26 @@
+from contextlib import contextmanager
+from threading import Lock
+
 import markdown
 from markdown.extensions.fenced_code import FencedCodeExtension
 
+from .. import hooks
+from ..conf import settings
 from .bbcode.code import CodeBlockExtension
 from .bbcode.hr import BBCodeHRProcessor
 from .bbcode.inline import bold, image, italics, underline, url
 from .bbcode.quote import QuoteExtension
 from .bbcode.spoiler import SpoilerExtension
 from .htmlparser import parse_html_string, print_html_string
-from .links import clean_links, linkify_texts
+from .links import CleanLinksTransform, LinkifyTransform
 from .md.shortimgs import ShortImagesExtension
 from .md.strikethrough import StrikethroughExtension
-from .mentions import add_mentions
+from .mentions import MentionsTransform
 from .pipeline import pipeline
+from .transforms import TransformContext, TransformsPipeline
+
+# Max number of idle parsers kept in the pool for each flavour
+MAX_POOLED_PARSERS = 8
 
 
 def parse(
@@ -34,14 +43,26 @@ def parse(
 
     Returns dict object
     """
-    md = md_factory(
+    with markdown_pool.checkout(
         allow_links=allow_links, allow_images=allow_images, allow_blocks=allow_blocks
-    )
-
+    ) as md:
+        return parse_with_markdown(
+            md,
+            text,
+            request,
+            allow_mentions=allow_mentions,
+            allow_links=allow_links,
+            allow_images=allow_images,
+            force_shva=force_shva,
+        )
+
+
+def parse_with_markdown(
+    md, text, request, allow_mentions, allow_links, allow_images, force_shva
+):
     parsing_result = {
         "original_text": text,
         "parsed_text": "",
-        "markdown": md,
         "mentions": [],
         "images": [],
         "internal_links": [],
@@ -54,18 +75,19 @@ def parse(
     # Clean and store parsed text
     parsing_result["parsed_text"] = parsed_text.strip()
 
-    # Run additional operations
-    if allow_mentions or allow_links or allow_images:
+    # Run additional operations in single walk over HTML tree
+    transforms = get_transforms(
+        allow_mentions=allow_mentions,
+        allow_links=allow_links,
+        allow_images=allow_images,
+    )
+    if transforms:
         root_node = parse_html_string(parsing_result["parsed_text"])
 
-        if allow_links:
-            linkify_texts(root_node)
-
-        if allow_mentions:
-            add_mentions(parsing_result, root_node)
-
-        if allow_links or allow_images:
-            clean_links(request, parsing_result, root_node, force_shva)
+        context = TransformContext(
+            request=request, result=parsing_result, force_shva=force_shva
+        )
+        TransformsPipeline(transforms).run(context, root_node)
 
         parsing_result["parsed_text"] = print_html_string(root_node)
 
@@ -75,6 +97,90 @@ def parse(
     return parsing_result
 
 
+def get_transforms(allow_mentions=True, allow_links=True, allow_images=True):
+    """returns list of transforms to run on parsed HTML"""
+    transforms = []
+    if allow_links:
+        transforms.append(LinkifyTransform())
+    if allow_mentions:
+        transforms.append(MentionsTransform())
+    if allow_links or allow_images:
+        transforms.append(CleanLinksTransform())
+
+    for transform in hooks.markup_transforms:
+        transforms.append(transform())
+
+    return transforms
+
+
+class MarkdownPool:
+    """Thread-safe pool of configured markdown parsers
+
+    Building and configuring markdown parser is expensive, so parsers are
+    kept for reuse, separately for every combination of enabled features.
+    Parsers are reset before they are returned to the pool. Pool is cleared
+    when markup extensions or hooks change.
+
+    Parser checked out from the pool may only be used until it's returned.
+    """
+
+    def __init__(self, maxsize=MAX_POOLED_PARSERS):
+        self.maxsize = maxsize
+        self._lock = Lock()
+        self._parsers = {}
+        self._extensions = None
+
+    def __len__(self):
+        return sum(len(parsers) for parsers in self._parsers.values())
+
+    @contextmanager
+    def checkout(self, allow_links=True, allow_images=True, allow_blocks=True):
+        flavour = (allow_links, allow_images, allow_blocks)
+        extensions = get_markdown_extensions()
+
+        md = None
+        with self._lock:
+            if self._extensions != extensions:
+                self._parsers = {}
+                self._extensions = extensions
+
+            parsers = self._parsers.get(flavour)
+            if parsers:
+                md = parsers.pop()
+
+        if md is None:
+            md = md_factory(
+                allow_links=allow_links,
+                allow_images=allow_images,
+                allow_blocks=allow_blocks,
+            )
+
+        try:
+            yield md
+        finally:
+            md.reset()
+            with self._lock:
+                if self._extensions == extensions:
+                    parsers = self._parsers.setdefault(flavour, [])
+                    if len(parsers) < self.maxsize:
+                        parsers.append(md)
+
+    def clear(self):
+        with self._lock:
+            self._parsers = {}
+            self._extensions = None
+
+
+def get_markdown_extensions():
+    return (
+        tuple(settings.MISAGO_MARKUP_EXTENSIONS),
+        tuple(hooks.markdown_extensions),
+    )
+
+
+markdown_pool = MarkdownPool()
+
+
 def md_factory(allow_links=True, allow_images=True, allow_blocks=True):
     """creates and configures markdown object"""
     md = markdown.Markdown(extensions=["markdown.extensions.nl2br"])
@@ -0,0 +1,36 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+
+from ..core.utils import slugify
+from ..users.signals import username_changed
+from .mentions import clear_mentions_cache
+
+User = get_user_model()
+
+
+@receiver(username_changed)
+def clear_renamed_user_mentions(sender, old_username=None, **kwargs):
+    slugs = [sender.slug]
+    if old_username:
+        slugs.append(slugify(old_username))
+
+    clear_mentions_cache_on_commit(slugs)
+
+
+@receiver(pre_delete, sender=User)
+def clear_deleted_user_mentions(sender, *, instance, **kwargs):
+    # User's slug is replaced before deletion when their data is anonymized
+    slugs = set(User.objects.filter(pk=instance.pk).values_list("slug", flat=True))
+    slugs.add(instance.slug)
+
+    clear_mentions_cache_on_commit(slugs)
+
+
+def clear_mentions_cache_on_commit(slugs):
+    slugs = list(slugs)
+    clear_mentions_cache(slugs)
+    # Clear cache again after commit, in case other thread has cached old
+    # user data from database before transaction was committed.
+    transaction.on_commit(lambda: clear_mentions_cache(slugs))
@@ -0,0 +1,88 @@
+from ..parser import MarkdownPool, parse
+
+
+def test_pool_reuses_parser_for_same_flavour():
+    pool = MarkdownPool()
+
+    with pool.checkout() as md:
+        pass
+
+    with pool.checkout() as other_md:
+        assert other_md is md
+
+
+def test_pool_keeps_separate_parsers_for_different_flavours():
+    pool = MarkdownPool()
+
+    with pool.checkout() as md:
+        pass
+
+    with pool.checkout(allow_blocks=False) as other_md:
+        assert other_md is not md
+
+
+def test_pool_checks_out_different_parsers_for_concurrent_uses():
+    pool = MarkdownPool()
+
+    with pool.checkout() as md:
+        with pool.checkout() as other_md:
+            assert other_md is not md
+
+    assert len(pool) == 2
+
+
+def test_pool_keeps_limited_number_of_parsers():
+    pool = MarkdownPool(maxsize=1)
+
+    with pool.checkout():
+        with pool.checkout():
+            pass
+
+    assert len(pool) == 1
+
+
+def test_pool_is_cleared_when_markdown_extensions_change(mocker):
+    pool = MarkdownPool()
+
+    with pool.checkout() as md:
+        pass
+
+    mocker.patch("misago.markup.parser.hooks.markdown_extensions", [mocker.Mock()])
+    with pool.checkout() as other_md:
+        assert other_md is not md
+
+
+def test_parser_is_returned_to_pool_after_error():
+    pool = MarkdownPool()
+
+    try:
+        with pool.checkout() as md:
+            raise ValueError()
+    except ValueError:
+        pass
+
+    with pool.checkout() as other_md:
+        assert other_md is md
+
+
+def test_pooled_parser_is_reset_between_uses():
+    pool = MarkdownPool()
+
+    with pool.checkout() as md:
+        md.convert("Hello <b>world</b>!")
+        md.htmlStash.store("<b>world</b>")
+
+    with pool.checkout() as other_md:
+        assert other_md is md
+        assert not md.htmlStash.rawHtmlBlocks
+
+
+def test_repeated_parsing_with_pooled_parsers_gives_same_result(request_mock, user):
+    text = "[quote=Bob]Quote[/quote]\n\n[spoiler]Spoiler[/spoiler]\n\n**Text**"
+    result = parse(text, request_mock, user)["parsed_text"]
+
+    assert parse(text, request_mock, user)["parsed_text"] == result
+
+
+def test_parsing_result_doesnt_expose_pooled_parser(request_mock, user):
+    assert "markdown" not in parse("**Text**", request_mock, user)
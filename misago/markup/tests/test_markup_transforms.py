@@ -0,0 +1,86 @@
+from ..htmlparser import ElementNode, TextNode, parse_html_string, print_html_string
+from ..parser import parse
+from ..transforms import NodeTransform, TransformContext, TransformsPipeline
+
+
+class UppercaseTransform(NodeTransform):
+    skip_tags = ("code",)
+
+    def transform_text(self, context, parent, node):
+        return [TextNode(text=node.text.upper())]
+
+
+class WrapTransform(NodeTransform):
+    def transform_text(self, context, parent, node):
+        if "wrap" not in node.text:
+            return None
+
+        return [ElementNode(tag="b", attrs={}, children=[TextNode(text=node.text)])]
+
+
+class TagsTransform(NodeTransform):
+    def __init__(self):
+        self.tags = []
+
+    def transform_element(self, context, node):
+        self.tags.append(node.tag)
+
+
+def run_transforms(transforms, html):
+    root_node = parse_html_string(html)
+    context = TransformContext(request=None, result={"parsed_text": html})
+    TransformsPipeline(transforms).run(context, root_node)
+    return print_html_string(root_node)
+
+
+def test_transforms_are_ran_on_text_nodes():
+    result = run_transforms([UppercaseTransform()], "<p>Hello <i>world</i></p>")
+    assert result == "<p>HELLO <i>WORLD</i></p>"
+
+
+def test_transforms_are_not_ran_on_skipped_elements_contents():
+    result = run_transforms([UppercaseTransform()], "<p>Hello <code>world</code></p>")
+    assert result == "<p>HELLO <code>world</code></p>"
+
+
+def test_text_nodes_returned_by_transform_are_passed_to_next_transform():
+    result = run_transforms(
+        [UppercaseTransform(), UppercaseTransform()], "<p>Hello</p>"
+    )
+    assert result == "<p>HELLO</p>"
+
+
+def test_elements_returned_by_transform_are_walked_by_next_transforms():
+    tags_transform = TagsTransform()
+    result = run_transforms(
+        [WrapTransform(), UppercaseTransform(), tags_transform], "<p>wrap me</p>"
+    )
+
+    assert result == "<p><b>WRAP ME</b></p>"
+    assert tags_transform.tags == ["p", "b"]
+
+
+def test_elements_returned_by_transform_are_not_walked_by_previous_transforms():
+    tags_transform = TagsTransform()
+    result = run_transforms(
+        [tags_transform, UppercaseTransform(), WrapTransform()], "<p>wrap me</p>"
+    )
+
+    assert result == "<p>WRAP ME</p>"
+    assert tags_transform.tags == ["p"]
+
+
+def test_markup_transforms_hook_adds_transforms_to_parser(mocker, request_mock, user):
+    mocker.patch("misago.markup.parser.hooks.markup_transforms", [UppercaseTransform])
+
+    result = parse("Hello `world`!", request_mock, user)
+    assert result["parsed_text"] == "<p>HELLO <code>world</code>!</p>"
+
+
+def test_mentions_and_links_are_handled_in_single_walk(request_mock, user):
+    text = "Hello @%s, see http://example.com/test/ and other.com" % user.username
+    result = parse(text, request_mock, user)
+
+    assert result["mentions"] == [user.id]
+    assert result["internal_links"] == ["/test/", "/u/%s/%s/" % (user.slug, user.id)]
+    assert result["outgoing_links"] == ["other.com"]
@@ -0,0 +1,106 @@
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from ..htmlparser import parse_html_string
+from ..mentions import (
+    MENTIONS_CACHE_KEY,
+    MENTIONS_LIMIT,
+    add_mentions,
+    get_users_data,
+    preload_mentions,
+)
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        yield cache
+        cache.clear()
+
+
+def test_users_data_is_resolved_from_database(user):
+    assert get_users_data([user.slug, "aerith"]) == {
+        user.slug: (user.id, user.username)
+    }
+
+
+def test_resolved_users_data_is_cached(locmem_cache, user, django_assert_num_queries):
+    get_users_data([user.slug])
+
+    with django_assert_num_queries(0):
+        assert get_users_data([user.slug]) == {user.slug: (user.id, user.username)}
+
+
+def test_cached_users_data_is_cleared_when_username_changes(locmem_cache, user):
+    old_slug = user.slug
+    get_users_data([old_slug])
+
+    user.set_username("Renamed")
+    user.save()
+
+    assert get_users_data([old_slug]) == {}
+    assert get_users_data(["renamed"]) == {"renamed": (user.id, "Renamed")}
+
+
+def test_cached_users_data_is_cleared_when_user_is_deleted(locmem_cache, user):
+    slug = user.slug
+    get_users_data([slug])
+
+    user.delete(anonymous_username="Deleted")
+
+    assert get_users_data([slug]) == {}
+
+
+def test_renamed_user_mentions_are_cleared_from_cache_after_commit(
+    django_capture_on_commit_callbacks, locmem_cache, user
+):
+    cache_key = MENTIONS_CACHE_KEY % user.slug
+    get_users_data([user.slug])
+    assert cache.get(cache_key)
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        user.set_username("NewName")
+        user.save()
+
+    assert not cache.get(cache_key)
+
+    # Simulate other thread caching user's old data before commit
+    cache.set(cache_key, (user.id, "OldName"))
+
+    for callback in callbacks:
+        callback()
+
+    assert not cache.get(cache_key)
+
+
+def test_preloaded_users_data_is_used(user, other_user, django_assert_num_queries):
+    texts = ["Hello @%s!" % user.username, "Hi @%s and @Aerith" % other_user.username]
+
+    with django_assert_num_queries(1):
+        with preload_mentions(texts):
+            assert get_users_data([user.slug, other_user.slug, "aerith"]) == {
+                user.slug: (user.id, user.username),
+                other_user.slug: (other_user.id, other_user.username),
+            }
+
+
+def test_mentions_over_limit_are_left_as_text(user):
+    usernames = ["User%s" % i for i in range(MENTIONS_LIMIT)]
+    text = " ".join("@%s" % username for username in usernames)
+    parsing_result = {
+        "parsed_text": "<p>%s @%s</p>" % (text, user.username),
+        "mentions": [],
+    }
+    add_mentions(parsing_result, parse_html_string(parsing_result["parsed_text"]))
+    assert parsing_result["mentions"] == []
+
+    parsing_result = {
+        "parsed_text": "<p>@%s %s</p>" % (user.username, text),
+        "mentions": [],
+    }
+    add_mentions(parsing_result, parse_html_string(parsing_result["parsed_text"]))
+    assert parsing_result["mentions"] == [user.id]
@@ -0,0 +1,115 @@
+from dataclasses import dataclass, field
+from typing import Optional, Union
+
+from .htmlparser import ElementNode, RootNode, TextNode
+
+
+@dataclass
+class TransformContext:
+    request: object
+    result: dict
+    force_shva: bool = False
+    pipeline: Optional["TransformsPipeline"] = field(default=None, repr=False)
+
+    def visit(self, node: ElementNode, after: "NodeTransform"):
+        """Walks element created by transform outside of the walk
+
+        Element is only passed to transforms that come after the one that
+        created it.
+        """
+        transforms = self.pipeline.transforms
+        index = transforms.index(after)
+        self.pipeline.visit_element(self, node, transforms[index + 1 :])
+
+
+class NodeTransform:
+    """Base class for transforms applied in single walk over HTML tree
+
+    Transform is not ran on contents of elements with tags in skip_tags.
+    """
+
+    skip_tags: tuple = ()
+
+    def is_enabled(self, context: TransformContext) -> bool:
+        return True
+
+    def transform_element(self, context: TransformContext, node: ElementNode):
+        pass
+
+    def transform_text(
+        self,
+        context: TransformContext,
+        parent: Union[RootNode, ElementNode],
+        node: TextNode,
+    ) -> Optional[list]:
+        """Returns list of nodes to replace text node with or None"""
+        return None
+
+    def finalize(self, context: TransformContext, root_node: RootNode):
+        pass
+
+
+class TransformsPipeline:
+    """Walks HTML tree once, running all transforms on visited nodes
+
+    Elements are passed to transforms when walk enters them. Text nodes are
+    passed to transforms in order, and text nodes returned by one transform
+    are passed to next ones. New elements returned by transform are walked
+    by transforms that come after it.
+    """
+
+    def __init__(self, transforms: list):
+        self.transforms = transforms
+
+    def run(self, context: TransformContext, root_node: RootNode):
+        context.pipeline = self
+        self.transforms = [t for t in self.transforms if t.is_enabled(context)]
+        if not self.transforms:
+            return
+
+        self.visit_children(context, root_node, self.transforms)
+
+        for transform in self.transforms:
+            transform.finalize(context, root_node)
+
+    def visit_element(self, context, node: ElementNode, transforms: list):
+        transforms = [t for t in transforms if node.tag not in t.skip_tags]
+        for transform in transforms:
+            transform.transform_element(context, node)
+
+        self.visit_children(context, node, transforms)
+
+    def visit_children(self, context, node, transforms: list):
+        new_children = []
+        for child in node.children:
+            if isinstance(child, TextNode):
+                new_children += self.visit_text(context, node, child, transforms)
+            else:
+                new_children.append(child)
+                if isinstance(child, ElementNode):
+                    self.visit_element(context, child, transforms)
+
+        node.children = new_children
+
+    def visit_text(self, context, parent, node: TextNode, transforms: list) -> list:
+        nodes = [node]
+        for index, transform in enumerate(transforms):
+            new_nodes = []
+            for child in nodes:
+                if not isinstance(child, TextNode):
+                    new_nodes.append(child)
+                    continue
+
+                replacement = transform.transform_text(context, parent, child)
+                if replacement is None:
+                    new_nodes.append(child)
+                    continue
+
+                for new_node in replacement:
+                    if isinstance(new_node, ElementNode):
+                        self.visit_element(context, new_node, transforms[index + 1 :])
+                    new_nodes.append(new_node)
+
+            nodes = new_nodes
+
+        return nodes
@@ -0,0 +1,25 @@
+import django.contrib.postgres.fields
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_notifications", "0004_notification_actors_count"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="actors",
+            field=django.contrib.postgres.fields.ArrayField(
+                base_field=models.PositiveIntegerField(), default=list, size=None
+            ),
+        ),
+        migrations.RunSQL(
+            (
+                "UPDATE misago_notifications_notification "
+                "SET actors = ARRAY[actor_id] WHERE actor_id IS NOT NULL"
+            ),
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils.crypto import get_random_string
 from django.utils import timezone
@@ -27,6 +28,8 @@ class Notification(models.Model):
         related_name="+",
     )
     actor_name = models.CharField(max_length=255, blank=True, null=True)
+    actors = ArrayField(models.PositiveIntegerField(), default=list)
+    actors_count = models.PositiveIntegerField(default=1)
     category = models.ForeignKey(
         "misago_categories.Category", blank=True, null=True, on_delete=models.CASCADE
     )
@@ -53,6 +56,11 @@ class Notification(models.Model):
                 condition=models.Q(is_read=False),
             ),
             models.Index(fields=["user", "post", "is_read"]),
+            models.Index(
+                name="misago_noti_coalesce",
+                fields=["user", "thread", "verb", "created_at"],
+                condition=models.Q(is_read=False),
+            ),
         ]
 
 
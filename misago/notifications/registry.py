@@ -2,7 +2,7 @@ import html
 from typing import TYPE_CHECKING, Callable, Dict, overload
 
 from django.http import HttpRequest
-from django.utils.translation import pgettext
+from django.utils.translation import npgettext, pgettext
 
 from ..categories.enums import CategoryTree
 from ..threads.views.goto import PrivateThreadGotoPostView, ThreadGotoPostView
@@ -139,6 +139,22 @@ def get_test_notification_url(
 
 @registry.message(NotificationVerb.REPLIED)
 def get_replied_notification_message(notification: "Notification") -> str:
+    if notification.actors_count > 1:
+        others = notification.actors_count - 1
+        message = html.escape(
+            npgettext(
+                "notification replied",
+                "%(actor)s and %(others)s other user replied to %(thread)s",
+                "%(actor)s and %(others)s other users replied to %(thread)s",
+                others,
+            )
+        )
+        return message % {
+            "actor": bold_escape(notification.actor_name),
+            "others": others,
+            "thread": bold_escape(notification.thread_title),
+        }
+
     message = html.escape(
         pgettext("notification replied", "%(actor)s replied to %(thread)s")
     )
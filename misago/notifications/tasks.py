@@ -6,16 +6,18 @@ from django.contrib.auth import get_user_model
 
 from ..cache.versions import get_cache_versions
 from ..conf.dynamicsettings import DynamicSettings
+from ..core.mail import MailQueue
 from ..core.pgutils import chunk_queryset
 from ..users.bans import get_user_ban
 from ..threads.models import Post, Thread
 from .models import WatchedThread
 from .threads import (
     notify_participant_on_new_private_thread,
-    notify_watcher_on_new_thread_reply,
+    notify_watchers_on_new_thread_reply,
 )
 
 NOTIFY_CHUNK_SIZE = 20
+NOTIFY_WATCHERS_BATCH_SIZE = 500
 
 User = get_user_model()
 logger = getLogger("misago.notifications")
@@ -37,22 +39,56 @@ def notify_on_new_thread_reply(reply_id: int):
     cache_versions = get_cache_versions()
     dynamic_settings = DynamicSettings(cache_versions)
 
-    queryset = WatchedThread.objects.filter(thread=post.thread).select_related("user")
-
-    for watched_thread in chunk_queryset(queryset, NOTIFY_CHUNK_SIZE):
-        if (
-            watched_thread.user == post.poster
-            or not watched_thread.user.is_active
-            or get_user_ban(watched_thread.user, cache_versions)
-        ):
-            continue  # Skip poster and banned or inactive watchers
+    queryset = WatchedThread.objects.filter(thread=post.thread).select_related(
+        "user", "user__ban_cache"
+    )
 
-        try:
-            notify_watcher_on_new_thread_reply(
-                watched_thread, post, cache_versions, dynamic_settings
+    mail_queue = MailQueue()
+    try:
+        batch: list[WatchedThread] = []
+        for watched_thread in chunk_queryset(queryset, NOTIFY_WATCHERS_BATCH_SIZE):
+            if (
+                watched_thread.user_id == post.poster_id
+                or not watched_thread.user.is_active
+                or get_user_ban(watched_thread.user, cache_versions)
+            ):
+                continue  # Skip poster and banned or inactive watchers
+
+            batch.append(watched_thread)
+            if len(batch) == NOTIFY_WATCHERS_BATCH_SIZE:
+                notify_watchers_batch(
+                    batch, post, cache_versions, dynamic_settings, mail_queue
+                )
+                batch = []
+
+        if batch:
+            notify_watchers_batch(
+                batch, post, cache_versions, dynamic_settings, mail_queue
             )
-        except Exception:
-            logger.exception("Unexpected error in 'notify_watcher_on_new_thread_reply'")
+    finally:
+        close_mail_queue(mail_queue)
+
+
+def notify_watchers_batch(
+    batch: list[WatchedThread],
+    post: Post,
+    cache_versions: dict[str, str],
+    dynamic_settings: DynamicSettings,
+    mail_queue: MailQueue,
+):
+    try:
+        notify_watchers_on_new_thread_reply(
+            batch, post, cache_versions, dynamic_settings, mail_queue
+        )
+    except Exception:
+        logger.exception("Unexpected error in 'notify_watchers_on_new_thread_reply'")
+
+
+def close_mail_queue(mail_queue: MailQueue):
+    try:
+        mail_queue.close()
+    except Exception:
+        logger.exception("Unexpected error in 'MailQueue.close'")
 
 
 @shared_task(
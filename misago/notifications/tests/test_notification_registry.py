@@ -101,6 +101,21 @@ def test_default_notification_registry_supports_reply_notifications():
     assert message == ("<b>Aerith</b> replied to <b>Midgar was destroyed!</b>")
 
 
+def test_default_notification_registry_supports_coalesced_reply_notifications():
+    message = registry.get_message(
+        Notification(
+            id=1,
+            verb=NotificationVerb.REPLIED,
+            actor_name="Aerith",
+            actors_count=3,
+            thread_title="Midgar was destroyed!",
+        )
+    )
+    assert message == (
+        "<b>Aerith</b> and 2 other users replied to <b>Midgar was destroyed!</b>"
+    )
+
+
 def test_default_notification_registry_supports_invite_notifications():
     message = registry.get_message(
         Notification(
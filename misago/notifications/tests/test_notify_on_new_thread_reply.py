@@ -1,9 +1,11 @@
 from datetime import timedelta
 
 import pytest
+from django.test import override_settings
 from django.utils import timezone
 
 from ...threads.models import ThreadParticipant
+from ...threads.test import reply_thread
 from ...users.bans import ban_user
 from ..models import Notification
 from ..tasks import notify_on_new_thread_reply
@@ -11,7 +13,9 @@ from ..tasks import notify_on_new_thread_reply
 
 @pytest.fixture
 def notify_watcher_mock(mocker):
-    return mocker.patch("misago.notifications.tasks.notify_watcher_on_new_thread_reply")
+    return mocker.patch(
+        "misago.notifications.tasks.notify_watchers_on_new_thread_reply"
+    )
 
 
 def test_notify_on_new_thread_reply_does_nothing_for_unwatched_thread(
@@ -51,7 +55,7 @@ def test_notify_on_new_thread_reply_handles_exceptions(
     mocker, watched_thread_factory, other_user, thread, user_reply
 ):
     notify_watcher_mock = mocker.patch(
-        "misago.notifications.tasks.notify_watcher_on_new_thread_reply",
+        "misago.notifications.tasks.notify_watchers_on_new_thread_reply",
         side_effect=ValueError("Unknown"),
     )
 
@@ -61,6 +65,21 @@ def test_notify_on_new_thread_reply_handles_exceptions(
     notify_watcher_mock.assert_called_once()
 
 
+def test_notify_on_new_thread_reply_handles_mail_queue_exceptions(
+    mocker, watched_thread_factory, other_user, thread, user_reply
+):
+    mocker.patch(
+        "misago.notifications.tasks.MailQueue.flush",
+        side_effect=ValueError("Unknown"),
+    )
+
+    watched_thread_factory(other_user, thread, send_emails=True)
+    notify_on_new_thread_reply(user_reply.id)
+
+    other_user.refresh_from_db()
+    assert other_user.unread_notifications == 1
+
+
 def test_notify_on_new_thread_reply_notifies_user_about_thread_reply(
     watched_thread_factory, user, other_user, thread, user_reply, mailoutbox
 ):
@@ -87,6 +106,24 @@ def test_notify_on_new_thread_reply_notifies_user_with_email_about_thread_reply(
     assert len(mailoutbox) == 1
 
 
+def test_notify_on_new_thread_reply_notifies_all_watchers_in_batch(
+    watched_thread_factory, user, other_user, staffuser, thread, user_reply, mailoutbox
+):
+    watched_thread_factory(other_user, thread, send_emails=False)
+    watched_thread_factory(staffuser, thread, send_emails=True)
+    notify_on_new_thread_reply(user_reply.id)
+
+    other_user.refresh_from_db()
+    assert other_user.unread_notifications == 1
+
+    staffuser.refresh_from_db()
+    assert staffuser.unread_notifications == 1
+
+    Notification.objects.get(user=other_user, actor=user)
+    Notification.objects.get(user=staffuser, actor=user)
+    assert len(mailoutbox) == 1
+
+
 def test_notify_on_new_thread_reply_checks_user_thread_permissions(
     mocker, watched_thread_factory, other_user, thread, user_reply, mailoutbox
 ):
@@ -124,6 +161,34 @@ def test_notify_on_new_thread_reply_checks_user_has_no_older_unread_posts(
     assert len(mailoutbox) == 0
 
 
+@override_settings(MISAGO_NOTIFICATIONS_COALESCE_WINDOW=5)
+def test_notify_on_new_thread_reply_coalesces_replies_notifications(
+    watched_thread_factory, other_user, staffuser, thread, user_reply, mailoutbox
+):
+    watched_thread = watched_thread_factory(other_user, thread, send_emails=True)
+
+    # Make thread's first post read and replies unread
+    watched_thread.read_at = thread.first_post.posted_on
+    watched_thread.save()
+
+    notify_on_new_thread_reply(user_reply.id)
+
+    staffuser_reply = reply_thread(
+        thread, poster=staffuser, posted_on=user_reply.posted_on + timedelta(seconds=5)
+    )
+    notify_on_new_thread_reply(staffuser_reply.id)
+
+    other_user.refresh_from_db()
+    assert other_user.unread_notifications == 1
+
+    notification = Notification.objects.get(user=other_user)
+    assert notification.actor == staffuser
+    assert notification.actors_count == 2
+    assert notification.post == user_reply
+
+    assert len(mailoutbox) == 1
+
+
 def test_notify_on_new_thread_reply_excludes_user_posts_from_unread_check(
     watched_thread_factory, user, other_user, thread, post, user_reply, mailoutbox
 ):
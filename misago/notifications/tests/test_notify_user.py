@@ -1,5 +1,7 @@
+from django.test import override_settings
+
 from ..models import Notification
-from ..users import notify_user
+from ..users import notify_user, notify_users
 
 
 def test_notify_user_creates_notification_for_user(user):
@@ -123,3 +125,116 @@ def test_notify_user_sets_post_on_notification(user, post):
     assert db_notification.thread is None
     assert db_notification.thread_title is None
     assert db_notification.post == post
+
+
+def test_notify_users_creates_notifications_for_users(user, other_user, thread):
+    notifications = notify_users([user, other_user], "TEST", thread=thread)
+    assert len(notifications) == 2
+
+    for notified_user in (user, other_user):
+        db_notification = Notification.objects.get(user=notified_user)
+        assert db_notification.verb == "TEST"
+        assert db_notification.thread == thread
+        assert db_notification.thread_title == thread.title
+
+
+def test_notify_users_increases_users_unread_notifications_counters(user, other_user):
+    notify_users([user, other_user], "TEST")
+
+    user.refresh_from_db()
+    assert user.unread_notifications == 1
+
+    other_user.refresh_from_db()
+    assert other_user.unread_notifications == 1
+
+
+def test_notify_users_does_nothing_for_empty_users_list(db):
+    assert notify_users([], "TEST") == []
+    assert not Notification.objects.exists()
+
+
+@override_settings(MISAGO_NOTIFICATIONS_COALESCE_WINDOW=5)
+def test_notify_user_coalesces_recent_unread_notification(
+    user, other_user, thread, post, reply
+):
+    notification = notify_user(user, "TEST", thread=thread, post=post)
+    coalesced = notify_user(
+        user, "TEST", actor=other_user, thread=thread, post=reply, coalesce=True
+    )
+    assert coalesced.id == notification.id
+
+    db_notification = Notification.objects.get(user=user)
+    assert db_notification.actor == other_user
+    assert db_notification.actors_count == 2
+    assert db_notification.post == post
+
+    user.refresh_from_db()
+    assert user.unread_notifications == 1
+
+
+@override_settings(MISAGO_NOTIFICATIONS_COALESCE_WINDOW=5)
+def test_notify_user_counts_coalesced_notification_distinct_actors(
+    user, other_user, staffuser, thread, post, reply
+):
+    notify_user(user, "TEST", actor=other_user, thread=thread, post=post)
+    notify_user(user, "TEST", actor=staffuser, thread=thread, post=reply, coalesce=True)
+    notify_user(
+        user, "TEST", actor=other_user, thread=thread, post=reply, coalesce=True
+    )
+
+    db_notification = Notification.objects.get(user=user)
+    assert db_notification.actor == other_user
+    assert db_notification.actors == [other_user.id, staffuser.id]
+    assert db_notification.actors_count == 2
+
+
+@override_settings(MISAGO_NOTIFICATIONS_COALESCE_WINDOW=5)
+def test_notify_users_counts_coalesced_notifications_distinct_actors(
+    user, other_user, staffuser, thread, reply
+):
+    notify_users([user], "TEST", actor=other_user, thread=thread)
+    notify_users([user], "TEST", actor=staffuser, thread=thread, coalesce=True)
+    notify_users([user], "TEST", actor=other_user, thread=thread, coalesce=True)
+
+    db_notification = Notification.objects.get(user=user)
+    assert db_notification.actor == other_user
+    assert db_notification.actors_count == 2
+
+
+@override_settings(MISAGO_NOTIFICATIONS_COALESCE_WINDOW=5)
+def test_notify_user_doesnt_coalesce_read_notification(user, thread):
+    notification = notify_user(user, "TEST", thread=thread)
+    notification.is_read = True
+    notification.save()
+
+    assert notify_user(user, "TEST", thread=thread, coalesce=True) != notification
+    assert Notification.objects.count() == 2
+
+
+def test_notify_user_doesnt_coalesce_if_window_is_disabled(user, thread):
+    notify_user(user, "TEST", thread=thread)
+    notify_user(user, "TEST", thread=thread, coalesce=True)
+    assert Notification.objects.count() == 2
+
+
+@override_settings(MISAGO_NOTIFICATIONS_COALESCE_WINDOW=5)
+def test_notify_users_coalesces_recent_unread_notifications(
+    user, other_user, thread, post, reply
+):
+    notify_user(user, "TEST", thread=thread, post=post)
+
+    notifications = notify_users(
+        [user, other_user], "TEST", thread=thread, post=reply, coalesce=True
+    )
+    assert len(notifications) == 1
+    assert notifications[0].user == other_user
+    assert notifications[0].post == reply
+
+    db_notification = Notification.objects.get(user=user)
+    assert db_notification.post == post
+
+    user.refresh_from_db()
+    assert user.unread_notifications == 1
+
+    other_user.refresh_from_db()
+    assert other_user.unread_notifications == 1
@@ -1,13 +1,13 @@
 from datetime import timedelta
 from typing import TYPE_CHECKING, Dict, Iterable, Optional
 
-from django.db.models import IntegerChoices
+from django.db.models import Case, Exists, IntegerChoices, OuterRef, When
 from django.utils.translation import pgettext, pgettext_lazy
 
 from ..acl.useracl import get_user_acl
 from ..categories.enums import CategoryTree
 from ..conf.dynamicsettings import DynamicSettings
-from ..core.mail import build_mail
+from ..core.mail import MailQueue, build_mail
 from ..threads.models import Post, Thread, ThreadParticipant
 from ..threads.permissions.privatethreads import (
     can_see_private_thread,
@@ -20,7 +20,7 @@ from ..threads.permissions.threads import (
 )
 from .verbs import NotificationVerb
 from .models import Notification, WatchedThread
-from .users import notify_user
+from .users import is_coalescing_enabled, notify_user, notify_users
 
 if TYPE_CHECKING:
     from ..users.models import User
@@ -111,7 +111,10 @@ def notify_watcher_on_new_thread_reply(
     if not user_can_see_post(watched_thread.user, user_acl, post, is_private):
         return  # Skip this watcher because they can't see the post
 
-    if user_has_other_unread_posts(watched_thread, user_acl, post, is_private):
+    has_other_unread_posts = user_has_other_unread_posts(
+        watched_thread, user_acl, post, is_private
+    )
+    if has_other_unread_posts and not is_coalescing_enabled():
         return  # We only notify on first unread post
 
     notify_user(
@@ -121,25 +124,214 @@ def notify_watcher_on_new_thread_reply(
         post.category,
         post.thread,
         post,
+        coalesce=True,
     )
 
-    if watched_thread.send_emails:
+    if watched_thread.send_emails and not has_other_unread_posts:
         email_watcher_on_new_thread_reply(watched_thread, post, settings)
 
 
+def notify_watchers_on_new_thread_reply(
+    watched_threads: list[WatchedThread],
+    post: Post,
+    cache_versions: Dict[str, str],
+    settings: DynamicSettings,
+    mail_queue: Optional[MailQueue] = None,
+):
+    """Notifies batch of thread's watchers about new reply.
+
+    Watchers permissions are checked once for every group of watchers sharing
+    same ACL, watchers other unread posts are found with single query and
+    notifications are created in bulk.
+
+    Watchers are notified on first unread post only. If coalescing is enabled,
+    watchers with other unread posts are notified too, so new replies update
+    their unread notification. They aren't e-mailed again.
+
+    E-mails are sent through mail_queue if one is given, letting caller reuse
+    single connection for many batches.
+    """
+    is_private = post.category.tree_id == CategoryTree.PRIVATE_THREADS
+    if is_private:
+        participants = set(
+            ThreadParticipant.objects.filter(
+                thread=post.thread,
+                user_id__in=[w.user_id for w in watched_threads],
+            ).values_list("user_id", flat=True)
+        )
+    else:
+        participants = set()
+
+    groups_acls: dict[tuple, dict] = {}
+    groups_can_see_post: dict[tuple, bool] = {}
+
+    watchers_acls: list[tuple[WatchedThread, dict]] = []
+    for watched_thread in watched_threads:
+        user = watched_thread.user
+        acl_group = get_watcher_acl_group(user, post, participants)
+        if acl_group not in groups_acls:
+            user_acl = get_user_acl(user, cache_versions)
+            groups_acls[acl_group] = user_acl
+            groups_can_see_post[acl_group] = user_acl_can_see_post(
+                user_acl, post, is_private, user.id in participants
+            )
+
+        if groups_can_see_post[acl_group]:
+            watchers_acls.append((watched_thread, groups_acls[acl_group]))
+
+    if not watchers_acls:
+        return  # Skip batch because none of the watchers can see the post
+
+    watchers_with_unread_posts = get_watchers_with_other_unread_posts(
+        watchers_acls, post, is_private
+    )
+    watchers_without_unread_posts = [
+        watched_thread
+        for watched_thread, _ in watchers_acls
+        if watched_thread.id not in watchers_with_unread_posts
+    ]
+    if is_coalescing_enabled():
+        watchers_to_notify = [watched_thread for watched_thread, _ in watchers_acls]
+    else:
+        watchers_to_notify = watchers_without_unread_posts
+
+    notify_users(
+        [watched_thread.user for watched_thread in watchers_to_notify],
+        NotificationVerb.REPLIED,
+        post.poster,
+        post.category,
+        post.thread,
+        post,
+        coalesce=True,
+    )
+
+    watchers_to_email = [
+        watched_thread
+        for watched_thread in watchers_without_unread_posts
+        if watched_thread.send_emails
+    ]
+    if not watchers_to_email:
+        return
+
+    if mail_queue:
+        queue_watchers_emails(mail_queue, watchers_to_email, post, settings)
+    else:
+        with MailQueue() as mail_queue:
+            queue_watchers_emails(mail_queue, watchers_to_email, post, settings)
+
+
+def queue_watchers_emails(
+    mail_queue: MailQueue,
+    watched_threads: list[WatchedThread],
+    post: Post,
+    settings: DynamicSettings,
+):
+    subject = get_new_thread_reply_email_subject(post)
+    for watched_thread in watched_threads:
+        mail_queue.append(
+            build_watcher_on_new_thread_reply_mail(
+                watched_thread, post, subject, settings
+            )
+        )
+
+
+def get_watcher_acl_group(user: "User", post: Post, participants: set[int]) -> tuple:
+    # Permission checks depend on user's roles and on user's relation to
+    # the thread, so watchers with same roles and relation share results
+    return (
+        user.acl_key or "user:%s" % user.id,
+        user.id == post.thread.starter_id,
+        user.id in participants,
+    )
+
+
+def user_acl_can_see_post(
+    user_acl: dict, post: Post, is_private: bool, is_participant: bool
+) -> bool:
+    if is_private:
+        return can_use_private_threads(user_acl) and can_see_private_thread(
+            user_acl, post.thread, is_participant
+        )
+
+    return can_see_thread(user_acl, post.thread) and can_see_post(user_acl, post)
+
+
+def get_watchers_with_other_unread_posts(
+    watchers_acls: list[tuple[WatchedThread, dict]],
+    post: Post,
+    is_private: bool,
+) -> set[int]:
+    """Returns IDs of watched threads with unread posts older than post.
+
+    Watchers are split into groups by posts they can see and the check is ran
+    for all groups in single query.
+    """
+    visibility_groups: dict[tuple, list[int]] = {}
+    for watched_thread, user_acl in watchers_acls:
+        if is_private:
+            visibility = (True, True)
+        else:
+            category_acl = user_acl["categories"].get(post.category_id, {})
+            visibility = (
+                bool(category_acl.get("can_approve_content")),
+                bool(category_acl.get("can_hide_events")),
+            )
+        visibility_groups.setdefault(visibility, []).append(watched_thread.id)
+
+    posts_queryset = Post.objects.filter(
+        id__lt=post.id,
+        thread=post.thread,
+        posted_on__gt=OuterRef("read_at"),
+    ).exclude(poster_id=OuterRef("user_id"))
+
+    cases = []
+    for (can_approve_content, can_hide_events), ids in visibility_groups.items():
+        visible_posts = posts_queryset
+        if not can_approve_content:
+            # Watcher's own unapproved posts are excluded from check anyway
+            visible_posts = visible_posts.filter(is_unapproved=False)
+        if not can_hide_events:
+            visible_posts = visible_posts.exclude(is_event=True, is_hidden=True)
+        cases.append(When(id__in=ids, then=Exists(visible_posts)))
+
+    return set(
+        WatchedThread.objects.annotate(has_unread_posts=Case(*cases, default=False))
+        .filter(
+            id__in=[watched_thread.id for watched_thread, _ in watchers_acls],
+            has_unread_posts=True,
+        )
+        .values_list("id", flat=True)
+    )
+
+
 def email_watcher_on_new_thread_reply(
     watched_thread: WatchedThread,
     post: Post,
     settings: DynamicSettings,
 ):
-    subject = pgettext(
+    subject = get_new_thread_reply_email_subject(post)
+    message = build_watcher_on_new_thread_reply_mail(
+        watched_thread, post, subject, settings
+    )
+    message.send()
+
+
+def get_new_thread_reply_email_subject(post: Post) -> str:
+    return pgettext(
         "new thread reply email subject", "%(thread)s - new reply by %(user)s"
     ) % {
         "user": post.poster.username,
         "thread": post.thread.title,
     }
 
-    message = build_mail(
+
+def build_watcher_on_new_thread_reply_mail(
+    watched_thread: WatchedThread,
+    post: Post,
+    subject: str,
+    settings: DynamicSettings,
+):
+    return build_mail(
         watched_thread.user,
         subject,
         "misago/emails/thread/reply",
@@ -152,8 +344,6 @@ def email_watcher_on_new_thread_reply(
         },
     )
 
-    message.send()
-
 
 def user_has_other_unread_posts(
     watched_thread: WatchedThread,
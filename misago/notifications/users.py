@@ -1,8 +1,12 @@
-from typing import TYPE_CHECKING, Optional
+from datetime import timedelta
+from typing import TYPE_CHECKING, Iterable, Optional
 
-from django.db.models import F
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, Func, Q, Value, When
+from django.utils import timezone
 
 from ..categories.models import Category
+from ..conf import settings
 from ..threads.models import Post, Thread
 from .models import Notification
 
@@ -17,12 +21,33 @@ def notify_user(
     category: Optional[Category] = None,
     thread: Optional[Thread] = None,
     post: Optional[Post] = None,
+    coalesce: bool = False,
 ) -> Notification:
+    """Notifies user.
+
+    If coalesce is true and coalescing is enabled, user's recent unread
+    notification with same verb and thread is updated with new actor instead.
+    Updated notification keeps its post, so reading it still marks it as read.
+    """
+    if coalesce:
+        notification = (
+            get_coalesced_notifications(verb, thread, user_id=user.id)
+            .order_by("-id")
+            .first()
+        )
+        if notification:
+            Notification.objects.filter(id=notification.id).update(
+                **get_coalesced_notification_update(actor)
+            )
+            notification.refresh_from_db()
+            return notification
+
     notification = Notification.objects.create(
         user=user,
         verb=verb,
         actor=actor,
         actor_name=actor.username if actor else None,
+        actors=[actor.id] if actor else [],
         category=category,
         thread=thread,
         thread_title=thread.title if thread else None,
@@ -33,3 +58,131 @@ def notify_user(
     user.save(update_fields=["unread_notifications"])
 
     return notification
+
+
+def notify_users(
+    users: Iterable["User"],
+    verb: str,
+    actor: Optional["User"] = None,
+    category: Optional[Category] = None,
+    thread: Optional[Thread] = None,
+    post: Optional[Post] = None,
+    coalesce: bool = False,
+) -> list[Notification]:
+    """Notifies many users at once using single insert and single update.
+
+    If coalesce is true and coalescing is enabled, users recent unread
+    notifications with same verb and thread are updated with new actor
+    instead. Returns list of created notifications.
+    """
+    users = list(users)
+    if not users:
+        return []
+
+    if coalesce:
+        coalesced_users_ids = update_coalesced_notifications(
+            [user.id for user in users], verb, actor, thread
+        )
+        users = [user for user in users if user.id not in coalesced_users_ids]
+        if not users:
+            return []
+
+    notifications = Notification.objects.bulk_create(
+        [
+            Notification(
+                user=user,
+                verb=verb,
+                actor=actor,
+                actor_name=actor.username if actor else None,
+                actors=[actor.id] if actor else [],
+                category=category,
+                thread=thread,
+                thread_title=thread.title if thread else None,
+                post=post,
+            )
+            for user in users
+        ]
+    )
+
+    get_user_model().objects.filter(id__in=[user.id for user in users]).update(
+        unread_notifications=F("unread_notifications") + 1
+    )
+
+    return notifications
+
+
+def is_coalescing_enabled() -> bool:
+    return bool(settings.MISAGO_NOTIFICATIONS_COALESCE_WINDOW)
+
+
+def get_coalesced_notifications(verb: str, thread: Optional[Thread], **filters):
+    window = settings.MISAGO_NOTIFICATIONS_COALESCE_WINDOW
+    if not window or not thread:
+        return Notification.objects.none()
+
+    return Notification.objects.filter(
+        verb=verb,
+        thread=thread,
+        is_read=False,
+        created_at__gte=timezone.now() - timedelta(minutes=window),
+        **filters,
+    )
+
+
+def update_coalesced_notifications(
+    users_ids: list[int],
+    verb: str,
+    actor: Optional["User"],
+    thread: Optional[Thread],
+) -> set[int]:
+    """Updates users unread notifications with new actor.
+
+    Returns IDs of users whose notifications were updated.
+    """
+    queryset = get_coalesced_notifications(verb, thread, user_id__in=users_ids)
+    notifications = dict(
+        queryset.order_by("user_id", "-id")
+        .distinct("user_id")
+        .values_list("id", "user_id")
+    )
+    if not notifications:
+        return set()
+
+    Notification.objects.filter(id__in=notifications).update(
+        **get_coalesced_notification_update(actor)
+    )
+
+    return set(notifications.values())
+
+
+def get_coalesced_notification_update(actor: Optional["User"]) -> dict:
+    """Returns update for coalesced notification's actor.
+
+    Actor is added to notification's distinct actors in the database, so
+    concurrent updates don't count same actor twice or lose other actors.
+    """
+    update = {
+        "actor": actor,
+        "actor_name": actor.username if actor else None,
+    }
+
+    if actor:
+        is_new_actor = ~Q(actors__contains=[actor.id])
+        update["actors"] = Case(
+            When(
+                is_new_actor,
+                then=Func(
+                    F("actors"),
+                    Value(actor.id),
+                    function="array_append",
+                    output_field=Notification._meta.get_field("actors"),
+                ),
+            ),
+            default=F("actors"),
+        )
+        update["actors_count"] = Case(
+            When(is_new_actor, then=F("actors_count") + 1),
+            default=F("actors_count"),
+        )
+
+    return update
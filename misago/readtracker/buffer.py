@@ -0,0 +1,110 @@
+from threading import local
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, Value
+from django.db.models.functions import Greatest
+
+from ..conf import settings
+from .readstate import save_read_posts_batch
+
+SYNC = "sync"
+BUFFERED = "buffered"
+CELERY = "celery"
+
+_local = local()
+
+
+class ReadBuffer:
+    """Collects posts reads and unread private threads counters changes.
+
+    Reads are merged per user and thread, and counters changes are merged
+    per user, so flushing the buffer takes few queries regardless of how
+    many posts were read.
+    """
+
+    def __init__(self):
+        self.reads = {}
+        self.unread_private_threads = {}
+
+    def __bool__(self):
+        return bool(self.reads or self.unread_private_threads)
+
+    def add_read_posts(self, user, thread, posts):
+        key = (user.id, thread.id)
+        if key not in self.reads:
+            self.reads[key] = (thread.category_id, set())
+
+        self.reads[key][1].update(post.id for post in posts)
+
+    def get_read_posts_ids(self, user) -> set[int]:
+        read_posts_ids = set()
+        for (user_id, _), (_, posts_ids) in self.reads.items():
+            if user_id == user.id:
+                read_posts_ids.update(posts_ids)
+        return read_posts_ids
+
+    def decrease_unread_private_threads(self, user):
+        self.unread_private_threads.setdefault(user.id, 0)
+        self.unread_private_threads[user.id] += 1
+
+    def pop(self):
+        reads = self.reads
+        unread_private_threads = self.unread_private_threads
+
+        self.reads = {}
+        self.unread_private_threads = {}
+
+        return reads, unread_private_threads
+
+
+def is_read_buffer_enabled() -> bool:
+    return settings.MISAGO_READTRACKER_WRITES != SYNC
+
+
+def get_read_buffer() -> ReadBuffer:
+    try:
+        return _local.buffer
+    except AttributeError:
+        _local.buffer = ReadBuffer()
+        return _local.buffer
+
+
+def flush_read_buffer():
+    read_buffer = get_read_buffer()
+    if not read_buffer:
+        return
+
+    reads, unread_private_threads = read_buffer.pop()
+
+    if settings.MISAGO_READTRACKER_WRITES == CELERY:
+        from .tasks import save_reads as save_reads_task
+
+        save_reads_task.delay(
+            [
+                [user_id, thread_id, category_id, sorted(posts_ids)]
+                for (user_id, thread_id), (category_id, posts_ids) in reads.items()
+            ],
+            list(unread_private_threads.items()),
+        )
+    else:
+        save_reads(reads, unread_private_threads)
+
+
+def save_reads(reads, unread_private_threads):
+    save_read_posts_batch(reads)
+    decrease_unread_private_threads(unread_private_threads)
+
+
+def decrease_unread_private_threads(unread_private_threads: dict[int, int]):
+    User = get_user_model()
+
+    decreases = {}
+    for user_id, decrease in unread_private_threads.items():
+        decreases.setdefault(decrease, []).append(user_id)
+
+    for decrease, users_ids in decreases.items():
+        User.objects.filter(id__in=users_ids).update(
+            unread_private_threads=Greatest(
+                F("unread_private_threads") - decrease, Value(0)
+            )
+        )
@@ -6,13 +6,20 @@ from ..categories.models import Category
 from ..threads.models import Post, Thread
 from ..threads.permissions import exclude_invisible_posts, exclude_invisible_threads
 from .cutoffdate import get_cutoff_date
+from .models import ReadCategory
+from .readstate import exclude_read_posts
 
 
 def get_categories_new_posts(
     request: HttpRequest,
     categories: Iterable[Category],
 ) -> dict[int, bool]:
-    """Returns a dict with category ID as a key and bool if it has new posts."""
+    """Returns a dict with category ID as a key and bool if it has new posts.
+
+    Categories with last post older than user's read watermark are resolved
+    without querying posts. Remaining categories are checked with posts query
+    and watermarks are moved for those that turned out to be read.
+    """
     if not categories:
         return {}
 
@@ -21,6 +28,53 @@ def get_categories_new_posts(
     if request.user.is_anonymous:
         return categories_new_posts
 
+    read_categories = get_read_categories(request.user, categories)
+    unresolved_categories = [
+        category
+        for category in categories
+        if not is_category_read(
+            request.user_acl, category, read_categories.get(category.id)
+        )
+    ]
+
+    if not unresolved_categories:
+        return categories_new_posts
+
+    unread_categories = get_unread_categories_ids(request, unresolved_categories)
+    for category_id in unread_categories:
+        categories_new_posts[category_id] = True
+
+    save_read_categories(
+        request.user,
+        [
+            category
+            for category in unresolved_categories
+            if category.id not in unread_categories
+        ],
+    )
+
+    return categories_new_posts
+
+
+def get_read_categories(user, categories: Iterable[Category]) -> dict:
+    queryset = ReadCategory.objects.filter(user=user, category__in=categories)
+    return dict(queryset.values_list("category_id", "read_on"))
+
+
+def is_category_read(user_acl: dict, category: Category, read_on) -> bool:
+    if not read_on:
+        return False
+
+    # Unapproved posts don't move category's last_post_on
+    if category.id in user_acl.get("can_approve_content", []):
+        return False
+
+    return not category.last_post_on or category.last_post_on <= read_on
+
+
+def get_unread_categories_ids(
+    request: HttpRequest, categories: list[Category]
+) -> set[int]:
     threads = Thread.objects.filter(category__in=categories)
     threads = exclude_invisible_threads(request.user_acl, categories, threads)
     queryset = (
@@ -33,10 +87,37 @@ def get_categories_new_posts(
         .distinct()
     )
 
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
+    queryset = exclude_read_posts(request.user, queryset)
     queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
 
-    for category_id in queryset:
-        categories_new_posts[category_id] = True
+    return set(queryset)
 
-    return categories_new_posts
+
+def save_read_categories(user, categories: Iterable[Category]):
+    ReadCategory.objects.bulk_create(
+        [
+            ReadCategory(user=user, category=category, read_on=category.last_post_on)
+            for category in categories
+            if category.last_post_on
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "category"],
+        update_fields=["read_on"],
+    )
+
+
+def sync_read_category(request: HttpRequest, category: Category):
+    """Moves user's read watermark in category if it has no new posts."""
+    if category.last_post_on and not get_unread_categories_ids(request, [category]):
+        save_read_categories(request.user, [category])
+
+
+def save_read_category_post(user, category: Category, post: Post):
+    """Moves user's read watermark in category past their own post.
+
+    Has to be called before post is set as category's last post.
+    """
+    if category.last_post_on:
+        ReadCategory.objects.filter(
+            user=user, category=category, read_on__gte=category.last_post_on
+        ).update(read_on=post.posted_on)
@@ -0,0 +1,99 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ....core.management.progressbar import show_progress
+from ....core.pgutils import chunk_queryset
+from ....threads.models import Thread
+from ...models import PostRead, ReadThread
+from ...readstate import compact_read_posts, get_read_posts_ids
+
+
+class Command(BaseCommand):
+    help = "Migrates legacy posts reads to threads read states"
+
+    def handle(self, *args, **options):
+        threads = Thread.objects.filter(
+            id__in=PostRead.objects.values("thread_id").distinct()
+        )
+        threads_to_migrate = threads.count()
+
+        if not threads_to_migrate:
+            self.stdout.write("\n\nNo posts reads to migrate were found")
+        else:
+            self.migrate_threads(threads, threads_to_migrate)
+
+    def migrate_threads(self, threads, threads_to_migrate):
+        self.stdout.write(
+            "Migrating posts reads in %s threads...\n" % threads_to_migrate
+        )
+
+        migrated_count = 0
+        show_progress(self, migrated_count, threads_to_migrate)
+        start_time = time.time()
+
+        for thread in chunk_queryset(threads):
+            migrate_thread_posts_reads(thread)
+
+            migrated_count += 1
+            show_progress(self, migrated_count, threads_to_migrate, start_time)
+
+        self.stdout.write("\n\nMigrated posts reads in %s threads" % migrated_count)
+
+
+def migrate_thread_posts_reads(thread):
+    posts_ids = list(thread.post_set.order_by("id").values_list("id", flat=True))
+
+    with transaction.atomic():
+        posts_reads = thread.postread_set.select_for_update()
+
+        users_reads = {}
+        users_last_read_on = {}
+        for user_id, post_id, last_read_on in posts_reads.values_list(
+            "user_id", "post_id", "last_read_on"
+        ):
+            users_reads.setdefault(user_id, set()).add(post_id)
+            users_last_read_on[user_id] = max(
+                last_read_on, users_last_read_on.get(user_id, last_read_on)
+            )
+
+        existing_read_threads = {
+            read_thread.user_id: read_thread
+            for read_thread in ReadThread.objects.select_for_update().filter(
+                thread=thread, user_id__in=users_reads
+            )
+        }
+
+        new_read_threads = []
+        updated_read_threads = []
+        for user_id, read_posts in users_reads.items():
+            read_thread = existing_read_threads.get(user_id)
+            if read_thread:
+                read_posts.update(get_read_posts_ids(read_thread, posts_ids))
+                last_read_on = max(
+                    read_thread.last_read_on, users_last_read_on[user_id]
+                )
+            else:
+                read_thread = ReadThread(
+                    user_id=user_id, category_id=thread.category_id, thread=thread
+                )
+                last_read_on = users_last_read_on[user_id]
+
+            read_thread.read_post_id, read_thread.read_posts = compact_read_posts(
+                0, posts_ids, read_posts & set(posts_ids)
+            )
+            read_thread.category_id = thread.category_id
+            read_thread.last_read_on = last_read_on
+
+            if read_thread.pk:
+                updated_read_threads.append(read_thread)
+            else:
+                new_read_threads.append(read_thread)
+
+        ReadThread.objects.bulk_create(new_read_threads)
+        ReadThread.objects.bulk_update(
+            updated_read_threads,
+            ["category", "read_post_id", "read_posts", "last_read_on"],
+        )
+        posts_reads.delete()
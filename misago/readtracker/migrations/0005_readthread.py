@@ -0,0 +1,81 @@
+# Generated by Django 4.2.8 on 2026-10-18 18:40
+
+from django.conf import settings
+import django.contrib.postgres.fields
+from django.db import migrations, models
+import django.db.models.deletion
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_threads", "0014_plugin_data"),
+        ("misago_categories", "0012_categories_trees_ids"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("misago_readtracker", "0004_auto_20171015_2010"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReadThread",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("read_post_id", models.PositiveIntegerField(default=0)),
+                (
+                    "read_posts",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.PositiveIntegerField(),
+                        default=list,
+                        size=None,
+                    ),
+                ),
+                (
+                    "last_read_on",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_categories.category",
+                    ),
+                ),
+                (
+                    "thread",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_threads.thread",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["user", "category"],
+                        name="misago_read_user_id_d71cc8_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="readthread",
+            constraint=models.UniqueConstraint(
+                fields=("user", "thread"), name="misago_readthread_user_thread"
+            ),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.8 on 2026-10-18 19:00
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_categories", "0012_categories_trees_ids"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("misago_readtracker", "0005_readthread"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReadCategory",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("read_on", models.DateTimeField()),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to="misago_categories.category",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="readcategory",
+            constraint=models.UniqueConstraint(
+                fields=("user", "category"), name="misago_readcategory_user_category"
+            ),
+        ),
+    ]
@@ -1,11 +1,66 @@
 from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
 from django.db import models
 from django.utils import timezone
 
 
 class PostRead(models.Model):
+    """Legacy per-post read record.
+
+    Replaced by ReadThread. Kept until existing records are migrated with the
+    migratepostreads command.
+    """
+
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
     thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
     post = models.ForeignKey("misago_threads.Post", on_delete=models.CASCADE)
     last_read_on = models.DateTimeField(default=timezone.now)
+
+
+class ReadThread(models.Model):
+    """User's read state in thread.
+
+    All posts with ID lower or equal to read_post_id are read. Posts with
+    greater ID are read if their IDs are in read_posts.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
+    thread = models.ForeignKey("misago_threads.Thread", on_delete=models.CASCADE)
+    read_post_id = models.PositiveIntegerField(default=0)
+    read_posts = ArrayField(models.PositiveIntegerField(), default=list)
+    last_read_on = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "thread"], name="misago_readthread_user_thread"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["user", "category"]),
+        ]
+
+    def is_post_read(self, post_id):
+        return post_id <= self.read_post_id or post_id in self.read_posts
+
+
+class ReadCategory(models.Model):
+    """User's read watermark in category.
+
+    Category had no posts unread by user when its last_post_on was equal to
+    read_on. If category's last_post_on didn't move past it since, category
+    has no new posts for the user.
+    """
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    category = models.ForeignKey("misago_categories.Category", on_delete=models.CASCADE)
+    read_on = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "category"], name="misago_readcategory_user_category"
+            ),
+        ]
@@ -1,4 +1,6 @@
+from .buffer import get_read_buffer, is_read_buffer_enabled
 from .cutoffdate import get_cutoff_date
+from .readstate import get_read_threads, save_read_posts
 
 
 def make_read_aware(request, posts):
@@ -22,11 +24,20 @@ def make_read_aware(request, posts):
             post.is_new = True
             unresolved_posts[post.pk] = post
 
+    if unresolved_posts and is_read_buffer_enabled():
+        buffered_posts_ids = get_read_buffer().get_read_posts_ids(request.user)
+        for post_id in buffered_posts_ids.intersection(unresolved_posts):
+            make_read([unresolved_posts.pop(post_id)])
+
     if unresolved_posts:
-        queryset = request.user.postread_set.filter(post__in=unresolved_posts)
-        for post_id in queryset.values_list("post_id", flat=True):
-            unresolved_posts[post_id].is_read = True
-            unresolved_posts[post_id].is_new = False
+        read_threads = get_read_threads(
+            request.user, {post.thread_id for post in unresolved_posts.values()}
+        )
+        for post in unresolved_posts.values():
+            read_thread = read_threads.get(post.thread_id)
+            if read_thread and read_thread.is_post_read(post.pk):
+                post.is_read = True
+                post.is_new = False
 
 
 def make_read(posts):
@@ -36,4 +47,7 @@ def make_read(posts):
 
 
 def save_read(user, post):
-    user.postread_set.create(category=post.category, thread=post.thread, post=post)
+    if is_read_buffer_enabled():
+        get_read_buffer().add_read_posts(user, post.thread, [post])
+    else:
+        save_read_posts(user, post.thread, [post])
@@ -0,0 +1,285 @@
+from typing import Iterable
+
+from django.db import transaction
+from django.db.models import BooleanField, Exists, Func, OuterRef, Q
+from django.utils import timezone
+
+from ..cache.versions import get_cache_versions_snapshot
+from ..conf.dynamicsettings import DynamicSettings
+from ..threads.models import Post, Thread
+from .cutoffdate import get_cutoff_date
+from .models import ReadThread
+
+NEXT_POSTS_FIELDS = ("id", "poster_id", "posted_on", "is_hidden", "is_unapproved")
+
+
+class ValueInArray(Func):
+    """Postgres "value = ANY(array)" expression."""
+
+    arg_joiner = " = ANY("
+    template = "(%(expressions)s))"
+    output_field = BooleanField()
+
+
+def get_read_threads(user, threads: Iterable) -> dict[int, ReadThread]:
+    """Returns dict with user's read states for threads, keyed by thread ID."""
+    threads_ids = [getattr(thread, "pk", thread) for thread in threads]
+    if not threads_ids:
+        return {}
+
+    queryset = ReadThread.objects.filter(user=user, thread_id__in=threads_ids)
+    return {read_thread.thread_id: read_thread for read_thread in queryset}
+
+
+def get_post_is_read_expression(user):
+    """Returns expression that's true for posts queryset rows read by user."""
+    read_threads = ReadThread.objects.filter(
+        Q(read_post_id__gte=OuterRef("id"))
+        | ValueInArray(OuterRef("id"), "read_posts"),
+        user=user,
+        thread_id=OuterRef("thread_id"),
+    )
+    return Exists(read_threads)
+
+
+def filter_read_posts(user, queryset):
+    return queryset.filter(get_post_is_read_expression(user))
+
+
+def exclude_read_posts(user, queryset):
+    return queryset.exclude(get_post_is_read_expression(user))
+
+
+def save_read_posts(user, thread: Thread, posts: Iterable[Post]):
+    """Marks posts in thread as read by user."""
+    posts_ids = {post.pk for post in posts}
+    if not posts_ids:
+        return
+
+    with transaction.atomic():
+        read_thread, _ = ReadThread.objects.select_for_update().get_or_create(
+            user=user, thread=thread, defaults={"category_id": thread.category_id}
+        )
+
+        read_posts = {
+            post_id for post_id in posts_ids if not read_thread.is_post_read(post_id)
+        }
+        if not read_posts:
+            return
+
+        read_posts.update(read_thread.read_posts)
+        next_posts = (
+            Post.objects.filter(
+                thread=thread,
+                id__gt=read_thread.read_post_id,
+                id__lte=max(read_posts),
+            )
+            .order_by("id")
+            .values_list(*NEXT_POSTS_FIELDS)
+        )
+
+        read_thread.read_post_id, read_thread.read_posts = compact_read_posts(
+            read_thread.read_post_id,
+            [post[0] for post in next_posts],
+            read_posts,
+            get_skipped_posts_ids(user.id, next_posts, get_read_cutoff_date(user)),
+        )
+        read_thread.category_id = thread.category_id
+        read_thread.last_read_on = timezone.now()
+        read_thread.save()
+
+
+def compact_read_posts(read_post_id, posts_ids, read_posts, skipped_posts=()):
+    """Moves read_post_id past all read posts in sorted posts_ids list.
+
+    Posts in skipped_posts don't stop read_post_id from moving past them.
+    Returns tuple with new read_post_id and sorted list of read posts that
+    are still greater than it.
+    """
+    for post_id in posts_ids:
+        if post_id not in read_posts and post_id not in skipped_posts:
+            break
+        read_post_id = post_id
+
+    return read_post_id, sorted(i for i in read_posts if i > read_post_id)
+
+
+def get_read_cutoff_date(user=None):
+    settings = DynamicSettings(get_cache_versions_snapshot())
+    return get_cutoff_date(settings, user)
+
+
+def get_skipped_posts_ids(user_id, posts, cutoff_date) -> set[int]:
+    """Returns IDs of posts that read_post_id can move past without read.
+
+    Those are posts older than read tracker's cutoff date, that are read
+    anyway, and hidden posts or other users unapproved posts, which user
+    can't read.
+    """
+    return {
+        post_id
+        for post_id, poster_id, posted_on, is_hidden, is_unapproved in posts
+        if (
+            posted_on <= cutoff_date
+            or is_hidden
+            or (is_unapproved and poster_id != user_id)
+        )
+    }
+
+
+def get_read_posts_ids(read_thread: ReadThread, posts_ids: Iterable[int]) -> set:
+    return {post_id for post_id in posts_ids if read_thread.is_post_read(post_id)}
+
+
+def merge_read_threads(thread: Thread, other_thread: Thread):
+    """Merges users read states in other thread into thread.
+
+    Has to be called before other thread's posts are moved to thread.
+    """
+    thread_posts = list(thread.post_set.order_by("id").values_list("id", flat=True))
+    other_thread_posts = list(
+        other_thread.post_set.order_by("id").values_list("id", flat=True)
+    )
+    merged_posts = sorted(thread_posts + other_thread_posts)
+
+    read_posts = {}
+    last_read_on = {}
+    for read_thread in thread.readthread_set.all():
+        read_posts[read_thread.user_id] = get_read_posts_ids(read_thread, thread_posts)
+        last_read_on[read_thread.user_id] = read_thread.last_read_on
+    for read_thread in other_thread.readthread_set.all():
+        read_posts.setdefault(read_thread.user_id, set()).update(
+            get_read_posts_ids(read_thread, other_thread_posts)
+        )
+        last_read_on[read_thread.user_id] = max(
+            read_thread.last_read_on,
+            last_read_on.get(read_thread.user_id, read_thread.last_read_on),
+        )
+
+    new_read_threads = []
+    for user_id, user_read_posts in read_posts.items():
+        read_post_id, user_read_posts = compact_read_posts(
+            0, merged_posts, user_read_posts
+        )
+        new_read_threads.append(
+            ReadThread(
+                user_id=user_id,
+                category_id=thread.category_id,
+                thread=thread,
+                read_post_id=read_post_id,
+                read_posts=user_read_posts,
+                last_read_on=last_read_on[user_id],
+            )
+        )
+
+    ReadThread.objects.filter(thread__in=[thread, other_thread]).delete()
+    ReadThread.objects.bulk_create(new_read_threads)
+
+
+def save_read_posts_batch(reads: dict[tuple[int, int], tuple[int, Iterable[int]]]):
+    """Marks posts as read for many users and threads in few queries.
+
+    Accepts dict with (user_id, thread_id) keys and (category_id, posts_ids)
+    values. Read states created concurrently by other process are merged
+    with new reads.
+    """
+    if not reads:
+        return
+
+    users_ids = {user_id for user_id, _ in reads}
+    threads_ids = {thread_id for _, thread_id in reads}
+
+    with transaction.atomic():
+        read_threads = {}
+        queryset = ReadThread.objects.select_for_update().filter(
+            user_id__in=users_ids, thread_id__in=threads_ids
+        )
+        for read_thread in queryset.order_by("id"):
+            key = (read_thread.user_id, read_thread.thread_id)
+            if key in reads:
+                read_threads[key] = read_thread
+
+        for (user_id, thread_id), (category_id, _) in reads.items():
+            if (user_id, thread_id) not in read_threads:
+                read_threads[(user_id, thread_id)] = ReadThread(
+                    user_id=user_id, category_id=category_id, thread_id=thread_id
+                )
+
+        min_read_post_id = min(i.read_post_id for i in read_threads.values())
+        max_post_id = max(
+            max(list(posts_ids) + read_threads[key].read_posts)
+            for key, (_, posts_ids) in reads.items()
+        )
+
+        threads_posts = {}
+        posts_queryset = Post.objects.filter(
+            thread_id__in=threads_ids, id__gt=min_read_post_id, id__lte=max_post_id
+        )
+        for thread_id, *post in posts_queryset.order_by("id").values_list(
+            "thread_id", *NEXT_POSTS_FIELDS
+        ):
+            threads_posts.setdefault(thread_id, []).append(post)
+
+        cutoff_date = get_read_cutoff_date()
+
+        new_read_threads = []
+        updated_read_threads = []
+        now = timezone.now()
+
+        for key, (category_id, posts_ids) in reads.items():
+            read_thread = read_threads[key]
+            read_posts = {
+                post_id
+                for post_id in posts_ids
+                if not read_thread.is_post_read(post_id)
+            }
+            if not read_posts:
+                continue
+
+            read_posts.update(read_thread.read_posts)
+            next_posts = [
+                post
+                for post in threads_posts.get(read_thread.thread_id, [])
+                if post[0] > read_thread.read_post_id
+            ]
+
+            read_thread.read_post_id, read_thread.read_posts = compact_read_posts(
+                read_thread.read_post_id,
+                [post[0] for post in next_posts],
+                read_posts,
+                get_skipped_posts_ids(read_thread.user_id, next_posts, cutoff_date),
+            )
+            read_thread.category_id = category_id
+            read_thread.last_read_on = now
+
+            if read_thread.pk:
+                updated_read_threads.append(read_thread)
+            else:
+                new_read_threads.append(read_thread)
+
+        ReadThread.objects.bulk_create(new_read_threads, ignore_conflicts=True)
+        ReadThread.objects.bulk_update(
+            updated_read_threads,
+            ["category", "read_post_id", "read_posts", "last_read_on"],
+        )
+
+        conflicts = get_read_threads_conflicts(new_read_threads, now)
+        if conflicts:
+            # Read threads were created concurrently, merge reads into them
+            save_read_posts_batch({key: reads[key] for key in conflicts})
+
+
+def get_read_threads_conflicts(
+    read_threads: list[ReadThread], last_read_on
+) -> set[tuple[int, int]]:
+    """Returns keys of read threads that weren't inserted due to conflicts."""
+    if not read_threads:
+        return set()
+
+    keys = {(i.user_id, i.thread_id) for i in read_threads}
+    queryset = ReadThread.objects.filter(
+        user_id__in={user_id for user_id, _ in keys},
+        thread_id__in={thread_id for _, thread_id in keys},
+    ).exclude(last_read_on=last_read_on)
+
+    return keys & set(queryset.values_list("user_id", "thread_id"))
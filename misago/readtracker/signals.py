@@ -1,31 +1,45 @@
+from logging import getLogger
+
+from django.core.signals import request_finished
 from django.dispatch import Signal, receiver
 
 from ..categories import PRIVATE_THREADS_ROOT_NAME
 from ..categories.signals import delete_category_content, move_category_content
 from ..threads.signals import merge_post, merge_thread, move_post, move_thread
+from .buffer import flush_read_buffer, get_read_buffer, is_read_buffer_enabled
 
 thread_read = Signal()
 
+logger = getLogger("misago.readtracker")
+
 
 @receiver(delete_category_content)
 def delete_category_threads(sender, **kwargs):
     sender.postread_set.all().delete()
+    sender.readthread_set.all().delete()
+    sender.readcategory_set.all().delete()
 
 
 @receiver(move_category_content)
 def move_category_tracker(sender, **kwargs):
     sender.postread_set.update(category=kwargs["new_category"])
+    sender.readthread_set.update(category=kwargs["new_category"])
+    sender.readcategory_set.all().delete()
+    kwargs["new_category"].readcategory_set.all().delete()
 
 
 @receiver(merge_thread)
 def merge_thread_tracker(sender, **kwargs):
     other_thread = kwargs["other_thread"]
     other_thread.postread_set.update(category=sender.category, thread=sender)
+    sender.category.readcategory_set.all().delete()
 
 
 @receiver(move_thread)
 def move_thread_tracker(sender, **kwargs):
     sender.postread_set.update(category=sender.category, thread=sender)
+    sender.readthread_set.update(category=sender.category)
+    sender.category.readcategory_set.all().delete()
 
 
 @receiver(merge_post)
@@ -36,6 +50,7 @@ def merge_post_delete_tracker(sender, **kwargs):
 @receiver(move_post)
 def move_post_delete_tracker(sender, **kwargs):
     sender.postread_set.all().delete()
+    sender.category.readcategory_set.all().delete()
 
 
 @receiver(thread_read)
@@ -48,4 +63,15 @@ def decrease_unread_private_count(sender, **kwargs):
 
     if user.unread_private_threads:
         user.unread_private_threads -= 1
-        user.save(update_fields=["unread_private_threads"])
+        if is_read_buffer_enabled():
+            get_read_buffer().decrease_unread_private_threads(user)
+        else:
+            user.save(update_fields=["unread_private_threads"])
+
+
+@receiver(request_finished)
+def flush_read_buffer_on_request_finished(sender, **kwargs):
+    try:
+        flush_read_buffer()
+    except Exception:
+        logger.exception("Unexpected error in 'flush_read_buffer'")
@@ -0,0 +1,14 @@
+from celery import shared_task
+
+from .buffer import save_reads as save_buffered_reads
+
+
+@shared_task(name="readtracker.save-reads", serializer="json")
+def save_reads(reads: list, unread_private_threads: list):
+    save_buffered_reads(
+        {
+            (user_id, thread_id): (category_id, set(posts_ids))
+            for user_id, thread_id, category_id, posts_ids in reads
+        },
+        dict(unread_private_threads),
+    )
@@ -1,11 +1,17 @@
 from datetime import timedelta
+from unittest.mock import Mock
 
 import pytest
 from django.utils import timezone
 
 from ...conf.test import override_dynamic_settings
 from ...threads.test import reply_thread
-from ..categories import get_categories_new_posts
+from ..categories import (
+    get_categories_new_posts,
+    save_read_category_post,
+    sync_read_category,
+)
+from ..models import ReadCategory
 from ..poststracker import save_read
 
 
@@ -178,3 +184,135 @@ def test_get_categories_new_posts_returns_false_for_untracked_thread_for_anonymo
         anonymous_request_mock, [default_category]
     )
     assert categories_new_posts == {default_category.pk: False}
+
+
+def sync_category(category):
+    category.synchronize()
+    category.save()
+
+
+def test_get_categories_new_posts_saves_read_category_watermark(
+    request_mock, user, read_thread, default_category
+):
+    sync_category(default_category)
+
+    categories_new_posts = get_categories_new_posts(request_mock, [default_category])
+    assert categories_new_posts == {default_category.pk: False}
+
+    read_category = ReadCategory.objects.get(user=user, category=default_category)
+    assert read_category.read_on == default_category.last_post_on
+
+
+def test_get_categories_new_posts_skips_watermark_for_unread_category(
+    request_mock, user, post, default_category
+):
+    sync_category(default_category)
+
+    categories_new_posts = get_categories_new_posts(request_mock, [default_category])
+    assert categories_new_posts == {default_category.pk: True}
+    assert not ReadCategory.objects.exists()
+
+
+def test_get_categories_new_posts_uses_watermark_if_category_has_no_new_posts(
+    request_mock, user, read_thread, default_category, django_assert_num_queries
+):
+    sync_category(default_category)
+    ReadCategory.objects.create(
+        user=user, category=default_category, read_on=default_category.last_post_on
+    )
+
+    with django_assert_num_queries(1):
+        categories_new_posts = get_categories_new_posts(
+            request_mock, [default_category]
+        )
+
+    assert categories_new_posts == {default_category.pk: False}
+
+
+def test_get_categories_new_posts_checks_posts_if_category_moved_past_watermark(
+    request_mock, user, read_thread, default_category
+):
+    sync_category(default_category)
+    ReadCategory.objects.create(
+        user=user, category=default_category, read_on=default_category.last_post_on
+    )
+
+    reply_thread(read_thread, posted_on=timezone.now() + timedelta(seconds=5))
+    default_category.refresh_from_db()
+
+    categories_new_posts = get_categories_new_posts(request_mock, [default_category])
+    assert categories_new_posts == {default_category.pk: True}
+
+
+def test_get_categories_new_posts_checks_posts_for_moderator(
+    dynamic_settings, superuser, superuser_acl, thread, default_category
+):
+    save_read(superuser, thread.first_post)
+    sync_category(default_category)
+    ReadCategory.objects.create(
+        user=superuser,
+        category=default_category,
+        read_on=default_category.last_post_on,
+    )
+    reply_thread(thread, is_unapproved=True)
+
+    request = Mock(settings=dynamic_settings, user=superuser, user_acl=superuser_acl)
+    categories_new_posts = get_categories_new_posts(request, [default_category])
+    assert categories_new_posts == {default_category.pk: True}
+
+
+def test_save_read_category_post_moves_watermark_past_user_post(
+    user, read_thread, default_category
+):
+    sync_category(default_category)
+    ReadCategory.objects.create(
+        user=user, category=default_category, read_on=default_category.last_post_on
+    )
+
+    last_post_on = default_category.last_post_on
+    post = reply_thread(
+        read_thread, poster=user, posted_on=timezone.now() + timedelta(seconds=5)
+    )
+
+    default_category.last_post_on = last_post_on
+    save_read_category_post(user, default_category, post)
+
+    read_category = ReadCategory.objects.get(user=user, category=default_category)
+    assert read_category.read_on == post.posted_on
+
+
+def test_save_read_category_post_skips_category_with_unread_posts(
+    user, read_thread, default_category
+):
+    read_on = timezone.now() - timedelta(days=1)
+    sync_category(default_category)
+    ReadCategory.objects.create(user=user, category=default_category, read_on=read_on)
+
+    post = reply_thread(read_thread, poster=user)
+    save_read_category_post(user, default_category, post)
+
+    read_category = ReadCategory.objects.get(user=user, category=default_category)
+    assert read_category.read_on == read_on
+
+
+def test_sync_read_category_saves_watermark_for_read_category(
+    request_mock, user, read_thread, default_category
+):
+    sync_category(default_category)
+    sync_read_category(request_mock, default_category)
+
+    read_category = ReadCategory.objects.get(user=user, category=default_category)
+    assert read_category.read_on == default_category.last_post_on
+
+
+def test_moving_thread_deletes_read_categories_watermarks(
+    user, thread, default_category, other_category
+):
+    sync_category(other_category)
+    ReadCategory.objects.create(
+        user=user, category=other_category, read_on=timezone.now()
+    )
+
+    thread.move(other_category)
+
+    assert not ReadCategory.objects.exists()
@@ -0,0 +1,80 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core import management
+from django.utils import timezone
+
+from ...threads.test import reply_thread
+from ..management.commands import migratepostreads
+from ..models import PostRead, ReadThread
+
+
+def call_command():
+    command = migratepostreads.Command()
+
+    out = StringIO()
+    management.call_command(command, stdout=out)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def create_post_read(user, post, last_read_on=None):
+    return PostRead.objects.create(
+        user=user,
+        category=post.category,
+        thread=post.thread,
+        post=post,
+        last_read_on=last_read_on or timezone.now(),
+    )
+
+
+def test_command_works_if_there_are_no_posts_reads(db):
+    command_output = call_command()
+    assert command_output == "No posts reads to migrate were found"
+
+
+def test_command_migrates_posts_reads_to_read_thread(user, thread):
+    post = reply_thread(thread)
+    create_post_read(user, thread.first_post)
+    create_post_read(user, post)
+
+    command_output = call_command()
+    assert command_output == "Migrated posts reads in 1 threads"
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.category_id == thread.category_id
+    assert read_thread.read_post_id == post.id
+    assert read_thread.read_posts == []
+    assert not PostRead.objects.exists()
+
+
+def test_command_keeps_unread_gaps_in_read_posts(user, thread):
+    reply_thread(thread)
+    last_post = reply_thread(thread)
+    create_post_read(user, thread.first_post)
+    create_post_read(user, last_post)
+
+    call_command()
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == thread.first_post.id
+    assert read_thread.read_posts == [last_post.id]
+
+
+def test_command_merges_posts_reads_with_existing_read_thread(user, thread):
+    post = reply_thread(thread)
+    last_read_on = timezone.now() - timedelta(days=2)
+    ReadThread.objects.create(
+        user=user,
+        category=thread.category,
+        thread=thread,
+        read_post_id=thread.first_post.id,
+        last_read_on=last_read_on,
+    )
+    create_post_read(user, post, last_read_on - timedelta(days=1))
+
+    call_command()
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == post.id
+    assert read_thread.read_posts == []
+    assert read_thread.last_read_on == last_read_on
@@ -0,0 +1,152 @@
+from unittest.mock import Mock
+
+from django.test import override_settings
+from django.urls import reverse
+
+from ...threads.test import reply_thread
+from ..buffer import flush_read_buffer, get_read_buffer
+from ..models import ReadThread
+from ..poststracker import save_read
+from ..signals import thread_read
+from ..tasks import save_reads
+from ..threadstracker import make_read_aware
+
+
+def test_read_is_saved_right_away_in_sync_mode(user, thread):
+    save_read(user, thread.first_post)
+
+    assert ReadThread.objects.filter(user=user, thread=thread).exists()
+    assert not get_read_buffer()
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="buffered")
+def test_read_is_buffered_until_flush_in_buffered_mode(user, thread):
+    save_read(user, thread.first_post)
+
+    assert not ReadThread.objects.exists()
+    assert get_read_buffer()
+
+    flush_read_buffer()
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == thread.first_post.id
+    assert not get_read_buffer()
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="buffered")
+def test_buffered_reads_are_merged_per_thread(user, thread):
+    post = reply_thread(thread)
+    last_post = reply_thread(thread)
+
+    save_read(user, thread.first_post)
+    save_read(user, last_post)
+    save_read(user, post)
+    flush_read_buffer()
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == last_post.id
+    assert read_thread.read_posts == []
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="buffered")
+def test_buffered_reads_update_existing_read_state(user, thread):
+    post = reply_thread(thread)
+    last_post = reply_thread(thread)
+
+    save_read(user, thread.first_post)
+    flush_read_buffer()
+    save_read(user, last_post)
+    flush_read_buffer()
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == thread.first_post.id
+    assert read_thread.read_posts == [last_post.id]
+
+    save_read(user, post)
+    flush_read_buffer()
+
+    read_thread.refresh_from_db()
+    assert read_thread.read_post_id == last_post.id
+    assert read_thread.read_posts == []
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="buffered")
+def test_buffered_reads_are_used_to_make_threads_read_aware(
+    dynamic_settings, user, user_acl, thread
+):
+    save_read(user, thread.first_post)
+
+    request = Mock(settings=dynamic_settings, user=user, user_acl=user_acl)
+    make_read_aware(request, thread)
+    assert thread.is_read
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="buffered")
+def test_unread_private_threads_decreases_are_merged_in_buffered_mode(
+    user, private_thread
+):
+    user.unread_private_threads = 5
+    user.save()
+
+    thread_read.send(user, thread=private_thread)
+    thread_read.send(user, thread=private_thread)
+    assert user.unread_private_threads == 3
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 5
+
+    flush_read_buffer()
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 3
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="celery")
+def test_buffered_reads_are_passed_to_celery_task_in_celery_mode(mocker, user, thread):
+    save_reads_mock = mocker.patch("misago.readtracker.tasks.save_reads.delay")
+
+    save_read(user, thread.first_post)
+    flush_read_buffer()
+
+    save_reads_mock.assert_called_once_with(
+        [[user.id, thread.id, thread.category_id, [thread.first_post.id]]], []
+    )
+
+
+@override_settings(MISAGO_READTRACKER_WRITES="buffered")
+def test_buffered_reads_are_flushed_after_request(user, user_client, thread):
+    post = reply_thread(thread)
+
+    response = user_client.post(
+        reverse(
+            "misago:api:thread-post-read",
+            kwargs={"thread_pk": thread.pk, "pk": post.pk},
+        )
+    )
+    assert response.status_code == 200
+
+    assert not get_read_buffer()
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.is_post_read(post.id)
+
+
+def test_celery_task_saves_buffered_reads(user, private_thread):
+    user.unread_private_threads = 1
+    user.save()
+
+    save_reads(
+        [
+            [
+                user.id,
+                private_thread.id,
+                private_thread.category_id,
+                [private_thread.first_post.id],
+            ]
+        ],
+        [[user.id, 1]],
+    )
+
+    assert ReadThread.objects.filter(user=user, thread=private_thread).exists()
+
+    user.refresh_from_db()
+    assert user.unread_private_threads == 0
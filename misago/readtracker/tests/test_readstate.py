@@ -0,0 +1,194 @@
+from ...threads.models import Post
+from ...threads.test import reply_thread
+from ..models import ReadThread
+from ..readstate import (
+    compact_read_posts,
+    exclude_read_posts,
+    filter_read_posts,
+    merge_read_threads,
+    save_read_posts,
+    save_read_posts_batch,
+)
+
+
+def test_compact_read_posts_moves_watermark_past_continuous_read_posts():
+    assert compact_read_posts(0, [1, 2, 3, 4], {1, 2, 4}) == (2, [4])
+
+
+def test_compact_read_posts_keeps_watermark_if_next_post_is_unread():
+    assert compact_read_posts(1, [2, 3], {3}) == (1, [3])
+
+
+def test_compact_read_posts_drops_read_posts_below_watermark():
+    assert compact_read_posts(5, [6], {2, 6}) == (6, [])
+
+
+def test_compact_read_posts_moves_watermark_past_skipped_posts():
+    assert compact_read_posts(0, [1, 2, 3, 4], {1, 3}, {2}) == (3, [])
+
+
+def test_saving_read_posts_creates_read_thread(user, thread):
+    save_read_posts(user, thread, [thread.first_post])
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.category_id == thread.category_id
+    assert read_thread.read_post_id == thread.first_post.id
+    assert read_thread.read_posts == []
+
+
+def test_saving_read_posts_stores_read_posts_after_unread_post(user, thread):
+    reply_thread(thread)
+    last_post = reply_thread(thread)
+
+    save_read_posts(user, thread, [thread.first_post, last_post])
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == thread.first_post.id
+    assert read_thread.read_posts == [last_post.id]
+
+
+def test_saving_read_posts_advances_watermark_when_gap_is_read(user, thread):
+    post = reply_thread(thread)
+    last_post = reply_thread(thread)
+
+    save_read_posts(user, thread, [thread.first_post, last_post])
+    save_read_posts(user, thread, [post])
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == last_post.id
+    assert read_thread.read_posts == []
+
+
+def test_saving_read_posts_advances_watermark_past_hidden_post(user, thread):
+    reply_thread(thread, is_hidden=True)
+    last_post = reply_thread(thread)
+
+    save_read_posts(user, thread, [thread.first_post, last_post])
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == last_post.id
+    assert read_thread.read_posts == []
+
+
+def test_saving_read_posts_advances_watermark_past_other_user_unapproved_post(
+    user, other_user, thread
+):
+    reply_thread(thread, poster=other_user, is_unapproved=True)
+    last_post = reply_thread(thread)
+
+    save_read_posts(user, thread, [thread.first_post, last_post])
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == last_post.id
+    assert read_thread.read_posts == []
+
+
+def test_saving_read_posts_keeps_watermark_before_user_unapproved_post(user, thread):
+    reply_thread(thread, poster=user, is_unapproved=True)
+    last_post = reply_thread(thread)
+
+    save_read_posts(user, thread, [thread.first_post, last_post])
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == thread.first_post.id
+    assert read_thread.read_posts == [last_post.id]
+
+
+def test_saving_read_posts_batch_advances_watermark_past_hidden_post(user, thread):
+    reply_thread(thread, is_hidden=True)
+    last_post = reply_thread(thread)
+
+    save_read_posts_batch(
+        {
+            (user.id, thread.id): (
+                thread.category_id,
+                [thread.first_post.id, last_post.id],
+            ),
+        }
+    )
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == last_post.id
+    assert read_thread.read_posts == []
+
+
+def test_filter_and_exclude_read_posts_use_read_state(user, other_user, thread):
+    post = reply_thread(thread)
+    last_post = reply_thread(thread)
+    save_read_posts(user, thread, [thread.first_post, last_post])
+
+    queryset = Post.objects.filter(thread=thread)
+    assert set(filter_read_posts(user, queryset)) == {thread.first_post, last_post}
+    assert list(exclude_read_posts(user, queryset)) == [post]
+    assert not filter_read_posts(other_user, queryset).exists()
+
+
+def test_merge_read_threads_combines_users_read_states(user, thread, other_thread):
+    save_read_posts(user, thread, [thread.first_post])
+    save_read_posts(user, other_thread, [other_thread.first_post])
+
+    merge_read_threads(thread, other_thread)
+
+    read_thread = ReadThread.objects.get(user=user)
+    assert read_thread.thread_id == thread.id
+    assert read_thread.read_post_id == max(
+        thread.first_post.id, other_thread.first_post.id
+    )
+    assert read_thread.read_posts == []
+
+
+def test_merge_read_threads_keeps_unread_posts_unread(user, thread, other_thread):
+    save_read_posts(user, other_thread, [other_thread.first_post])
+
+    merge_read_threads(thread, other_thread)
+
+    read_thread = ReadThread.objects.get(user=user)
+    assert read_thread.thread_id == thread.id
+    assert not read_thread.is_post_read(thread.first_post.id)
+    assert read_thread.is_post_read(other_thread.first_post.id)
+
+
+def test_saving_read_posts_batch_creates_and_updates_read_threads(
+    user, other_user, thread, other_thread
+):
+    save_read_posts(user, thread, [thread.first_post])
+    post = reply_thread(thread)
+
+    save_read_posts_batch(
+        {
+            (user.id, thread.id): (thread.category_id, [post.id]),
+            (other_user.id, other_thread.id): (
+                other_thread.category_id,
+                [other_thread.first_post.id],
+            ),
+        }
+    )
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == post.id
+
+    other_read_thread = ReadThread.objects.get(user=other_user, thread=other_thread)
+    assert other_read_thread.read_post_id == other_thread.first_post.id
+
+
+def test_saving_read_posts_batch_merges_reads_with_concurrently_created_read_thread(
+    mocker, user, thread
+):
+    post = reply_thread(thread)
+    bulk_create = ReadThread.objects.bulk_create
+
+    def create_read_thread_concurrently(*args, **kwargs):
+        save_read_posts(user, thread, [thread.first_post])
+        return bulk_create(*args, **kwargs)
+
+    mocker.patch.object(
+        ReadThread.objects,
+        "bulk_create",
+        side_effect=create_read_thread_concurrently,
+    )
+
+    save_read_posts_batch({(user.id, thread.id): (thread.category_id, [post.id])})
+
+    read_thread = ReadThread.objects.get(user=user, thread=thread)
+    assert read_thread.read_post_id == post.id
+    assert read_thread.read_posts == []
@@ -1,6 +1,8 @@
 from ..threads.models import Post
 from ..threads.permissions import exclude_invisible_posts
+from .buffer import get_read_buffer, is_read_buffer_enabled
 from .cutoffdate import get_cutoff_date
+from .readstate import exclude_read_posts
 
 
 def make_read_aware(request, threads):
@@ -24,7 +26,12 @@ def make_read_aware(request, threads):
         .distinct()
     )
 
-    queryset = queryset.exclude(id__in=request.user.postread_set.values("post"))
+    queryset = exclude_read_posts(request.user, queryset)
+    if is_read_buffer_enabled():
+        buffered_posts_ids = get_read_buffer().get_read_posts_ids(request.user)
+        if buffered_posts_ids:
+            queryset = queryset.exclude(id__in=buffered_posts_ids)
+
     queryset = exclude_invisible_posts(request.user_acl, categories, queryset)
 
     unread_threads = list(queryset)
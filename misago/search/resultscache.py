@@ -0,0 +1,42 @@
+from hashlib import sha256
+from typing import Callable, Hashable, Optional
+
+from django.core.cache import cache
+
+from ..conf import settings
+
+CACHE_KEY_PREFIX = "misago-search-results"
+
+
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def get_cached_search_results(
+    provider: str,
+    query: str,
+    visibility_key: Optional[Hashable],
+    get_results: Callable[[], list],
+) -> list:
+    """Returns search results from cache, calling get_results on cache miss
+
+    Results are cached for MISAGO_SEARCH_RESULTS_CACHE_TTL seconds for every
+    provider, normalized query and key identifying content visible to user.
+    Results for visibility_key of None are never cached.
+    """
+    ttl = settings.MISAGO_SEARCH_RESULTS_CACHE_TTL
+    if not ttl or visibility_key is None:
+        return get_results()
+
+    cache_key = get_cache_key(provider, query, visibility_key)
+    results = cache.get(cache_key)
+    if results is None:
+        results = get_results()
+        cache.set(cache_key, results, ttl)
+
+    return results
+
+
+def get_cache_key(provider: str, query: str, visibility_key: Hashable) -> str:
+    key = repr((provider, normalize_search_query(query), visibility_key))
+    return "%s-%s" % (CACHE_KEY_PREFIX, sha256(key.encode()).hexdigest())
@@ -0,0 +1,78 @@
+from unittest.mock import Mock
+
+import pytest
+from django.core.cache import cache
+from django.test import override_settings
+
+from ..resultscache import get_cached_search_results, normalize_search_query
+
+LOCMEM_CACHE = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
+
+@pytest.fixture
+def locmem_cache():
+    with override_settings(CACHES=LOCMEM_CACHE):
+        cache.clear()
+        yield cache
+        cache.clear()
+
+
+def test_search_query_is_normalized():
+    assert normalize_search_query("  Lorem   IPSUM\tdolor ") == "lorem ipsum dolor"
+
+
+def test_search_results_are_cached(locmem_cache):
+    get_results = Mock(return_value=[3, 2, 1])
+
+    assert get_cached_search_results("threads", "lorem", (1,), get_results) == [
+        3,
+        2,
+        1,
+    ]
+    assert get_cached_search_results("threads", "lorem", (1,), get_results) == [
+        3,
+        2,
+        1,
+    ]
+    get_results.assert_called_once()
+
+
+def test_search_results_are_cached_for_normalized_query(locmem_cache):
+    get_results = Mock(return_value=[1])
+
+    get_cached_search_results("threads", "Lorem  Ipsum", (1,), get_results)
+    get_cached_search_results("threads", "lorem ipsum", (1,), get_results)
+    get_results.assert_called_once()
+
+
+def test_search_results_are_cached_per_visibility_key(locmem_cache):
+    get_results = Mock(return_value=[1])
+
+    get_cached_search_results("threads", "lorem", (1,), get_results)
+    get_cached_search_results("threads", "lorem", (2,), get_results)
+    assert get_results.call_count == 2
+
+
+def test_search_results_are_cached_per_provider(locmem_cache):
+    get_results = Mock(return_value=[1])
+
+    get_cached_search_results("threads", "lorem", (1,), get_results)
+    get_cached_search_results("users", "lorem", (1,), get_results)
+    assert get_results.call_count == 2
+
+
+def test_search_results_are_not_cached_without_visibility_key(locmem_cache):
+    get_results = Mock(return_value=[1])
+
+    get_cached_search_results("threads", "lorem", None, get_results)
+    get_cached_search_results("threads", "lorem", None, get_results)
+    assert get_results.call_count == 2
+
+
+@override_settings(MISAGO_SEARCH_RESULTS_CACHE_TTL=0)
+def test_search_results_are_not_cached_if_cache_is_disabled(locmem_cache):
+    get_results = Mock(return_value=[1])
+
+    get_cached_search_results("threads", "lorem", (1,), get_results)
+    get_cached_search_results("threads", "lorem", (1,), get_results)
+    assert get_results.call_count == 2
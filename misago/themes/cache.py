@@ -1,22 +1,16 @@
-from django.core.cache import cache
-
 from . import THEME_CACHE
-from ..cache.versions import invalidate_cache
+from ..cache.versionedcache import VersionedCache
+
+theme_cache = VersionedCache(THEME_CACHE)
 
 
 def get_theme_cache(cache_versions):
-    key = get_cache_key(cache_versions)
-    return cache.get(key)
+    return theme_cache.get(cache_versions)
 
 
 def set_theme_cache(cache_versions, theme):
-    key = get_cache_key(cache_versions)
-    cache.set(key, theme)
-
-
-def get_cache_key(cache_versions):
-    return "%s_%s" % (THEME_CACHE, cache_versions[THEME_CACHE])
+    theme_cache.set(cache_versions, theme)
 
 
 def clear_theme_cache():
-    invalidate_cache(THEME_CACHE)
+    theme_cache.invalidate()
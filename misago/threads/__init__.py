@@ -0,0 +1 @@
+ATTACHMENT_TYPES_CACHE = "attachment_types"
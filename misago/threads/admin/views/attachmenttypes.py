@@ -3,6 +3,7 @@ from django.db.models import Count
 from django.utils.translation import pgettext, pgettext_lazy
 
 from ....admin.views import generic
+from ...attachmenttypescache import clear_attachment_types_cache
 from ...models import AttachmentType
 from ..forms import AttachmentTypeForm
 
@@ -24,6 +25,7 @@ class AttachmentTypeAdmin(generic.AdminBaseMixin):
     def handle_form(self, form, request, target):
         super().handle_form(form, request, target)
         form.save()
+        clear_attachment_types_cache()
 
 
 class AttachmentTypesList(AttachmentTypeAdmin, generic.ListView):
@@ -57,6 +59,7 @@ class DeleteAttachmentType(AttachmentTypeAdmin, generic.ButtonView):
 
     def button_action(self, request, target):
         target.delete()
+        clear_attachment_types_cache()
         message = pgettext(
             "admin attachments types", 'Attachment type "%(name)s" has been deleted.'
         )
@@ -6,6 +6,7 @@ from rest_framework.response import Response
 
 from ...acl.objectacl import add_acl_to_obj
 from ...users.audittrail import create_audit_trail
+from ..attachmentvariants import is_image_processing_deferred, process_attachment_image
 from ..models import Attachment, AttachmentType
 from ..serializers import AttachmentSerializer
 
@@ -49,7 +50,9 @@ class AttachmentViewSet(viewsets.ViewSet):
 
         if is_upload_image(upload):
             try:
-                attachment.set_image(upload)
+                attachment.set_image(
+                    upload, create_thumbnail=not is_image_processing_deferred()
+                )
             except IOError:
                 raise ValidationError(
                     pgettext(
@@ -60,6 +63,7 @@ class AttachmentViewSet(viewsets.ViewSet):
             attachment.set_file(upload)
 
         attachment.save()
+        process_attachment_image(attachment)
         add_acl_to_obj(request.user_acl, attachment)
 
         create_audit_trail(request, attachment)
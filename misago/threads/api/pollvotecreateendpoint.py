@@ -1,9 +1,8 @@
-from copy import deepcopy
-
 from rest_framework.response import Response
 
 from ...acl.objectacl import add_acl_to_obj
 from ..permissions import allow_vote_poll
+from ..pollvotes import update_poll_votes
 from ..serializers import NewVoteSerializer, PollSerializer
 
 
@@ -12,6 +11,14 @@ def poll_vote_create(request, thread, poll):
 
     allow_vote_poll(request.user_acl, poll)
 
+    # lock user to protect us from counting same votes twice
+    request.user.lock()
+
+    # user's votes may have changed while we were waiting for lock
+    poll.make_choices_votes_aware(request.user)
+
+    allow_vote_poll(request.user_acl, poll)
+
     serializer = NewVoteSerializer(
         data={"choices": request.data},
         context={"allowed_choices": poll.allowed_choices, "choices": poll.choices},
@@ -20,44 +27,37 @@ def poll_vote_create(request, thread, poll):
     if not serializer.is_valid():
         return Response({"detail": serializer.errors["choices"][0]}, status=400)
 
-    remove_user_votes(request.user, poll, serializer.data["choices"])
-    set_new_votes(request, poll, serializer.data["choices"])
+    final_votes = serializer.data["choices"]
+
+    votes_deltas = {}
+    remove_user_votes(request.user, poll, final_votes, votes_deltas)
+    set_new_votes(request, poll, final_votes, votes_deltas)
+    update_poll_votes(poll, votes_deltas)
+
+    for choice in poll.choices:
+        choice["selected"] = choice["hash"] in final_votes
 
     add_acl_to_obj(request.user_acl, poll)
     serialized_poll = PollSerializer(poll).data
 
-    poll.choices = list(map(presave_clean_choice, deepcopy(poll.choices)))
-    poll.save()
-
     return Response(serialized_poll)
 
 
-def presave_clean_choice(choice):
-    del choice["selected"]
-    return choice
-
-
-def remove_user_votes(user, poll, final_votes):
+def remove_user_votes(user, poll, final_votes, votes_deltas):
     removed_votes = []
     for choice in poll.choices:
         if choice["selected"] and choice["hash"] not in final_votes:
-            poll.votes -= 1
-            choice["votes"] -= 1
-
-            choice["selected"] = False
+            votes_deltas[choice["hash"]] = -1
             removed_votes.append(choice["hash"])
 
     if removed_votes:
         poll.pollvote_set.filter(voter=user, choice_hash__in=removed_votes).delete()
 
 
-def set_new_votes(request, poll, final_votes):
+def set_new_votes(request, poll, final_votes, votes_deltas):
     for choice in poll.choices:
         if not choice["selected"] and choice["hash"] in final_votes:
-            poll.votes += 1
-            choice["votes"] += 1
-
-            choice["selected"] = True
+            votes_deltas[choice["hash"]] = 1
             poll.pollvote_set.create(
                 category=poll.category,
                 thread=poll.thread,
@@ -2,6 +2,7 @@ from rest_framework.response import Response
 
 from ....notifications.models import Notification, WatchedThread
 from ....readtracker import poststracker, threadstracker
+from ....readtracker.categories import sync_read_category
 from ....readtracker.signals import thread_read
 from ....users.models import User
 from ...models import Post
@@ -21,6 +22,7 @@ def post_read_endpoint(request, thread, watched_thread, post):
     # used in some places, eg. syncing unread thread count
     if post.is_new and thread.is_read:
         thread_read.send(request.user, thread=thread)
+        sync_read_category(request, thread.category)
 
     return Response({"thread_is_read": thread.is_read})
 
@@ -3,6 +3,7 @@ from rest_framework import serializers
 
 from . import PostingEndpoint, PostingMiddleware
 from ....markup import common_flavour
+from ....readtracker.categories import save_read_category_post
 from ....readtracker.poststracker import save_read
 from ....users.audittrail import create_audit_trail
 from ...checksums import update_post_checksum
@@ -48,6 +49,7 @@ class ReplyMiddleware(PostingMiddleware):
 
         if self.mode in (PostingEndpoint.START, PostingEndpoint.REPLY):
             save_read(self.user, self.post)
+            save_read_category_post(self.user, self.thread.category, self.post)
 
         self.thread.save()
 
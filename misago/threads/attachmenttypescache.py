@@ -0,0 +1,35 @@
+from ..cache.versionedcache import VersionedCache
+from . import ATTACHMENT_TYPES_CACHE
+from .models import AttachmentType
+
+attachment_types_cache = VersionedCache(ATTACHMENT_TYPES_CACHE)
+
+
+def get_attachment_types_download_roles(cache_versions) -> dict[int, frozenset]:
+    """Returns dict of attachment types IDs and roles allowed to download them.
+
+    Attachment types without download restrictions are left out.
+    """
+    download_roles = attachment_types_cache.get(cache_versions)
+    if download_roles is None:
+        download_roles = build_attachment_types_download_roles()
+        attachment_types_cache.set(cache_versions, download_roles)
+
+    return download_roles
+
+
+def build_attachment_types_download_roles() -> dict[int, frozenset]:
+    download_roles = {}
+    queryset = AttachmentType.limit_downloads_to.through.objects.values_list(
+        "attachmenttype_id", "role_id"
+    )
+    for filetype_id, role_id in queryset:
+        download_roles.setdefault(filetype_id, set()).add(role_id)
+
+    return {
+        filetype_id: frozenset(roles) for filetype_id, roles in download_roles.items()
+    }
+
+
+def clear_attachment_types_cache():
+    attachment_types_cache.invalidate()
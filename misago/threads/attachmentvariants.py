@@ -0,0 +1,98 @@
+import os
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from PIL import Image
+
+from ..conf import settings
+from .models import Attachment
+
+SYNC = "sync"
+CELERY = "celery"
+
+WEBP = "webp"
+THUMBNAIL_WEBP = "thumbnail_webp"
+
+
+def is_image_processing_deferred() -> bool:
+    return settings.MISAGO_ATTACHMENT_IMAGE_PROCESSING == CELERY
+
+
+def process_attachment_image(attachment: Attachment):
+    """Queues creation of variants for saved image attachment.
+
+    Variants are only created in "celery" mode, by the task ran after current
+    transaction is committed. Task also creates attachment's thumbnail.
+    In "sync" mode thumbnail is created during upload and image has no
+    variants, so upload isn't slowed down by decoding and encoding image again.
+    """
+    if not attachment.is_image or not is_image_processing_deferred():
+        return
+
+    from .tasks import create_attachment_variants as create_variants_task
+
+    attachment_id = attachment.id
+    transaction.on_commit(lambda: create_variants_task.delay(attachment_id))
+
+
+def create_attachment_variants(attachment: Attachment, create_thumbnail=False):
+    """Decodes attachment's image once and creates its WebP variants.
+
+    WebP variant of full image is only created if it's enabled in settings,
+    and only kept if it's smaller than original.
+    """
+    with attachment.image.open("rb") as image_file:
+        image = Image.open(image_file)
+        image.load()
+
+    update_fields = ["variants"]
+    if create_thumbnail:
+        attachment.set_thumbnail(image.copy(), os.path.basename(attachment.image.name))
+        if attachment.thumbnail:
+            update_fields.append("thumbnail")
+
+    variants = {}
+    is_animated = getattr(image, "is_animated", False)
+
+    webp_full_images = settings.MISAGO_ATTACHMENT_WEBP_FULL_IMAGES
+    if webp_full_images and image.format != "WEBP" and not is_animated:
+        webp_data = encode_webp(image)
+        if len(webp_data) < attachment.image.size:
+            variants[WEBP] = save_variant(attachment, WEBP, image, webp_data)
+
+    size_limit = settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT
+    if image.size[0] > size_limit[0] or image.size[1] > size_limit[1] or is_animated:
+        thumbnail = image.copy()
+        thumbnail.thumbnail(size_limit)
+        variants[THUMBNAIL_WEBP] = save_variant(
+            attachment, THUMBNAIL_WEBP, thumbnail, encode_webp(thumbnail)
+        )
+
+    attachment.variants = variants or None
+    attachment.save(update_fields=update_fields)
+
+
+def encode_webp(image: Image.Image) -> bytes:
+    if image.mode not in ("RGB", "RGBA"):
+        has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    stream = BytesIO()
+    image.save(stream, "webp", quality=settings.MISAGO_ATTACHMENT_WEBP_QUALITY)
+    return stream.getvalue()
+
+
+def save_variant(
+    attachment: Attachment, variant: str, image: Image.Image, data: bytes
+) -> dict:
+    path = "%s.%s.webp" % (os.path.splitext(attachment.image.name)[0], variant)
+    name = attachment.image.storage.save(path, ContentFile(data))
+
+    return {
+        "name": name,
+        "format": "webp",
+        "width": image.size[0],
+        "height": image.size[1],
+        "size": len(data),
+    }
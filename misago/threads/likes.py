@@ -0,0 +1,102 @@
+from typing import Iterable
+
+from django.db import connection
+
+from .models import Post, PostLike
+
+LAST_LIKES_LIMIT = 4
+
+UPDATE_POST_LIKES_SQL = """
+UPDATE {posts} SET
+    likes = GREATEST(likes + %(delta)s, 0),
+    last_likes = (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_build_object('id', liker_id, 'username', liker_name)
+                ORDER BY id DESC
+            ),
+            '[]'::jsonb
+        )
+        FROM (
+            SELECT id, liker_id, liker_name FROM {likes}
+            WHERE post_id = %(post_id)s
+            ORDER BY id DESC
+            LIMIT %(limit)s
+        ) AS last_likes
+    )
+WHERE id = %(post_id)s
+RETURNING likes, last_likes
+"""
+
+
+def like_post(post: Post, user) -> bool:
+    """Adds user's like to post. Returns False if post was already liked.
+
+    Caller is expected to lock user, so user's concurrent requests don't
+    create duplicate likes.
+    """
+    if PostLike.objects.filter(post=post, liker=user).exists():
+        return False
+
+    PostLike.objects.create(
+        category=post.category,
+        thread=post.thread,
+        post=post,
+        liker=user,
+        liker_name=user.username,
+        liker_slug=user.slug,
+    )
+
+    update_post_likes(post, 1)
+    return True
+
+
+def unlike_post(post: Post, user) -> bool:
+    """Removes user's like from post. Returns False if post wasn't liked."""
+    deleted, _ = PostLike.objects.filter(post=post, liker=user).delete()
+    if not deleted:
+        return False
+
+    update_post_likes(post, -deleted)
+    return True
+
+
+def update_post_likes(post: Post, delta: int):
+    """Applies delta to post's likes and rebuilds its last likes.
+
+    Both are updated in database in single statement, so concurrent likes
+    don't overwrite each other's counts. Post's attributes are set to values
+    returned by the database.
+    """
+    sql = UPDATE_POST_LIKES_SQL.format(
+        posts=Post._meta.db_table, likes=PostLike._meta.db_table
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            sql, {"post_id": post.id, "delta": delta, "limit": LAST_LIKES_LIMIT}
+        )
+        row = cursor.fetchone()
+
+    if row:
+        likes, last_likes = row
+        # Raw jsonb value is not decoded by database driver
+        last_likes_field = Post._meta.get_field("last_likes")
+        post.likes = likes
+        post.last_likes = last_likes_field.from_db_value(last_likes, None, connection)
+
+
+def get_liked_posts_ids(user, posts_ids: Iterable[int]) -> set[int]:
+    """Returns IDs of posts from given list that user has liked."""
+    if user.is_anonymous:
+        return set()
+
+    posts_ids = list(posts_ids)
+    if not posts_ids:
+        return set()
+
+    return set(
+        PostLike.objects.filter(liker=user, post_id__in=posts_ids).values_list(
+            "post_id", flat=True
+        )
+    )
@@ -0,0 +1,63 @@
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from ....core.management.progressbar import show_progress
+from ...usercontent import (
+    DEFAULT_BATCH_SIZE,
+    count_user_content,
+    delete_user_threads_and_posts,
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Deletes threads, posts and other content of specified user. "
+        "Can be ran again to resume interrupted deletion."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("user_id", type=int, help="ID of user to delete content of")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="number of rows deleted in single transaction",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(id=options["user_id"])
+        except User.DoesNotExist:
+            raise CommandError("User with ID %s doesn't exist." % options["user_id"])
+
+        content_to_delete = sum(count_user_content(user).values())
+        if content_to_delete:
+            self.delete_content(user, content_to_delete, options["batch_size"])
+        else:
+            self.stdout.write("\n\nNo content was found")
+
+        # Let other apps delete their content of user too
+        user.delete_content()
+
+    def delete_content(self, user, content_to_delete, batch_size):
+        self.stdout.write(
+            "Deleting %s likes, threads and posts of %s...\n"
+            % (content_to_delete, user.username)
+        )
+
+        deleted_count = 0
+        show_progress(self, deleted_count, content_to_delete)
+        start_time = time.time()
+
+        for _, batch_count in delete_user_threads_and_posts(user, batch_size):
+            deleted_count = min(deleted_count + batch_count, content_to_delete)
+            show_progress(self, deleted_count, content_to_delete, start_time)
+
+        # User's posts in their threads are deleted together with those threads
+        show_progress(self, content_to_delete, content_to_delete, start_time)
+
+        self.stdout.write("\n\nDone")
@@ -2,41 +2,97 @@ import time
 
 from django.core.management.base import BaseCommand
 
+from ....core.management.batches import (
+    clear_checkpoint,
+    read_checkpoint,
+    save_checkpoint,
+)
 from ....core.management.progressbar import show_progress
-from ....core.pgutils import chunk_queryset
 from ...models import Post
+from ...searchindex import DEFAULT_BATCH_SIZE, rebuild_posts_search
 
 
 class Command(BaseCommand):
     help = "Rebuilds posts search"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="number of posts rebuilt in single batch",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="number of rebuilding processes, defaults to number of CPUs",
+        )
+        parser.add_argument(
+            "--from-id",
+            type=int,
+            default=0,
+            help="ID of first post to rebuild search for",
+        )
+        parser.add_argument(
+            "--to-id",
+            type=int,
+            default=None,
+            help="ID of last post to rebuild search for",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="file to store last rebuilt post ID in and resume from",
+        )
+
     def handle(self, *args, **options):
-        posts_to_reindex = Post.objects.filter(is_event=False).count()
+        checkpoint = options["checkpoint"]
+        start_after = max(read_checkpoint(checkpoint), options["from_id"] - 1, 0)
+
+        queryset = Post.objects.all()
+        if options["to_id"]:
+            queryset = queryset.filter(id__lte=options["to_id"])
+
+        posts_to_reindex = queryset.filter(is_event=False, id__gt=start_after).count()
 
         if not posts_to_reindex:
             self.stdout.write("\n\nNo posts were found")
         else:
-            self.rebuild_posts_search(posts_to_reindex)
+            self.rebuild_posts_search(
+                queryset,
+                posts_to_reindex,
+                start_after,
+                checkpoint,
+                options["batch_size"],
+                options["processes"],
+            )
 
-    def rebuild_posts_search(self, posts_to_reindex):
+    def rebuild_posts_search(
+        self,
+        queryset,
+        posts_to_reindex,
+        start_after,
+        checkpoint,
+        batch_size,
+        processes,
+    ):
         self.stdout.write("Rebuilding search for %s posts...\n" % posts_to_reindex)
 
         rebuild_count = 0
         show_progress(self, rebuild_count, posts_to_reindex)
         start_time = time.time()
 
-        queryset = Post.objects.select_related("thread").filter(is_event=False)
-        for post in chunk_queryset(queryset):
-            if post.id == post.thread.first_post_id:
-                post.set_search_document(post.thread.title)
-            else:
-                post.set_search_document()
-            post.save(update_fields=["search_document"])
+        for batch_count, last_post_id in rebuild_posts_search(
+            queryset,
+            start_after=start_after,
+            batch_size=batch_size,
+            processes=processes,
+        ):
+            save_checkpoint(checkpoint, last_post_id)
 
-            post.update_search_vector()
-            post.save(update_fields=["search_vector"])
-
-            rebuild_count += 1
+            rebuild_count = min(rebuild_count + batch_count, posts_to_reindex)
             show_progress(self, rebuild_count, posts_to_reindex, start_time)
 
+        clear_checkpoint(checkpoint)
+
         self.stdout.write("\n\nRebuild search for %s posts" % rebuild_count)
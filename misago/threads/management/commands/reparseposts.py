@@ -0,0 +1,100 @@
+import time
+from urllib.parse import urlparse
+
+from django.core.management.base import BaseCommand, CommandError
+
+from ....conf.shortcuts import get_dynamic_settings
+from ....core.management.batches import (
+    clear_checkpoint,
+    read_checkpoint,
+    save_checkpoint,
+)
+from ....core.management.progressbar import show_progress
+from ...models import Post
+from ...reparse import DEFAULT_BATCH_SIZE, reparse_posts
+
+
+class Command(BaseCommand):
+    help = "Parses posts again, updating their parsed texts, checksums and search"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--host",
+            help="forum's host, used to tell internal links from outgoing ones",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="number of posts parsed in single batch",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="number of parsing processes, defaults to number of CPUs",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help="file to store last parsed post ID in and resume from",
+        )
+
+    def handle(self, *args, **options):
+        host = options["host"] or self.get_forum_host()
+        checkpoint = options["checkpoint"]
+        start_after = read_checkpoint(checkpoint)
+
+        posts_to_reparse = Post.objects.filter(
+            is_event=False, id__gt=start_after
+        ).count()
+
+        if not posts_to_reparse:
+            self.stdout.write("\n\nNo posts were found")
+        else:
+            self.reparse_posts(
+                host,
+                posts_to_reparse,
+                start_after,
+                checkpoint,
+                options["batch_size"],
+                options["processes"],
+            )
+
+    def get_forum_host(self):
+        forum_address = get_dynamic_settings().forum_address
+        if not forum_address:
+            raise CommandError(
+                "Forum address is not set in settings, please use --host option."
+            )
+
+        return urlparse(forum_address).netloc
+
+    def reparse_posts(
+        self, host, posts_to_reparse, start_after, checkpoint, batch_size, processes
+    ):
+        if start_after:
+            self.stdout.write(
+                "Resuming after post %s, reparsing %s posts...\n"
+                % (start_after, posts_to_reparse)
+            )
+        else:
+            self.stdout.write("Reparsing %s posts...\n" % posts_to_reparse)
+
+        reparsed_count = 0
+        show_progress(self, reparsed_count, posts_to_reparse)
+        start_time = time.time()
+
+        for batch_count, last_post_id in reparse_posts(
+            host,
+            start_after=start_after,
+            batch_size=batch_size,
+            processes=processes,
+        ):
+            save_checkpoint(checkpoint, last_post_id)
+
+            reparsed_count = min(reparsed_count + batch_count, posts_to_reparse)
+            show_progress(self, reparsed_count, posts_to_reparse, start_time)
+
+        clear_checkpoint(checkpoint)
+
+        self.stdout.write("\n\nReparsed %s posts" % reparsed_count)
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from ....core.management.progressbar import show_progress
+from ...models import Poll
+from ...pollvotes import DEFAULT_BATCH_SIZE, synchronize_all_polls_votes
+
+
+class Command(BaseCommand):
+    help = "Recomputes polls votes from cast votes"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="number of polls synchronized in single batch",
+        )
+
+    def handle(self, *args, **options):
+        polls_to_sync = Poll.objects.count()
+
+        if not polls_to_sync:
+            self.stdout.write("\n\nNo polls were found")
+        else:
+            self.sync_polls(polls_to_sync, options["batch_size"])
+
+    def sync_polls(self, polls_to_sync, batch_size):
+        self.stdout.write("Synchronizing %s polls...\n" % polls_to_sync)
+
+        synchronized_count = 0
+        show_progress(self, synchronized_count, polls_to_sync)
+        start_time = time.time()
+
+        for batch_count in synchronize_all_polls_votes(batch_size=batch_size):
+            synchronized_count = min(synchronized_count + batch_count, polls_to_sync)
+            show_progress(self, synchronized_count, polls_to_sync, start_time)
+
+        self.stdout.write("\n\nSynchronized %s polls" % synchronized_count)
@@ -3,33 +3,48 @@ import time
 from django.core.management.base import BaseCommand
 
 from ....core.management.progressbar import show_progress
-from ....core.pgutils import chunk_queryset
 from ...models import Thread
+from ...synchronize import DEFAULT_BATCH_SIZE, synchronize_all_threads
 
 
 class Command(BaseCommand):
     help = "Synchronizes threads"
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="number of threads synchronized in single batch",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            default=None,
+            help="number of synchronizing processes, defaults to number of CPUs",
+        )
+
     def handle(self, *args, **options):
         threads_to_sync = Thread.objects.count()
 
         if not threads_to_sync:
             self.stdout.write("\n\nNo threads were found")
         else:
-            self.sync_threads(threads_to_sync)
+            self.sync_threads(
+                threads_to_sync, options["batch_size"], options["processes"]
+            )
 
-    def sync_threads(self, threads_to_sync):
+    def sync_threads(self, threads_to_sync, batch_size, processes):
         self.stdout.write("Synchronizing %s threads...\n" % threads_to_sync)
 
         synchronized_count = 0
         show_progress(self, synchronized_count, threads_to_sync)
         start_time = time.time()
 
-        for thread in chunk_queryset(Thread.objects.all()):
-            thread.synchronize()
-            thread.save()
-
-            synchronized_count += 1
+        for batch_count in synchronize_all_threads(
+            batch_size=batch_size, processes=processes
+        ):
+            synchronized_count = min(synchronized_count + batch_count, threads_to_sync)
             show_progress(self, synchronized_count, threads_to_sync, start_time)
 
         self.stdout.write("\n\nSynchronized %s threads" % synchronized_count)
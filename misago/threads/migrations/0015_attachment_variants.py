@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_threads", "0014_plugin_data"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="attachment",
+            name="variants",
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,13 @@
+from django.db import migrations
+
+from .. import ATTACHMENT_TYPES_CACHE
+from ...cache.operations import StartCacheVersioning
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_threads", "0015_attachment_variants"),
+        ("misago_cache", "0001_initial"),
+    ]
+
+    operations = [StartCacheVersioning(ATTACHMENT_TYPES_CACHE)]
@@ -57,6 +57,7 @@ class Attachment(PluginDataModel):
         max_length=255, blank=True, null=True, upload_to=upload_to
     )
     file = models.FileField(max_length=255, blank=True, null=True, upload_to=upload_to)
+    variants = models.JSONField(null=True, blank=True)
 
     def __str__(self):
         return self.filename
@@ -72,6 +73,9 @@ class Attachment(PluginDataModel):
             self.image.delete(save=False)
         if self.file:
             self.file.delete(save=False)
+        if self.variants:
+            for variant in self.variants.values():
+                self.image.storage.delete(variant["name"])
 
     @classmethod
     def generate_new_secret(cls):
@@ -100,12 +104,16 @@ class Attachment(PluginDataModel):
     def set_file(self, upload):
         self.file = File(upload, upload.name)
 
-    def set_image(self, upload):
-        fileformat = self.filetype.extensions_list[0]
-
+    def set_image(self, upload, create_thumbnail=True):
         self.image = File(upload, upload.name)
 
-        thumbnail = Image.open(upload)
+        image = Image.open(upload)
+        if create_thumbnail:
+            self.set_thumbnail(image, upload.name)
+
+    def set_thumbnail(self, thumbnail, name):
+        fileformat = self.filetype.extensions_list[0]
+
         downscale_image = (
             thumbnail.size[0] > settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT[0]
             or thumbnail.size[1] > settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT[1]
@@ -124,4 +132,4 @@ class Attachment(PluginDataModel):
             thumbnail.save(thumb_stream, "png")
 
         if downscale_image or strip_animation:
-            self.thumbnail = ContentFile(thumb_stream.getvalue(), upload.name)
+            self.thumbnail = ContentFile(thumb_stream.getvalue(), name)
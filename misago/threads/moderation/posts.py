@@ -20,6 +20,10 @@ def approve_post(user, post):
 
     post.is_unapproved = False
     post.save(update_fields=["is_unapproved"])
+
+    # approved post doesn't move category's last_post_on, so read
+    # watermarks can't be trusted to notice it anymore
+    post.category.readcategory_set.all().delete()
     return True
 
 
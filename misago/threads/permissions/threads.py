@@ -9,8 +9,10 @@ from ...acl import algebra
 from ...acl.decorators import return_boolean
 from ...acl.models import Role
 from ...acl.objectacl import add_acl_to_obj
+from ...acl.useracl import UserACL
 from ...admin.forms import YesNoSwitch
 from ...categories.models import Category, CategoryRole
+from ...cache.versionedcache import LocalCache, register_local_cache
 from ...categories.permissions import get_categories_roles
 from ..models import Post, Thread
 
@@ -65,6 +67,7 @@ __all__ = [
     "can_delete_event",
     "exclude_invisible_threads",
     "exclude_invisible_posts",
+    "get_threads_visibility_key",
 ]
 
 
@@ -1776,170 +1779,280 @@ def has_time_to_edit_post(user_acl, target):
     return True
 
 
-def exclude_invisible_threads(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
-    show_all = []
-    show_accepted_visible = []
-    show_accepted = []
-    show_visible = []
-    show_owned = []
-    show_owned_visible = []
+class ThreadsVisibilityPlan:
+    """Category IDs bucketed by what threads user can see in them.
 
-    for category in categories:
-        add_acl_to_obj(user_acl, category)
-
-        if not (category.acl["can_see"] and category.acl["can_browse"]):
-            continue
-
-        can_hide = category.acl["can_hide_threads"]
-        if category.acl["can_see_all_threads"]:
-            can_mod = category.acl["can_approve_content"]
-
-            if can_mod and can_hide:
-                show_all.append(category)
-            elif user_acl["is_authenticated"]:
-                if not can_mod and not can_hide:
-                    show_accepted_visible.append(category)
-                elif not can_mod:
-                    show_accepted.append(category)
-                elif not can_hide:
-                    show_visible.append(category)
-            else:
-                show_accepted_visible.append(category)
-        elif user_acl["is_authenticated"]:
-            if can_hide:
-                show_owned.append(category)
-            else:
-                show_owned_visible.append(category)
+    Plan depends only on user's shared ACL and categories, so it's computed
+    once and reused for all users with same ACL.
+    """
 
-    conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
+    __slots__ = (
+        "show_all",
+        "show_accepted_visible",
+        "show_accepted",
+        "show_visible",
+        "show_owned",
+        "show_owned_visible",
+        "is_authenticated",
+    )
 
-    if show_accepted_visible:
-        if user_acl["is_authenticated"]:
-            condition = Q(
-                Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-                category__in=show_accepted_visible,
-                is_hidden=False,
+    def __init__(self, user_acl, categories):
+        self.is_authenticated = user_acl["is_authenticated"]
+
+        show_all = []
+        show_accepted_visible = []
+        show_accepted = []
+        show_visible = []
+        show_owned = []
+        show_owned_visible = []
+
+        for category in categories:
+            add_acl_to_obj(user_acl, category)
+
+            if not (category.acl["can_see"] and category.acl["can_browse"]):
+                continue
+
+            can_hide = category.acl["can_hide_threads"]
+            if category.acl["can_see_all_threads"]:
+                can_mod = category.acl["can_approve_content"]
+
+                if can_mod and can_hide:
+                    show_all.append(category.pk)
+                elif self.is_authenticated:
+                    if not can_mod and not can_hide:
+                        show_accepted_visible.append(category.pk)
+                    elif not can_mod:
+                        show_accepted.append(category.pk)
+                    elif not can_hide:
+                        show_visible.append(category.pk)
+                else:
+                    show_accepted_visible.append(category.pk)
+            elif self.is_authenticated:
+                if can_hide:
+                    show_owned.append(category.pk)
+                else:
+                    show_owned_visible.append(category.pk)
+
+        self.show_all = tuple(show_all)
+        self.show_accepted_visible = tuple(show_accepted_visible)
+        self.show_accepted = tuple(show_accepted)
+        self.show_visible = tuple(show_visible)
+        self.show_owned = tuple(show_owned)
+        self.show_owned_visible = tuple(show_owned_visible)
+
+    @property
+    def depends_on_user(self):
+        if not self.is_authenticated:
+            return False
+
+        return bool(
+            self.show_accepted_visible
+            or self.show_accepted
+            or self.show_owned
+            or self.show_owned_visible
+        )
+
+    def get_conditions(self, user_id):
+        conditions = []
+
+        if self.show_all:
+            conditions.append(Q(category__in=self.show_all))
+
+        if self.show_accepted_visible:
+            if self.is_authenticated:
+                conditions.append(
+                    Q(
+                        Q(starter_id=user_id) | Q(is_unapproved=False),
+                        category__in=self.show_accepted_visible,
+                        is_hidden=False,
+                    )
+                )
+            else:
+                conditions.append(
+                    Q(
+                        category__in=self.show_accepted_visible,
+                        is_hidden=False,
+                        is_unapproved=False,
+                    )
+                )
+
+        if self.show_accepted:
+            conditions.append(
+                Q(
+                    Q(starter_id=user_id) | Q(is_unapproved=False),
+                    category__in=self.show_accepted,
+                )
             )
-        else:
-            condition = Q(
-                category__in=show_accepted_visible, is_hidden=False, is_unapproved=False
+
+        if self.show_visible:
+            conditions.append(Q(category__in=self.show_visible, is_hidden=False))
+
+        if self.show_owned:
+            conditions.append(Q(category__in=self.show_owned, starter_id=user_id))
+
+        if self.show_owned_visible:
+            conditions.append(
+                Q(
+                    category__in=self.show_owned_visible,
+                    starter_id=user_id,
+                    is_hidden=False,
+                )
             )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+        return join_conditions(conditions)
 
-    if show_accepted:
-        condition = Q(
-            Q(starter_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_accepted,
-        )
+    def apply(self, user_acl, queryset):
+        conditions = self.get_conditions(user_acl["user_id"])
+        if not conditions:
+            return Thread.objects.none()
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+        return queryset.filter(conditions)
 
-    if show_visible:
-        condition = Q(category__in=show_visible, is_hidden=False)
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+class PostsVisibilityPlan:
+    """Category IDs bucketed by what posts user can see in them."""
 
-    if show_owned:
-        condition = Q(category__in=show_owned, starter_id=user_acl["user_id"])
+    __slots__ = (
+        "show_all",
+        "show_approved",
+        "show_approved_owned",
+        "hide_invisible_events",
+    )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+    def __init__(self, user_acl, categories):
+        show_all = []
+        show_approved = []
+        show_approved_owned = []
 
-    if show_owned_visible:
-        condition = Q(
-            category__in=show_owned_visible,
-            starter_id=user_acl["user_id"],
-            is_hidden=False,
-        )
+        hide_invisible_events = []
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+        for category in categories:
+            add_acl_to_obj(user_acl, category)
 
-    if not conditions:
-        return Thread.objects.none()
+            if category.acl["can_approve_content"]:
+                show_all.append(category.pk)
+            else:
+                if user_acl["is_authenticated"]:
+                    show_approved_owned.append(category.pk)
+                else:
+                    show_approved.append(category.pk)
 
-    return queryset.filter(conditions)
+            if not category.acl["can_hide_events"]:
+                hide_invisible_events.append(category.pk)
 
+        self.show_all = tuple(show_all)
+        self.show_approved = tuple(show_approved)
+        self.show_approved_owned = tuple(show_approved_owned)
+        self.hide_invisible_events = tuple(hide_invisible_events)
 
-def exclude_invisible_posts(user_acl, categories, queryset):
-    if hasattr(categories, "__iter__"):
-        return exclude_invisible_posts_in_categories(user_acl, categories, queryset)
-    return exclude_invisible_posts_in_category(user_acl, categories, queryset)
+    def get_conditions(self, user_id):
+        conditions = []
 
+        if self.show_all:
+            conditions.append(Q(category__in=self.show_all))
 
-def exclude_invisible_posts_in_categories(
-    user_acl, categories, queryset
-):  # pylint: disable=too-many-branches
-    show_all = []
-    show_approved = []
-    show_approved_owned = []
+        if self.show_approved:
+            conditions.append(Q(category__in=self.show_approved, is_unapproved=False))
 
-    hide_invisible_events = []
+        if self.show_approved_owned:
+            conditions.append(
+                Q(
+                    Q(poster_id=user_id) | Q(is_unapproved=False),
+                    category__in=self.show_approved_owned,
+                )
+            )
 
-    for category in categories:
-        add_acl_to_obj(user_acl, category)
+        return join_conditions(conditions)
 
-        if category.acl["can_approve_content"]:
-            show_all.append(category.pk)
-        else:
-            if user_acl["is_authenticated"]:
-                show_approved_owned.append(category.pk)
-            else:
-                show_approved.append(category.pk)
+    def apply(self, user_acl, queryset):
+        if self.hide_invisible_events:
+            queryset = queryset.exclude(
+                category__in=self.hide_invisible_events, is_event=True, is_hidden=True
+            )
 
-        if not category.acl["can_hide_events"]:
-            hide_invisible_events.append(category.pk)
+        conditions = self.get_conditions(user_acl["user_id"])
+        if not conditions:
+            return Post.objects.none()
 
-    conditions = None
-    if show_all:
-        conditions = Q(category__in=show_all)
+        return queryset.filter(conditions)
 
-    if show_approved:
-        condition = Q(category__in=show_approved, is_unapproved=False)
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+visibility_plans_cache = register_local_cache(LocalCache())
 
-    if show_approved_owned:
-        condition = Q(
-            Q(poster_id=user_acl["user_id"]) | Q(is_unapproved=False),
-            category__in=show_approved_owned,
-        )
 
-        if conditions:
-            conditions = conditions | condition
-        else:
-            conditions = condition
+def get_visibility_plan(plan_type, user_acl, categories):
+    """Returns visibility plan for user's ACL and categories.
+
+    Plans are cached for ACLs shared between users. ACLs without a cache key
+    (eg. patched in tests) get new plan on every call.
+    """
+    categories = list(categories)
+    cache_key = get_visibility_plan_cache_key(plan_type, user_acl, categories)
+    if cache_key is None:
+        return plan_type(user_acl, categories)
+
+    plan = visibility_plans_cache.get(cache_key)
+    if plan is None:
+        plan = plan_type(user_acl, categories)
+        visibility_plans_cache.set(cache_key, plan)
+    return plan
+
+
+def get_visibility_plan_cache_key(plan_type, user_acl, categories):
+    if not isinstance(user_acl, UserACL):
+        return None
+
+    return (
+        plan_type.__name__,
+        user_acl.cache_key,
+        user_acl["is_authenticated"],
+        tuple(category.pk for category in categories),
+    )
 
-    if hide_invisible_events:
-        queryset = queryset.exclude(
-            category__in=hide_invisible_events, is_event=True, is_hidden=True
-        )
 
+def get_threads_visibility_key(user_acl, categories):
+    """Returns key identifying set of threads visible to user in categories.
+
+    Key is shared by users with same ACL, unless plan's conditions include
+    user's ID. Returns None for ACLs without a cache key.
+    """
+    categories = list(categories)
+    cache_key = get_visibility_plan_cache_key(
+        ThreadsVisibilityPlan, user_acl, categories
+    )
+    if cache_key is None:
+        return None
+
+    plan = get_visibility_plan(ThreadsVisibilityPlan, user_acl, categories)
+    if plan.depends_on_user:
+        return cache_key + (user_acl["user_id"],)
+    return cache_key
+
+
+def join_conditions(conditions):
     if not conditions:
-        return Post.objects.none()
+        return None
+
+    joined_conditions = conditions[0]
+    for condition in conditions[1:]:
+        joined_conditions = joined_conditions | condition
+    return joined_conditions
+
+
+def exclude_invisible_threads(user_acl, categories, queryset):
+    plan = get_visibility_plan(ThreadsVisibilityPlan, user_acl, categories)
+    return plan.apply(user_acl, queryset)
+
+
+def exclude_invisible_posts(user_acl, categories, queryset):
+    if hasattr(categories, "__iter__"):
+        return exclude_invisible_posts_in_categories(user_acl, categories, queryset)
+    return exclude_invisible_posts_in_category(user_acl, categories, queryset)
+
 
-    return queryset.filter(conditions)
+def exclude_invisible_posts_in_categories(user_acl, categories, queryset):
+    plan = get_visibility_plan(PostsVisibilityPlan, user_acl, categories)
+    return plan.apply(user_acl, queryset)
 
 
 def exclude_invisible_posts_in_category(user_acl, category, queryset):
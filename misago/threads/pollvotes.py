@@ -0,0 +1,122 @@
+import json
+from typing import Iterator
+
+from django.db import connection
+
+from .models import Poll, PollVote
+
+DEFAULT_BATCH_SIZE = 500
+
+UPDATE_POLL_VOTES_SQL = """
+UPDATE {polls} SET
+    votes = GREATEST(votes + %(votes)s, 0),
+    choices = (
+        SELECT COALESCE(
+            jsonb_agg(
+                CASE WHEN deltas.delta IS NULL THEN choice
+                ELSE jsonb_set(
+                    choice,
+                    '{{votes}}',
+                    to_jsonb(
+                        GREATEST((choice->>'votes')::int + deltas.delta::int, 0)
+                    )
+                )
+                END
+                ORDER BY position
+            ),
+            '[]'::jsonb
+        )
+        FROM jsonb_array_elements(choices) WITH ORDINALITY AS elements(choice, position)
+        LEFT JOIN jsonb_each_text(%(deltas)s::jsonb) AS deltas(hash, delta)
+            ON deltas.hash = choice->>'hash'
+    )
+WHERE id = %(poll_id)s
+RETURNING votes, choices
+"""
+
+SYNCHRONIZE_POLLS_VOTES_SQL = """
+UPDATE {polls} SET
+    votes = (SELECT COUNT(*) FROM {votes} WHERE poll_id = {polls}.id),
+    choices = (
+        SELECT COALESCE(
+            jsonb_agg(
+                jsonb_set(
+                    choice,
+                    '{{votes}}',
+                    to_jsonb(
+                        (
+                            SELECT COUNT(*) FROM {votes}
+                            WHERE poll_id = {polls}.id
+                            AND choice_hash = choice->>'hash'
+                        )
+                    )
+                )
+                ORDER BY position
+            ),
+            '[]'::jsonb
+        )
+        FROM jsonb_array_elements(choices) WITH ORDINALITY AS elements(choice, position)
+    )
+WHERE id = ANY(%(polls_ids)s)
+"""
+
+
+def update_poll_votes(poll: Poll, deltas: dict[str, int]):
+    """Applies votes deltas to poll's choices and total votes count.
+
+    Deltas are applied by the database in single statement, so concurrent
+    voters don't overwrite each other's votes. Poll's votes and choices are
+    set to values returned by the database.
+    """
+    deltas = {choice_hash: delta for choice_hash, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            UPDATE_POLL_VOTES_SQL.format(polls=Poll._meta.db_table),
+            {
+                "poll_id": poll.id,
+                "votes": sum(deltas.values()),
+                "deltas": json.dumps(deltas),
+            },
+        )
+        row = cursor.fetchone()
+
+    if row:
+        votes, choices = row
+        # Raw jsonb value is not decoded by database driver
+        choices_field = Poll._meta.get_field("choices")
+        poll.votes = votes
+        poll.choices = choices_field.from_db_value(choices, None, connection)
+
+
+def synchronize_polls_votes(polls_ids: list[int]):
+    """Recomputes polls votes counts from their votes."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            SYNCHRONIZE_POLLS_VOTES_SQL.format(
+                polls=Poll._meta.db_table, votes=PollVote._meta.db_table
+            ),
+            {"polls_ids": polls_ids},
+        )
+
+
+def synchronize_all_polls_votes(
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Iterator[int]:
+    """Recomputes all polls votes counts in batches.
+
+    Yields number of polls synchronized in each batch.
+    """
+    queryset = Poll.objects.order_by("id").values_list("id", flat=True)
+
+    last_poll_id = 0
+    while True:
+        polls_ids = list(queryset.filter(id__gt=last_poll_id)[:batch_size])
+        if not polls_ids:
+            return
+
+        synchronize_polls_votes(polls_ids)
+        yield len(polls_ids)
+        last_poll_id = polls_ids[-1]
@@ -0,0 +1,117 @@
+from functools import partial
+from typing import Iterator, Optional
+
+from django.contrib.postgres.search import SearchVector
+from django.db import transaction
+
+from ..conf import settings
+from ..core.management.batches import map_batches
+from ..markup import common_flavour
+from ..markup.mentions import preload_mentions
+from .checksums import update_post_checksum
+from .models import Post
+from .searchbackends import get_search_backend
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class ParsingRequest:
+    """Minimal request used to parse posts outside of request cycle"""
+
+    scheme = "http"
+    user = None
+
+    def __init__(self, host: str):
+        self.host = host
+
+    def get_host(self) -> str:
+        return self.host
+
+
+def reparse_posts(
+    host: str,
+    queryset=None,
+    *,
+    start_after: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    processes: Optional[int] = None,
+) -> Iterator[tuple[int, int]]:
+    """Parses posts again, saving new parsed texts, checksums and searches
+
+    Posts are read in batches ordered by ID, starting after start_after. If
+    processes is other than 1, batches are parsed in pool of processes.
+
+    Yields tuple with number of posts in batch and ID of its last post after
+    each batch is saved, so it can be used as checkpoint to resume from.
+    """
+    if queryset is None:
+        queryset = Post.objects.all()
+
+    batches = get_posts_batches(queryset, start_after, batch_size)
+    for results in map_batches(partial(parse_posts_batch, host), batches, processes):
+        yield save_reparsed_posts(results)
+
+
+def get_posts_batches(queryset, start_after: int, batch_size: int) -> Iterator:
+    queryset = queryset.filter(is_event=False).order_by("id")
+    queryset = queryset.values_list(
+        "id", "original", "thread__title", "thread__first_post_id"
+    )
+
+    while True:
+        batch = list(queryset.filter(id__gt=start_after)[:batch_size])
+        if not batch:
+            return
+
+        yield [
+            (post_id, original, title if post_id == first_post_id else None)
+            for post_id, original, title, first_post_id in batch
+        ]
+
+        start_after = batch[-1][0]
+
+
+def parse_posts_batch(host: str, batch: list) -> list:
+    request = ParsingRequest(host)
+
+    results = []
+    with preload_mentions(original for _, original, _ in batch):
+        for post_id, original, thread_title in batch:
+            post = Post(id=post_id, original=original)
+            post.set_search_document(thread_title)
+
+            parsing_result = common_flavour(request, None, original)
+            results.append(
+                (post_id, parsing_result["parsed_text"], post.search_document)
+            )
+
+    return results
+
+
+def save_reparsed_posts(results: list) -> tuple[int, int]:
+    posts_ids = [post_id for post_id, _, _ in results]
+    posts = Post.objects.only("id", "posted_on").in_bulk(posts_ids)
+
+    updated_posts = []
+    documents = []
+    for post_id, parsed, search_document in results:
+        post = posts.get(post_id)
+        if post:
+            post.parsed = parsed
+            post.search_document = search_document
+            update_post_checksum(post)
+            updated_posts.append(post)
+            documents.append((post_id, search_document))
+
+    with transaction.atomic():
+        Post.objects.bulk_update(
+            updated_posts, ["parsed", "checksum", "search_document"]
+        )
+        Post.objects.filter(id__in=posts_ids).update(
+            search_vector=SearchVector(
+                "search_document", config=settings.MISAGO_SEARCH_CONFIG
+            )
+        )
+
+    get_search_backend().index_documents(documents)
+    return len(results), posts_ids[-1]
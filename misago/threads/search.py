@@ -1,12 +1,12 @@
-from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
 from django.utils.translation import pgettext_lazy
 
-from ..conf import settings
 from ..core.shortcuts import paginate, pagination_dict
 from ..search import SearchProvider
+from ..search.resultscache import get_cached_search_results
 from .filtersearch import filter_search
 from .models import Post, Thread
-from .permissions import exclude_invisible_threads
+from .permissions import exclude_invisible_threads, get_threads_visibility_key
+from .searchbackends import get_search_backend
 from .serializers import FeedSerializer
 from .utils import add_categories_to_items
 from .viewmodels import ThreadsRootCategory
@@ -22,10 +22,12 @@ class SearchThreads(SearchProvider):
         threads_categories = [root_category.unwrap()] + root_category.subcategories
 
         if len(query) > 1:
-            visible_threads = exclude_invisible_threads(
-                self.request.user_acl, threads_categories, Thread.objects
+            results = get_cached_search_results(
+                self.url,
+                query,
+                get_threads_visibility_key(self.request.user_acl, threads_categories),
+                lambda: self.search_posts_ids(query, threads_categories),
             )
-            results = search_threads(self.request, query, visible_threads)
         else:
             results = []
 
@@ -41,9 +43,7 @@ class SearchThreads(SearchProvider):
         posts = []
         threads = []
         if paginator["count"]:
-            posts = list(
-                list_page.object_list.select_related("thread", "poster", "poster__rank")
-            )
+            posts = get_posts_in_order(list_page.object_list)
 
             threads = []
             for post in posts:
@@ -67,33 +67,35 @@ class SearchThreads(SearchProvider):
 
         return results
 
+    def search_posts_ids(self, query, threads_categories):
+        visible_threads = exclude_invisible_threads(
+            self.request.user_acl, threads_categories, Thread.objects
+        )
+        return search_threads(self.request, query, visible_threads)
+
 
-def search_threads(request, query, visible_threads):
+def search_threads(request, query, visible_threads) -> list[int]:
+    """Returns list of IDs of posts matching query, ordered by relevance"""
     max_hits = request.settings.posts_per_page * 5
     clean_query = filter_search(query)
 
     if not clean_query:
         # Short-circuit search due to empty cleaned query
-        return Post.objects.none()
+        return []
 
-    search_query = SearchQuery(clean_query, config=settings.MISAGO_SEARCH_CONFIG)
-    search_vector = SearchVector(
-        "search_document", config=settings.MISAGO_SEARCH_CONFIG
-    )
-
-    queryset = Post.objects.filter(
+    posts = Post.objects.filter(
         is_event=False,
         is_hidden=False,
         is_unapproved=False,
         thread_id__in=visible_threads.values("id"),
-        search_vector=search_query,
     )
 
-    if queryset[: max_hits + 1].count() > max_hits:
-        queryset = queryset.order_by("-id")[:max_hits]
+    return get_search_backend().search(clean_query, posts, max_hits)
+
 
-    return (
-        Post.objects.filter(id__in=queryset.values("id"))
-        .annotate(rank=SearchRank(search_vector, search_query))
-        .order_by("-rank", "-id")
+def get_posts_in_order(posts_ids: list[int]) -> list[Post]:
+    queryset = Post.objects.filter(id__in=posts_ids).select_related(
+        "thread", "poster", "poster__rank"
     )
+    posts = {post.id: post for post in queryset}
+    return [posts[post_id] for post_id in posts_ids if post_id in posts]
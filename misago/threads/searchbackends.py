@@ -0,0 +1,156 @@
+import re
+import sqlite3
+from contextlib import closing
+from functools import cache
+from typing import Iterable
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.core.exceptions import ImproperlyConfigured
+from django.db.models import QuerySet
+from django.utils.module_loading import import_string
+
+from ..conf import settings
+
+TOKEN_RE = re.compile(r"\w+")
+
+
+class SearchBackend:
+    """Base class for backends indexing and searching posts
+
+    Posts search documents are always kept in the database. Backends that
+    index posts elsewhere set external_index to True. They then receive
+    documents in index_documents when post's search document changes and
+    posts IDs in delete_posts when posts are deleted.
+    """
+
+    external_index = False
+
+    def index_documents(self, documents: list[tuple[int, str]]):
+        """Indexes list of (post_id, search_document) tuples"""
+
+    def delete_posts(self, posts_ids: Iterable[int]):
+        """Removes posts from index"""
+
+    def search(self, query: str, posts: QuerySet, max_hits: int) -> list[int]:
+        """Returns list of up to max_hits IDs of posts from posts queryset
+        matching the query, ordered by relevance
+        """
+        raise NotImplementedError(
+            "%s has to define search(query, posts, max_hits) method"
+            % self.__class__.__name__
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    """Searches posts search vectors stored in the database
+
+    If there are more matching posts than max_hits, newest ones are ranked.
+    """
+
+    def search(self, query: str, posts: QuerySet, max_hits: int) -> list[int]:
+        search_query = SearchQuery(query, config=settings.MISAGO_SEARCH_CONFIG)
+        search_vector = SearchVector(
+            "search_document", config=settings.MISAGO_SEARCH_CONFIG
+        )
+
+        results = (
+            posts.filter(search_vector=search_query)
+            .annotate(rank=SearchRank(search_vector, search_query))
+            .order_by("-id")
+            .values_list("id", "rank")[:max_hits]
+        )
+
+        results = sorted(results, key=lambda result: (-result[1], -result[0]))
+        return [post_id for post_id, _ in results]
+
+
+class LocalSearchBackend(SearchBackend):
+    """Searches posts in inverted index stored in SQLite database on disk
+
+    Requires no services and is meant for development and small sites.
+    Posts are ranked with BM25 and their visibility is checked against the
+    posts queryset, so posts that were hidden or moved since they were
+    indexed are skipped. Posts deleted in bulk, without delete signals being
+    sent, are skipped until index is rebuilt with rebuildpostssearch command.
+    """
+
+    external_index = True
+
+    def __init__(self, path=None):
+        self.path = path or settings.MISAGO_SEARCH_INDEX_PATH
+        if not self.path:
+            raise ImproperlyConfigured(
+                "MISAGO_SEARCH_INDEX_PATH setting is required by LocalSearchBackend"
+            )
+
+        with self.connect() as connection:
+            connection.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS posts "
+                "USING fts5(document, tokenize='%s')" % self.get_tokenizer()
+            )
+
+    def get_tokenizer(self) -> str:
+        if settings.MISAGO_SEARCH_CONFIG == "english":
+            return "porter unicode61 remove_diacritics 2"
+        return "unicode61 remove_diacritics 2"
+
+    def connect(self):
+        return closing(sqlite3.connect(self.path, timeout=30))
+
+    def index_documents(self, documents: list[tuple[int, str]]):
+        if not documents:
+            return
+
+        with self.connect() as connection, connection:
+            connection.executemany(
+                "DELETE FROM posts WHERE rowid = ?",
+                [(post_id,) for post_id, _ in documents],
+            )
+            connection.executemany(
+                "INSERT INTO posts (rowid, document) VALUES (?, ?)",
+                [(post_id, document or "") for post_id, document in documents],
+            )
+
+    def delete_posts(self, posts_ids: Iterable[int]):
+        with self.connect() as connection, connection:
+            connection.executemany(
+                "DELETE FROM posts WHERE rowid = ?",
+                [(post_id,) for post_id in posts_ids],
+            )
+
+    def search(self, query: str, posts: QuerySet, max_hits: int) -> list[int]:
+        match = " ".join('"%s"' % token for token in TOKEN_RE.findall(query))
+        if not match:
+            return []
+
+        results = []
+        offset = 0
+        with self.connect() as connection:
+            while len(results) < max_hits:
+                candidates = [
+                    post_id
+                    for post_id, in connection.execute(
+                        "SELECT rowid FROM posts WHERE posts MATCH ? "
+                        "ORDER BY rank LIMIT ? OFFSET ?",
+                        (match, max_hits, offset),
+                    )
+                ]
+                if not candidates:
+                    break
+
+                visible = set(
+                    posts.filter(id__in=candidates).values_list("id", flat=True)
+                )
+                results += [post_id for post_id in candidates if post_id in visible]
+                offset += max_hits
+
+        return results[:max_hits]
+
+
+def get_search_backend() -> SearchBackend:
+    return load_search_backend(settings.MISAGO_SEARCH_BACKEND)
+
+
+@cache
+def load_search_backend(backend_path: str) -> SearchBackend:
+    return import_string(backend_path)()
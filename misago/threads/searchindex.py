@@ -0,0 +1,90 @@
+from typing import Iterator, Optional
+
+from django.db import connection
+
+from ..conf import settings
+from ..core.management.batches import map_batches
+from .models import Post
+from .searchbackends import get_search_backend
+
+DEFAULT_BATCH_SIZE = 500
+
+UPDATE_POSTS_SEARCH_SQL = """
+UPDATE {table}
+SET
+    search_document = documents.search_document,
+    search_vector = to_tsvector(%s::regconfig, documents.search_document)
+FROM (VALUES {values}) AS documents(id, search_document)
+WHERE {table}.id = documents.id
+"""
+
+
+def rebuild_posts_search(
+    queryset=None,
+    *,
+    start_after: int = 0,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    processes: Optional[int] = None,
+) -> Iterator[tuple[int, int]]:
+    """Rebuilds search documents and vectors of posts in batches
+
+    Posts are split into batches by their IDs, starting after start_after.
+    Every batch is saved with single UPDATE query. If processes is other
+    than 1, batches are rebuilt in pool of processes.
+
+    Yields tuple with number of posts in batch and ID of its last post after
+    each batch is saved, so it can be used as checkpoint to resume from.
+    """
+    if queryset is None:
+        queryset = Post.objects.all()
+
+    batches = get_posts_ids_batches(queryset, start_after, batch_size)
+    yield from map_batches(rebuild_posts_search_batch, batches, processes)
+
+
+def get_posts_ids_batches(
+    queryset, start_after: int, batch_size: int
+) -> Iterator[list[int]]:
+    queryset = queryset.filter(is_event=False).order_by("id")
+    queryset = queryset.values_list("id", flat=True)
+
+    while True:
+        batch = list(queryset.filter(id__gt=start_after)[:batch_size])
+        if not batch:
+            return
+
+        yield batch
+        start_after = batch[-1]
+
+
+def rebuild_posts_search_batch(posts_ids: list[int]) -> tuple[int, int]:
+    queryset = Post.objects.filter(id__in=posts_ids).values_list(
+        "id", "original", "thread__title", "thread__first_post_id"
+    )
+
+    documents = []
+    for post_id, original, thread_title, first_post_id in queryset:
+        post = Post(id=post_id, original=original)
+        post.set_search_document(thread_title if post_id == first_post_id else None)
+        documents.append((post_id, post.search_document))
+
+    update_posts_search(documents)
+    get_search_backend().index_documents(documents)
+    return len(posts_ids), posts_ids[-1]
+
+
+def update_posts_search(documents: list[tuple[int, str]]):
+    if not documents:
+        return
+
+    sql = UPDATE_POSTS_SEARCH_SQL.format(
+        table=Post._meta.db_table,
+        values=", ".join(["(%s, %s::text)"] * len(documents)),
+    )
+
+    params = [settings.MISAGO_SEARCH_CONFIG]
+    for document in documents:
+        params += document
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
@@ -1,22 +1,36 @@
 from django.contrib.auth import get_user_model
 from django.db import transaction
-from django.db.models import Q
-from django.db.models.signals import pre_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import Signal, receiver
 from django.utils.translation import pgettext
 
-from ..categories.models import Category
+from ..acl.models import Role
 from ..categories.signals import delete_category_content, move_category_content
 from ..core.pgutils import chunk_queryset
-from ..notifications.models import Notification, WatchedThread
+from ..readtracker.readstate import merge_read_threads
 from ..users.signals import (
     anonymize_user_data,
     archive_user_data,
     delete_user_content,
     username_changed,
 )
-from .anonymize import ANONYMIZABLE_EVENTS, anonymize_event, anonymize_post_last_likes
-from .models import Attachment, Poll, PollVote, Post, PostEdit, PostLike, Thread
+from .attachmenttypescache import clear_attachment_types_cache
+from .models import (
+    Attachment,
+    AttachmentType,
+    Poll,
+    PollVote,
+    Post,
+    PostEdit,
+    PostLike,
+    Thread,
+)
+from .searchbackends import get_search_backend
+from .usercontent import (
+    anonymize_user_events,
+    anonymize_user_in_last_likes,
+    delete_user_threads_and_posts,
+)
 
 delete_post = Signal()
 delete_thread = Signal()
@@ -31,6 +45,9 @@ update_thread_title = Signal()
 def merge_threads(sender, **kwargs):
     other_thread = kwargs["other_thread"]
 
+    # Read states depend on threads posts, merge them before posts are moved
+    merge_read_threads(sender, other_thread)
+
     other_thread.post_set.update(category=sender.category, thread=sender)
     other_thread.postedit_set.update(category=sender.category, thread=sender)
     other_thread.postlike_set.update(category=sender.category, thread=sender)
@@ -117,42 +134,8 @@ def move_category_threads(sender, **kwargs):
 
 @receiver(delete_user_content)
 def delete_user_threads(sender, **kwargs):
-    recount_categories = set()
-    recount_threads = set()
-
-    Notification.objects.filter(
-        Q(thread__starter=sender) | Q(post__poster=sender)
-    ).delete()
-
-    WatchedThread.objects.filter(thread__starter=sender).delete()
-
-    for post in chunk_queryset(sender.liked_post_set):
-        cleaned_likes = list(filter(lambda i: i["id"] != sender.id, post.last_likes))
-        if cleaned_likes != post.last_likes:
-            post.last_likes = cleaned_likes
-            post.save(update_fields=["last_likes"])
-
-    for thread in chunk_queryset(sender.thread_set):
-        recount_categories.add(thread.category_id)
-        with transaction.atomic():
-            thread.delete()
-
-    for post in chunk_queryset(sender.post_set):
-        recount_categories.add(post.category_id)
-        recount_threads.add(post.thread_id)
-        with transaction.atomic():
-            post.delete()
-
-    if recount_threads:
-        changed_threads_qs = Thread.objects.filter(id__in=recount_threads)
-        for thread in chunk_queryset(changed_threads_qs):
-            thread.synchronize()
-            thread.save()
-
-    if recount_categories:
-        for category in Category.objects.filter(id__in=recount_categories):
-            category.synchronize()
-            category.save()
+    for _ in delete_user_threads_and_posts(sender):
+        pass
 
 
 @receiver(archive_user_data)
@@ -215,20 +198,13 @@ def archive_user_polls(sender, archive=None, **kwargs):
 
 @receiver(anonymize_user_data)
 def anonymize_user_in_events(sender, **kwargs):
-    queryset = Post.objects.filter(
-        is_event=True,
-        event_type__in=ANONYMIZABLE_EVENTS,
-        event_context__user__id=sender.id,
-    )
-
-    for event in chunk_queryset(queryset):
-        anonymize_event(sender, event)
+    anonymize_user_events(sender)
 
 
 @receiver([anonymize_user_data])
 def anonymize_user_in_likes(sender, **kwargs):
-    for post in chunk_queryset(sender.liked_post_set):
-        anonymize_post_last_likes(sender, post)
+    for _ in anonymize_user_in_last_likes(sender):
+        pass
 
 
 @receiver([anonymize_user_data, username_changed])
@@ -273,6 +249,32 @@ def update_usernames(sender, **kwargs):
     )
 
 
+@receiver(post_save, sender=Post)
+def index_post_search_document(sender, instance, update_fields=None, **kwargs):
+    if instance.is_event or instance.search_document is None:
+        return
+    if update_fields and "search_document" not in update_fields:
+        return
+
+    search_backend = get_search_backend()
+    if search_backend.external_index:
+        search_backend.index_documents([(instance.id, instance.search_document)])
+
+
+@receiver(delete_post)
+def delete_post_from_search_index(sender, **kwargs):
+    search_backend = get_search_backend()
+    if search_backend.external_index:
+        search_backend.delete_posts([sender.id])
+
+
+@receiver(delete_thread)
+def delete_thread_posts_from_search_index(sender, **kwargs):
+    search_backend = get_search_backend()
+    if search_backend.external_index:
+        search_backend.delete_posts(sender.post_set.values_list("id", flat=True))
+
+
 @receiver(pre_delete, sender=get_user_model())
 def remove_unparticipated_private_threads(sender, **kwargs):
     threads_qs = kwargs["instance"].privatethread_set.all()
@@ -280,3 +282,14 @@ def remove_unparticipated_private_threads(sender, **kwargs):
         if thread.participants.count() == 1:
             with transaction.atomic():
                 thread.delete()
+
+
+@receiver(post_delete, sender=Role)
+def clear_attachment_types_cache_on_role_delete(sender, **kwargs):
+    # Deleted role is removed from attachment types download roles
+    clear_attachment_types_cache()
+
+
+@receiver(m2m_changed, sender=AttachmentType.limit_downloads_to.through)
+def clear_attachment_types_cache_on_download_roles_change(sender, **kwargs):
+    clear_attachment_types_cache()
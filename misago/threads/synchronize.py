@@ -0,0 +1,206 @@
+from typing import Iterable, Iterator, Optional
+
+from django.db.models import Count, Max, Min, Q, Sum
+
+from ..categories.models import Category
+from ..core.management.batches import map_batches
+from .models import Poll, Post, Thread
+
+DEFAULT_BATCH_SIZE = 500
+
+THREAD_SYNCHRONIZED_FIELDS = [
+    "has_poll",
+    "replies",
+    "has_reported_posts",
+    "has_open_reports",
+    "has_unapproved_posts",
+    "has_hidden_posts",
+    "has_events",
+    "started_on",
+    "first_post",
+    "starter",
+    "starter_name",
+    "starter_slug",
+    "is_unapproved",
+    "is_hidden",
+    "last_post_on",
+    "last_post_is_event",
+    "last_post",
+    "last_poster",
+    "last_poster_name",
+    "last_poster_slug",
+]
+
+CATEGORY_SYNCHRONIZED_FIELDS = [
+    "threads",
+    "posts",
+    "last_post_on",
+    "last_thread",
+    "last_thread_title",
+    "last_thread_slug",
+    "last_poster",
+    "last_poster_name",
+    "last_poster_slug",
+]
+
+
+def synchronize_threads(threads_ids: Iterable[int]) -> int:
+    """Synchronizes threads with their posts using few aggregate queries.
+
+    Does the same as calling Thread.synchronize() and saving every thread,
+    but for all threads at once. Threads without any posts are skipped.
+    Returns number of synchronized threads.
+    """
+    threads_ids = set(threads_ids)
+    if not threads_ids:
+        return 0
+
+    posts_stats = get_threads_posts_stats(threads_ids)
+    posts = get_threads_first_and_last_posts(posts_stats)
+    polls = get_threads_with_polls(threads_ids)
+
+    threads = list(Thread.objects.filter(id__in=posts_stats))
+    for thread in threads:
+        set_thread_posts_stats(thread, posts_stats[thread.id], posts, polls)
+
+    Thread.objects.bulk_update(threads, THREAD_SYNCHRONIZED_FIELDS)
+    return len(threads)
+
+
+def synchronize_thread(thread: Thread):
+    """Synchronizes single thread instance without saving it."""
+    posts_stats = get_threads_posts_stats([thread.id])
+    if thread.id not in posts_stats:
+        raise ValueError("thread without posts can't be synchronized")
+
+    posts = get_threads_first_and_last_posts(posts_stats)
+    polls = get_threads_with_polls([thread.id])
+    set_thread_posts_stats(thread, posts_stats[thread.id], posts, polls)
+
+
+def synchronize_all_threads(
+    queryset=None,
+    *,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    processes: Optional[int] = None,
+) -> Iterator[int]:
+    """Synchronizes threads in batches, yielding number of threads in batch
+
+    Threads are split into batches by their IDs. If processes is other than 1,
+    batches are synchronized in pool of processes.
+    """
+    if queryset is None:
+        queryset = Thread.objects.all()
+
+    batches = get_threads_ids_batches(queryset, batch_size)
+    yield from map_batches(synchronize_threads, batches, processes)
+
+
+def get_threads_ids_batches(queryset, batch_size: int) -> Iterator[list[int]]:
+    queryset = queryset.order_by("id").values_list("id", flat=True)
+
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return
+
+        yield batch
+        last_id = batch[-1]
+
+
+def get_threads_posts_stats(threads_ids: Iterable[int]) -> dict[int, dict]:
+    return {
+        stats["thread_id"]: stats
+        for stats in (
+            Post.objects.filter(thread_id__in=threads_ids)
+            .values("thread_id")
+            .annotate(
+                posts=Count("id", filter=Q(is_event=False, is_unapproved=False)),
+                reported_posts=Count("id", filter=Q(has_reports=True)),
+                open_reports=Count("id", filter=Q(has_open_reports=True)),
+                unapproved_posts=Count("id", filter=Q(is_unapproved=True)),
+                hidden_posts=Count("id", filter=Q(is_hidden=True)),
+                events=Count("id", filter=Q(is_event=True)),
+                first_post_id=Min("id"),
+                last_post_id=Max("id", filter=Q(is_unapproved=False)),
+            )
+            .order_by()
+        )
+    }
+
+
+def get_threads_first_and_last_posts(posts_stats: dict[int, dict]) -> dict:
+    posts_ids = set()
+    for stats in posts_stats.values():
+        posts_ids.add(stats["first_post_id"])
+        if stats["last_post_id"]:
+            posts_ids.add(stats["last_post_id"])
+
+    return Post.objects.select_related("poster").in_bulk(posts_ids)
+
+
+def get_threads_with_polls(threads_ids: Iterable[int]) -> set[int]:
+    queryset = Poll.objects.filter(thread_id__in=threads_ids)
+    return set(queryset.values_list("thread_id", flat=True))
+
+
+def set_thread_posts_stats(thread: Thread, stats: dict, posts: dict, polls: set):
+    thread.has_poll = thread.id in polls
+    thread.replies = max(stats["posts"] - 1, 0)
+    thread.has_reported_posts = bool(stats["reported_posts"])
+    thread.has_open_reports = bool(stats["open_reports"])
+    thread.has_unapproved_posts = bool(stats["unapproved_posts"])
+    thread.has_hidden_posts = bool(stats["hidden_posts"])
+
+    first_post = posts[stats["first_post_id"]]
+    thread.set_first_post(first_post)
+
+    if stats["last_post_id"]:
+        thread.set_last_post(posts[stats["last_post_id"]])
+        thread.has_events = bool(stats["events"])
+    else:
+        thread.set_last_post(first_post)
+        thread.has_events = False
+
+
+def synchronize_categories(categories_ids: Iterable[int]) -> int:
+    """Synchronizes categories with their threads using few aggregate queries.
+
+    Does the same as calling Category.synchronize() and saving every
+    category, but for all categories at once.
+    Returns number of synchronized categories.
+    """
+    categories_ids = set(categories_ids)
+    if not categories_ids:
+        return 0
+
+    threads = Thread.objects.filter(
+        category_id__in=categories_ids, is_hidden=False, is_unapproved=False
+    )
+    threads_stats = {
+        category_id: (threads_count, replies or 0)
+        for category_id, threads_count, replies in threads.values("category_id")
+        .annotate(threads_count=Count("id"), replies_sum=Sum("replies"))
+        .values_list("category_id", "threads_count", "replies_sum")
+    }
+    last_threads = {
+        thread.category_id: thread
+        for thread in threads.select_related("last_poster")
+        .order_by("category_id", "-last_post_on")
+        .distinct("category_id")
+    }
+
+    categories = list(Category.objects.filter(id__in=categories_ids))
+    for category in categories:
+        threads_count, replies = threads_stats.get(category.id, (0, 0))
+        category.threads = threads_count
+        category.posts = threads_count + replies
+
+        if category.id in last_threads:
+            category.set_last_thread(last_threads[category.id])
+        else:
+            category.empty_last_thread()
+
+    Category.objects.bulk_update(categories, CATEGORY_SYNCHRONIZED_FIELDS)
+    return len(categories)
@@ -0,0 +1,13 @@
+from celery import shared_task
+
+from .attachmentvariants import create_attachment_variants as create_variants
+from .models import Attachment
+
+
+@shared_task(name="threads.create-attachment-variants", serializer="json")
+def create_attachment_variants(attachment_id: int):
+    attachment = (
+        Attachment.objects.select_related("filetype").filter(id=attachment_id).first()
+    )
+    if attachment and attachment.is_image:
+        create_variants(attachment, create_thumbnail=True)
@@ -1,5 +1,6 @@
 import os
 
+from django.test import override_settings
 from django.urls import reverse
 from PIL import Image
 
@@ -7,7 +8,9 @@ from ...acl.models import Role
 from ...acl.test import patch_user_acl
 from ...conf import settings
 from ...users.test import AuthenticatedUserTestCase
+from ..attachmentvariants import THUMBNAIL_WEBP
 from ..models import Attachment, AttachmentType
+from ..tasks import create_attachment_variants
 
 TESTFILES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testfiles")
 TEST_DOCUMENT_PATH = os.path.join(TESTFILES_DIR, "document.pdf")
@@ -275,6 +278,60 @@ class AttachmentsApiTestCase(AuthenticatedUserTestCase):
         self.assertFalse(os.path.exists(image_path))
         self.assertFalse(os.path.exists(thumbnail_path))
 
+    @patch_user_acl({"max_attachment_size": 10 * 1024})
+    def test_large_image_upload_doesnt_create_webp_variants_in_sync_mode(self):
+        """large image upload in sync mode creates thumbnail but no variants"""
+        AttachmentType.objects.create(
+            name="Test extension", extensions="png", mimetypes="image/png"
+        )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with open(TEST_LARGEPNG_PATH, "rb") as upload:
+                response = self.client.post(self.api_link, data={"upload": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(callbacks), 0)
+
+        attachment = Attachment.objects.get(id=response.json()["id"])
+        self.assertTrue(attachment.thumbnail)
+        self.assertIsNone(attachment.variants)
+
+    @override_settings(MISAGO_ATTACHMENT_IMAGE_PROCESSING="celery")
+    @patch_user_acl({"max_attachment_size": 10 * 1024})
+    def test_large_image_upload_defers_image_processing(self):
+        """image upload in celery mode stores original and defers thumbnail"""
+        AttachmentType.objects.create(
+            name="Test extension", extensions="png", mimetypes="image/png"
+        )
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            with open(TEST_LARGEPNG_PATH, "rb") as upload:
+                response = self.client.post(self.api_link, data={"upload": upload})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(callbacks), 1)
+
+        attachment = Attachment.objects.get(id=response.json()["id"])
+        self.assertTrue(attachment.is_image)
+        self.assertFalse(attachment.thumbnail)
+        self.assertIsNone(attachment.variants)
+
+        create_attachment_variants(attachment.id)
+
+        attachment.refresh_from_db()
+        self.assertTrue(str(attachment.thumbnail).endswith("large.png"))
+
+        variant = attachment.variants[THUMBNAIL_WEBP]
+        self.assertEqual(variant["format"], "webp")
+        self.assertEqual(
+            variant["width"], settings.MISAGO_ATTACHMENT_IMAGE_SIZE_LIMIT[0]
+        )
+
+        variant_path = attachment.image.storage.path(variant["name"])
+        self.assertEqual(Image.open(variant_path).format, "WEBP")
+
+        # variants are deleted together with attachment
+        attachment.delete()
+        self.assertFalse(os.path.exists(variant_path))
+
     def test_animated_image_upload(self):
         """successful gif upload creates orphan attachment with thumbnail"""
         AttachmentType.objects.create(
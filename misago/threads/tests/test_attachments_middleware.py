@@ -25,7 +25,7 @@ def context(default_category, dynamic_settings, user, user_acl):
         "post": post,
         "settings": dynamic_settings,
         "user": user,
-        "user_acl": user_acl,
+        "user_acl": user_acl.copy(),
     }
 
 
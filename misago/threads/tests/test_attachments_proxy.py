@@ -1,4 +1,6 @@
 import pytest
+from django.core.files.base import ContentFile
+from django.test import override_settings
 from django.urls import reverse
 
 from ...acl.models import Role
@@ -107,6 +109,137 @@ def test_proxy_redirects_client_to_attachment_thumbnail(client, image_with_thumb
     response = client.get(image_with_thumbnail.get_thumbnail_url())
     assert response.status_code == 302
     assert response["location"].endswith("test-thumbnail.png")
+    assert "Accept" in response["vary"]
+
+
+@override_settings(
+    MISAGO_ATTACHMENT_SERVE_MODE="x-accel-redirect",
+    MISAGO_ATTACHMENT_INTERNAL_URL="/protected/",
+)
+def test_proxy_returns_x_accel_redirect_response_for_attachment_file(
+    client, attachment
+):
+    response = client.get(attachment.get_absolute_url())
+    assert response.status_code == 200
+    assert response["x-accel-redirect"] == "/protected/test.txt"
+    assert response["content-type"] == "text/plain"
+    assert response["content-disposition"] == 'attachment; filename="test.txt"'
+    assert response["cache-control"] == "private"
+    assert not response.content
+
+
+@override_settings(MISAGO_ATTACHMENT_SERVE_MODE="x-accel-redirect")
+def test_proxy_returns_x_accel_redirect_response_for_attachment_image(client, image):
+    response = client.get(image.get_absolute_url())
+    assert response.status_code == 200
+    assert response["x-accel-redirect"].endswith("/test.png")
+    assert response["content-type"] == "image/png"
+    assert "content-disposition" not in response
+
+
+@override_settings(MISAGO_ATTACHMENT_SERVE_MODE="x-sendfile")
+def test_proxy_returns_x_sendfile_response_for_attachment_file(client, attachment):
+    response = client.get(attachment.get_absolute_url())
+    assert response.status_code == 200
+    assert response["x-sendfile"] == attachment.file.path
+
+
+@override_settings(MISAGO_ATTACHMENT_SERVE_MODE="stream")
+def test_proxy_streams_attachment_file(client, attachment):
+    attachment.file.save("test.txt", ContentFile(b"Hello world!"))
+
+    response = client.get(attachment.get_absolute_url())
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"Hello world!"
+    assert response["content-disposition"] == 'attachment; filename="test.txt"'
+
+    attachment.file.delete(save=False)
+
+
+@override_settings(MISAGO_ATTACHMENT_SERVE_MODE="stream")
+def test_proxy_streams_webp_variant_with_its_content_type(client, image_with_thumbnail):
+    storage = image_with_thumbnail.image.storage
+    variant_name = storage.save("test.thumbnail_webp.webp", ContentFile(b"WebP"))
+    image_with_thumbnail.variants = {
+        "thumbnail_webp": {"name": variant_name, "format": "webp"}
+    }
+    image_with_thumbnail.save()
+
+    response = client.get(
+        image_with_thumbnail.get_thumbnail_url(), HTTP_ACCEPT="image/webp,*/*"
+    )
+    assert response.status_code == 200
+    assert b"".join(response.streaming_content) == b"WebP"
+    assert response["content-type"] == "image/webp"
+
+    storage.delete(variant_name)
+
+
+@override_settings(MISAGO_ATTACHMENT_SERVE_MODE="stream")
+def test_proxy_redirects_to_404_image_for_missing_file_in_stream_mode(client, image):
+    response = client.get(image.get_absolute_url())
+    assert_404(response)
+
+
+@override_settings(MISAGO_ATTACHMENT_SERVE_MODE="x-accel-redirect")
+def test_proxy_redirects_to_error_image_in_x_accel_redirect_mode(
+    client, other_users_orphaned_attachment
+):
+    response = client.get(
+        other_users_orphaned_attachment.get_absolute_url() + "?shva=1"
+    )
+    assert_404(response)
+
+
+def test_proxy_redirects_client_accepting_webp_to_thumbnail_variant(
+    client, image_with_thumbnail
+):
+    image_with_thumbnail.variants = {
+        "thumbnail_webp": {"name": "test.thumbnail_webp.webp", "format": "webp"}
+    }
+    image_with_thumbnail.save()
+
+    response = client.get(
+        image_with_thumbnail.get_thumbnail_url(), HTTP_ACCEPT="image/webp,*/*"
+    )
+    assert response.status_code == 302
+    assert response["location"].endswith("test.thumbnail_webp.webp")
+    assert "Accept" in response["vary"]
+
+
+def test_proxy_redirects_client_accepting_webp_to_original_image(client, image):
+    image.variants = {"webp": {"name": "test.webp.webp", "format": "webp"}}
+    image.save()
+
+    response = client.get(image.get_absolute_url(), HTTP_ACCEPT="image/webp,*/*")
+    assert response.status_code == 302
+    assert response["location"].endswith("test.png")
+
+
+@override_settings(MISAGO_ATTACHMENT_WEBP_FULL_IMAGES=True)
+def test_proxy_redirects_client_accepting_webp_to_image_variant_if_enabled(
+    client, image
+):
+    image.variants = {"webp": {"name": "test.webp.webp", "format": "webp"}}
+    image.save()
+
+    response = client.get(image.get_absolute_url(), HTTP_ACCEPT="image/webp,*/*")
+    assert response.status_code == 302
+    assert response["location"].endswith("test.webp.webp")
+
+
+def test_proxy_redirects_client_not_accepting_webp_to_thumbnail(
+    client, image_with_thumbnail
+):
+    image_with_thumbnail.variants = {
+        "thumbnail_webp": {"name": "test.thumbnail_webp.webp", "format": "webp"}
+    }
+    image_with_thumbnail.save()
+
+    response = client.get(image_with_thumbnail.get_thumbnail_url())
+    assert response.status_code == 302
+    assert response["location"].endswith("test-thumbnail.png")
+    assert "Accept" in response["vary"]
 
 
 def test_proxy_redirects_to_404_image_for_nonexistant_attachment(db, client):
@@ -254,6 +387,26 @@ def test_proxy_allows_staff_user_without_role_to_download_attachment_with_limite
     assert response["location"].endswith("test.txt")
 
 
+def test_attachment_types_cache_is_cleared_when_role_is_deleted(
+    mocker, role, limited_attachment_type
+):
+    clear_cache_mock = mocker.patch(
+        "misago.threads.signals.clear_attachment_types_cache"
+    )
+    role.delete()
+    clear_cache_mock.assert_called()
+
+
+def test_attachment_types_cache_is_cleared_when_download_roles_change(
+    mocker, role, attachment_type
+):
+    clear_cache_mock = mocker.patch(
+        "misago.threads.signals.clear_attachment_types_cache"
+    )
+    attachment_type.limit_downloads_to.add(role)
+    clear_cache_mock.assert_called()
+
+
 @override_dynamic_settings(attachment_403_image="custom-403-image.png")
 @patch_user_acl({"can_download_other_users_attachments": False})
 def test_proxy_uses_custom_permission_denied_image_if_one_is_set(
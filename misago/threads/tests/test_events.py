@@ -60,6 +60,7 @@ class EventsApiTests(TestCase):
         request = Mock(user=self.user, user_ip="123.14.15.222")
         event = record_event(request, self.thread, "announcement")
 
-        self.user.postread_set.get(
-            category=self.category, thread=self.thread, post=event
+        read_thread = self.user.readthread_set.get(
+            category=self.category, thread=self.thread
         )
+        self.assertTrue(read_thread.is_post_read(event.pk))
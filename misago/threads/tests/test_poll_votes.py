@@ -0,0 +1,99 @@
+from io import StringIO
+
+from django.core.management import call_command
+
+from ..management.commands import synchronizepolls
+from ..models import Poll
+from ..pollvotes import synchronize_polls_votes, update_poll_votes
+from ..test import post_poll
+
+
+def get_choices_votes(poll):
+    return [choice["votes"] for choice in poll.choices]
+
+
+def test_update_poll_votes_applies_deltas_to_choices(user, thread):
+    poll = post_poll(thread, user)
+    update_poll_votes(poll, {"aaaaaaaaaaaa": -1, "bbbbbbbbbbbb": 1})
+
+    assert poll.votes == 4
+    assert get_choices_votes(poll) == [0, 1, 2, 1]
+
+    poll.refresh_from_db()
+    assert poll.votes == 4
+    assert get_choices_votes(poll) == [0, 1, 2, 1]
+
+
+def test_update_poll_votes_applies_deltas_to_database_values(user, thread):
+    poll = post_poll(thread, user)
+
+    # Simulate other voter's vote that happened after poll was loaded
+    Poll.objects.filter(id=poll.id).update(
+        votes=5,
+        choices=[
+            {"hash": "aaaaaaaaaaaa", "label": "Alpha", "votes": 1},
+            {"hash": "bbbbbbbbbbbb", "label": "Beta", "votes": 1},
+            {"hash": "gggggggggggg", "label": "Gamma", "votes": 2},
+            {"hash": "dddddddddddd", "label": "Delta", "votes": 1},
+        ],
+    )
+
+    update_poll_votes(poll, {"bbbbbbbbbbbb": 1})
+
+    assert poll.votes == 6
+    assert get_choices_votes(poll) == [1, 2, 2, 1]
+
+
+def test_update_poll_votes_skips_empty_deltas(user, thread):
+    poll = post_poll(thread, user)
+    update_poll_votes(poll, {"aaaaaaaaaaaa": 0})
+
+    poll.refresh_from_db()
+    assert poll.votes == 4
+    assert get_choices_votes(poll) == [1, 0, 2, 1]
+
+
+def test_synchronize_polls_votes_recounts_votes_from_cast_votes(user, thread):
+    poll = post_poll(thread, user)
+    Poll.objects.filter(id=poll.id).update(
+        votes=0,
+        choices=[
+            {"hash": "aaaaaaaaaaaa", "label": "Alpha", "votes": 0},
+            {"hash": "bbbbbbbbbbbb", "label": "Beta", "votes": 3},
+            {"hash": "gggggggggggg", "label": "Gamma", "votes": 0},
+            {"hash": "dddddddddddd", "label": "Delta", "votes": 0},
+        ],
+    )
+
+    synchronize_polls_votes([poll.id])
+
+    poll.refresh_from_db()
+    assert poll.votes == 4
+    assert get_choices_votes(poll) == [1, 0, 2, 1]
+    assert [choice["label"] for choice in poll.choices] == [
+        "Alpha",
+        "Beta",
+        "Gamma",
+        "Delta",
+    ]
+
+
+def test_synchronizepolls_command_recounts_polls_votes(user, thread):
+    poll = post_poll(thread, user)
+    Poll.objects.filter(id=poll.id).update(votes=0)
+
+    out = StringIO()
+    call_command(synchronizepolls.Command(), stdout=out)
+
+    poll.refresh_from_db()
+    assert poll.votes == 4
+
+    command_output = out.getvalue().splitlines()[-1].strip()
+    assert command_output == "Synchronized 1 polls"
+
+
+def test_synchronizepolls_command_handles_no_polls(db):
+    out = StringIO()
+    call_command(synchronizepolls.Command(), stdout=out)
+
+    assert out.getvalue().strip() == "No polls were found"
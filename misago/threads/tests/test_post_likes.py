@@ -0,0 +1,90 @@
+from ..likes import get_liked_posts_ids, like_post, unlike_post, update_post_likes
+from ..models import Post
+from ..utils import add_likes_to_posts
+
+
+def test_like_post_creates_like_and_updates_post(user, post):
+    assert like_post(post, user)
+
+    assert post.likes == 1
+    assert post.last_likes == [{"id": user.id, "username": user.username}]
+
+    post.refresh_from_db()
+    assert post.likes == 1
+    assert post.last_likes == [{"id": user.id, "username": user.username}]
+    assert post.postlike_set.filter(liker=user).exists()
+
+
+def test_like_post_does_nothing_for_liked_post(user, post):
+    assert like_post(post, user)
+    assert not like_post(post, user)
+
+    post.refresh_from_db()
+    assert post.likes == 1
+    assert post.postlike_set.count() == 1
+
+
+def test_unlike_post_deletes_like_and_updates_post(user, other_user, post):
+    like_post(post, user)
+    like_post(post, other_user)
+    assert unlike_post(post, user)
+
+    assert post.likes == 1
+    assert post.last_likes == [{"id": other_user.id, "username": other_user.username}]
+
+    post.refresh_from_db()
+    assert post.likes == 1
+    assert not post.postlike_set.filter(liker=user).exists()
+
+
+def test_unlike_post_does_nothing_for_not_liked_post(user, post):
+    assert not unlike_post(post, user)
+
+    post.refresh_from_db()
+    assert post.likes == 0
+
+
+def test_update_post_likes_applies_delta_to_database_value(user, post):
+    like_post(post, user)
+
+    # Simulate stale post instance loaded before other user's like
+    Post.objects.filter(id=post.id).update(likes=5)
+    update_post_likes(post, 1)
+
+    assert post.likes == 6
+
+
+def test_last_likes_are_ordered_from_newest_like(
+    user, other_user, staffuser, superuser, post
+):
+    for liker in (user, other_user, staffuser, superuser):
+        like_post(post, liker)
+
+    assert post.likes == 4
+    assert [like["id"] for like in post.last_likes] == [
+        superuser.id,
+        staffuser.id,
+        other_user.id,
+        user.id,
+    ]
+
+
+def test_get_liked_posts_ids_returns_ids_of_posts_liked_by_user(
+    user, other_user, post, reply
+):
+    like_post(post, user)
+    like_post(reply, other_user)
+
+    assert get_liked_posts_ids(user, [post.id, reply.id]) == {post.id}
+
+
+def test_get_liked_posts_ids_returns_empty_set_for_anonymous_user(anonymous_user, post):
+    assert get_liked_posts_ids(anonymous_user, [post.id]) == set()
+
+
+def test_add_likes_to_posts_sets_is_liked_on_posts(user, post, reply):
+    like_post(post, user)
+
+    add_likes_to_posts(user, [post, reply])
+    assert post.is_liked
+    assert not reply.is_liked
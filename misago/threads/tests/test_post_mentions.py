@@ -69,7 +69,7 @@ class PostMentionsTests(AuthenticatedUserTestCase):
         "misago.threads.api.postingendpoint.notifications.notify_on_new_thread_reply"
     )
     def test_mention_limit(self, notify_on_new_thread_reply_mock):
-        """endpoint mentions over limit results in no mentions set"""
+        """endpoint resolves only mentions up to the limit"""
         users = []
 
         for i in range(MENTIONS_LIMIT + 5):
@@ -84,7 +84,11 @@ class PostMentionsTests(AuthenticatedUserTestCase):
 
         post = self.user.post_set.order_by("id").last()
 
-        self.assertEqual(post.mentions.count(), 0)
+        self.assertEqual(post.mentions.count(), MENTIONS_LIMIT)
+        self.assertEqual(
+            set(post.mentions.values_list("id", flat=True)),
+            set(u.id for u in users[:MENTIONS_LIMIT]),
+        )
 
     @patch(
         "misago.threads.api.postingendpoint.notifications.notify_on_new_thread_reply"
@@ -0,0 +1,106 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from ..management.commands import rebuildpostssearch
+from ..models import Post
+from ..searchindex import rebuild_posts_search
+from ..test import post_thread, reply_thread
+
+
+def run_command(*args):
+    command = rebuildpostssearch.Command()
+
+    out = StringIO()
+    call_command(command, *args, stdout=out)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def clear_search(post):
+    Post.objects.filter(id=post.id).update(search_document="", search_vector="")
+
+
+def get_search(post):
+    return Post.objects.values_list("search_document", "search_vector").get(id=post.id)
+
+
+def test_command_works_if_there_are_no_posts(db):
+    assert run_command() == "No posts were found"
+
+
+def test_command_rebuilds_posts_search(default_category):
+    thread = post_thread(default_category, title="Hello world")
+    reply = reply_thread(thread, message="Lorem ipsum")
+    clear_search(thread.first_post)
+    clear_search(reply)
+
+    assert run_command("--processes=1") == "Rebuild search for 2 posts"
+
+    search_document, search_vector = get_search(thread.first_post)
+    assert search_document == "Hello world\n\nI am test message"
+    assert "world" in search_vector
+
+    search_document, search_vector = get_search(reply)
+    assert search_document == "Lorem ipsum"
+    assert "lorem" in search_vector
+
+
+def test_command_rebuilds_posts_search_in_id_range(default_category):
+    threads = [post_thread(default_category) for _ in range(3)]
+    for thread in threads:
+        clear_search(thread.first_post)
+
+    first_post_id = threads[1].first_post.id
+    command_output = run_command(
+        "--processes=1", "--from-id=%s" % first_post_id, "--to-id=%s" % first_post_id
+    )
+    assert command_output == "Rebuild search for 1 posts"
+
+    assert get_search(threads[0].first_post) == ("", "")
+    assert get_search(threads[1].first_post)[0]
+    assert get_search(threads[2].first_post) == ("", "")
+
+
+def test_command_resumes_from_checkpoint(tmp_path, thread):
+    reply = reply_thread(thread)
+    clear_search(thread.first_post)
+    clear_search(reply)
+
+    checkpoint = tmp_path / "checkpoint"
+    checkpoint.write_text(str(thread.first_post.id))
+
+    command_output = run_command("--processes=1", "--checkpoint=%s" % checkpoint)
+    assert command_output == "Rebuild search for 1 posts"
+    assert not checkpoint.exists()
+
+    assert get_search(thread.first_post) == ("", "")
+    assert get_search(reply)[0] == "I am test message"
+
+
+def test_rebuild_posts_search_yields_batches_checkpoints(default_category):
+    threads = [post_thread(default_category) for _ in range(3)]
+
+    batches = list(rebuild_posts_search(batch_size=2, processes=1))
+    assert batches == [
+        (2, threads[1].first_post.id),
+        (1, threads[2].first_post.id),
+    ]
+
+
+def test_rebuild_posts_search_skips_events(thread):
+    Post.objects.filter(id=thread.first_post.id).update(is_event=True)
+    assert not list(rebuild_posts_search(processes=1))
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_rebuild_posts_search_rebuilds_batches_in_processes_pool(default_category):
+    threads = [post_thread(default_category) for _ in range(3)]
+    for thread in threads:
+        clear_search(thread.first_post)
+
+    batches = list(rebuild_posts_search(batch_size=1, processes=2))
+    assert len(batches) == 3
+
+    for thread in threads:
+        assert get_search(thread.first_post)[1]
@@ -0,0 +1,118 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+
+from ...conf.test import override_dynamic_settings
+from ..management.commands import reparseposts
+from ..models import Post
+from ..reparse import reparse_posts
+from ..test import post_thread, reply_thread
+
+
+def run_command(*args):
+    command = reparseposts.Command()
+
+    out = StringIO()
+    call_command(command, *args, stdout=out)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def break_post(post):
+    Post.objects.filter(id=post.id).update(
+        original="Hello **world**, see other.com now",
+        parsed="<p>Outdated</p>",
+        search_document="",
+    )
+
+
+def test_command_works_if_there_are_no_posts(db):
+    assert run_command("--host=example.com") == "No posts were found"
+
+
+@override_dynamic_settings(forum_address=None)
+def test_command_requires_host_if_forum_address_is_not_set(db):
+    with pytest.raises(reparseposts.CommandError):
+        run_command()
+
+
+def test_command_reparses_posts(thread):
+    break_post(thread.first_post)
+
+    command_output = run_command("--host=example.com", "--processes=1")
+    assert command_output == "Reparsed 1 posts"
+
+    post = Post.objects.get(id=thread.first_post.id)
+    assert post.parsed == (
+        "<p>Hello <strong>world</strong>, see "
+        '<a href="http://other.com" rel="external nofollow noopener" '
+        'target="_blank">other.com</a> now</p>'
+    )
+    assert post.is_valid
+    assert thread.title in post.search_document
+    assert "world" in post.search_document
+
+
+def test_command_uses_forum_address_for_host(thread):
+    break_post(thread.first_post)
+
+    with override_dynamic_settings(forum_address="http://example.com"):
+        run_command("--processes=1")
+
+    post = Post.objects.get(id=thread.first_post.id)
+    assert "nofollow" in post.parsed
+
+    Post.objects.filter(id=post.id).update(original="See example.com/t/1/")
+    with override_dynamic_settings(forum_address="http://example.com"):
+        run_command("--processes=1")
+
+    post = Post.objects.get(id=thread.first_post.id)
+    assert 'href="/t/1/"' in post.parsed
+
+
+def test_command_resumes_from_checkpoint(tmp_path, thread):
+    reply = reply_thread(thread)
+    break_post(thread.first_post)
+    break_post(reply)
+
+    checkpoint = tmp_path / "checkpoint"
+    checkpoint.write_text(str(thread.first_post.id))
+
+    command_output = run_command(
+        "--host=example.com", "--processes=1", "--checkpoint=%s" % checkpoint
+    )
+    assert command_output == "Reparsed 1 posts"
+    assert not checkpoint.exists()
+
+    assert Post.objects.get(id=thread.first_post.id).parsed == "<p>Outdated</p>"
+    assert Post.objects.get(id=reply.id).parsed != "<p>Outdated</p>"
+
+
+def test_reparse_posts_yields_batches_checkpoints(default_category):
+    threads = [post_thread(default_category) for _ in range(3)]
+
+    batches = list(reparse_posts("example.com", batch_size=2, processes=1))
+    assert batches == [
+        (2, threads[1].first_post.id),
+        (1, threads[2].first_post.id),
+    ]
+
+
+def test_reparse_posts_skips_events(thread):
+    Post.objects.filter(id=thread.first_post.id).update(is_event=True)
+    assert not list(reparse_posts("example.com", processes=1))
+
+
+@pytest.mark.django_db(transaction=True, serialized_rollback=True)
+def test_reparse_posts_parses_batches_in_processes_pool(default_category):
+    threads = [post_thread(default_category) for _ in range(3)]
+    for thread in threads:
+        break_post(thread.first_post)
+
+    batches = list(reparse_posts("example.com", batch_size=1, processes=2))
+    assert len(batches) == 3
+
+    for thread in threads:
+        post = Post.objects.get(id=thread.first_post.id)
+        assert "<strong>world</strong>" in post.parsed
+        assert post.is_valid
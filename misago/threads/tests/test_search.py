@@ -1,7 +1,11 @@
+from django.core.cache import cache
+from django.test import override_settings
 from django.urls import reverse
 
+from .. import search as threads_search
 from .. import test
 from ...categories.models import Category
+from ...conf.test import override_dynamic_settings
 from ...users.test import AuthenticatedUserTestCase
 
 
@@ -232,3 +236,26 @@ def test_post_search_filters_hook_is_used_by_threads_search(
             results = provider["results"]["results"]
             assert len(results) == 1
             assert results[0]["id"] == post.id
+
+
+@override_settings(
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+)
+@override_dynamic_settings(posts_per_page=2, posts_per_page_orphans=0)
+def test_threads_search_pages_use_cached_results(db, client, mocker, thread):
+    cache.clear()
+
+    posts = [test.reply_thread(thread, message="Lorem ipsum") for _ in range(3)]
+    for post in posts:
+        index_post(post)
+
+    search_threads = mocker.spy(threads_search, "search_threads")
+
+    response = client.get("/api/search/threads/?q=ipsum")
+    assert len(response.json()[0]["results"]["results"]) == 2
+
+    response = client.get("/api/search/threads/?q=Ipsum&page=2")
+    assert len(response.json()[0]["results"]["results"]) == 1
+
+    search_threads.assert_called_once()
+    cache.clear()
@@ -0,0 +1,149 @@
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+from ..models import Post
+from ..searchbackends import (
+    LocalSearchBackend,
+    PostgresSearchBackend,
+    get_search_backend,
+    load_search_backend,
+)
+from ..searchindex import rebuild_posts_search
+from ..test import reply_thread
+
+LOCAL_BACKEND = "misago.threads.searchbackends.LocalSearchBackend"
+
+
+@pytest.fixture
+def local_search_backend(tmp_path):
+    load_search_backend.cache_clear()
+    with override_settings(
+        MISAGO_SEARCH_BACKEND=LOCAL_BACKEND,
+        MISAGO_SEARCH_INDEX_PATH=str(tmp_path / "search.sqlite3"),
+    ):
+        yield get_search_backend()
+    load_search_backend.cache_clear()
+
+
+def index_post(post, message):
+    post.original = message
+    post.set_search_document()
+    post.save(update_fields=["original", "search_document"])
+
+    post.update_search_vector()
+    post.save(update_fields=["search_vector"])
+
+
+def count_indexed_posts(backend):
+    with backend.connect() as connection:
+        return connection.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+
+
+def get_visible_posts():
+    return Post.objects.filter(is_event=False, is_hidden=False, is_unapproved=False)
+
+
+def test_default_search_backend_is_postgres(db):
+    assert isinstance(get_search_backend(), PostgresSearchBackend)
+
+
+def test_postgres_backend_returns_matching_posts_ids(thread):
+    post = reply_thread(thread)
+    index_post(post, "Lorem ipsum dolor")
+    other_post = reply_thread(thread)
+    index_post(other_post, "Dolor met")
+
+    backend = PostgresSearchBackend()
+    assert backend.search("ipsum", get_visible_posts(), 10) == [post.id]
+    assert set(backend.search("dolor", get_visible_posts(), 10)) == {
+        post.id,
+        other_post.id,
+    }
+
+
+def test_postgres_backend_limits_results_to_newest_posts(thread):
+    posts = [reply_thread(thread) for _ in range(3)]
+    for post in posts:
+        index_post(post, "Lorem ipsum")
+
+    backend = PostgresSearchBackend()
+    assert backend.search("lorem", get_visible_posts(), 2) == [
+        posts[2].id,
+        posts[1].id,
+    ]
+
+
+def test_local_backend_requires_index_path(db):
+    with override_settings(MISAGO_SEARCH_INDEX_PATH=None):
+        with pytest.raises(ImproperlyConfigured):
+            LocalSearchBackend()
+
+
+def test_local_backend_indexes_saved_posts(local_search_backend, thread):
+    post = reply_thread(thread)
+    index_post(post, "Lorem ipsum dolor")
+
+    results = local_search_backend.search("ipsum", get_visible_posts(), 10)
+    assert results == [post.id]
+
+
+def test_local_backend_reindexes_edited_posts(local_search_backend, thread):
+    post = reply_thread(thread)
+    index_post(post, "Lorem ipsum dolor")
+    index_post(post, "Sit amet")
+
+    assert not local_search_backend.search("ipsum", get_visible_posts(), 10)
+    assert local_search_backend.search("amet", get_visible_posts(), 10) == [post.id]
+
+
+def test_local_backend_ranks_posts_by_relevance(local_search_backend, thread):
+    post = reply_thread(thread)
+    index_post(post, "Lorem ipsum dolor sit amet, consectetur adipiscing elit")
+    other_post = reply_thread(thread)
+    index_post(other_post, "Lorem lorem lorem")
+
+    results = local_search_backend.search("lorem", get_visible_posts(), 10)
+    assert results == [other_post.id, post.id]
+
+
+def test_local_backend_excludes_invisible_posts(local_search_backend, thread):
+    posts = [reply_thread(thread) for _ in range(3)]
+    for post in posts:
+        index_post(post, "Lorem ipsum")
+
+    Post.objects.filter(id__in=[posts[0].id, posts[1].id]).update(is_hidden=True)
+
+    results = local_search_backend.search("lorem", get_visible_posts(), 1)
+    assert results == [posts[2].id]
+
+
+def test_local_backend_handles_query_without_words(local_search_backend, thread):
+    assert local_search_backend.search("!?", get_visible_posts(), 10) == []
+
+
+def test_local_backend_removes_deleted_posts(local_search_backend, thread):
+    post = reply_thread(thread)
+    index_post(post, "Lorem ipsum dolor")
+    assert count_indexed_posts(local_search_backend) == 1
+
+    post.delete()
+    assert count_indexed_posts(local_search_backend) == 0
+
+
+def test_local_backend_removes_deleted_threads_posts(local_search_backend, thread):
+    post = reply_thread(thread)
+    index_post(post, "Lorem ipsum dolor")
+
+    thread.delete()
+    assert count_indexed_posts(local_search_backend) == 0
+
+
+def test_local_backend_is_rebuilt_by_search_rebuild(local_search_backend, thread):
+    post = reply_thread(thread, message="Lorem ipsum dolor")
+    Post.objects.filter(id=post.id).update(search_document="")
+
+    list(rebuild_posts_search(processes=1))
+
+    results = local_search_backend.search("ipsum", get_visible_posts(), 10)
+    assert results == [post.id]
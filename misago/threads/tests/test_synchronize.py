@@ -0,0 +1,155 @@
+from datetime import timedelta
+
+from ...categories.models import Category
+from ..models import Thread
+from ..synchronize import (
+    synchronize_all_threads,
+    synchronize_categories,
+    synchronize_thread,
+    synchronize_threads,
+)
+from ..test import post_poll, post_thread, reply_thread
+
+
+def get_thread_state(thread):
+    thread = Thread.objects.get(id=thread.id)
+    return {
+        field: getattr(thread, field)
+        for field in (
+            "has_poll",
+            "replies",
+            "has_reported_posts",
+            "has_open_reports",
+            "has_unapproved_posts",
+            "has_hidden_posts",
+            "has_events",
+            "first_post_id",
+            "starter_name",
+            "is_hidden",
+            "is_unapproved",
+            "last_post_id",
+            "last_post_on",
+            "last_post_is_event",
+            "last_poster_name",
+        )
+    }
+
+
+def break_threads(*threads):
+    Thread.objects.filter(id__in=[t.id for t in threads]).update(
+        replies=42,
+        has_poll=True,
+        has_reported_posts=True,
+        has_open_reports=True,
+        has_unapproved_posts=True,
+        has_hidden_posts=True,
+        has_events=True,
+        first_post=None,
+        last_post=None,
+        last_poster_name="Outdated",
+    )
+
+
+def test_synchronize_threads_matches_thread_synchronize(default_category, user):
+    thread = post_thread(default_category, poster=user)
+    reply_thread(thread, poster="Ghost", is_hidden=True)
+    reply_thread(thread, poster="Ghost", has_reports=True, has_open_reports=True)
+    reply_thread(thread, poster="Ghost", is_event=True)
+    reply_thread(thread, poster="Ghost", is_unapproved=True)
+    post_poll(thread, user)
+    thread.synchronize()
+    thread.save()
+
+    other_thread = post_thread(default_category, poster="Bob")
+
+    expected_state = get_thread_state(thread)
+    other_expected_state = get_thread_state(other_thread)
+
+    break_threads(thread, other_thread)
+    assert synchronize_threads([thread.id, other_thread.id]) == 2
+
+    assert get_thread_state(thread) == expected_state
+    assert get_thread_state(other_thread) == other_expected_state
+
+
+def test_synchronize_threads_sets_thread_without_approved_posts_first_post_as_last(
+    default_category,
+):
+    thread = post_thread(default_category, is_unapproved=True)
+    expected_state = get_thread_state(thread)
+
+    break_threads(thread)
+    synchronize_threads([thread.id])
+
+    assert get_thread_state(thread) == expected_state
+    assert expected_state["last_post_id"] == expected_state["first_post_id"]
+
+
+def test_synchronize_threads_skips_threads_without_posts(default_category):
+    thread = post_thread(default_category)
+    thread.post_set.all().delete()
+
+    assert synchronize_threads([thread.id]) == 0
+
+
+def test_synchronize_threads_does_nothing_for_empty_ids(db):
+    assert synchronize_threads([]) == 0
+
+
+def test_synchronize_thread_updates_thread_instance(default_category):
+    thread = post_thread(default_category)
+    reply = reply_thread(thread, poster="Ghost")
+
+    thread.replies = 0
+    thread.last_post = None
+    synchronize_thread(thread)
+
+    assert thread.replies == 1
+    assert thread.last_post == reply
+    assert thread.last_poster_name == "Ghost"
+
+
+def test_synchronize_all_threads_yields_batches(default_category):
+    threads = [post_thread(default_category) for _ in range(5)]
+    break_threads(*threads)
+
+    assert list(synchronize_all_threads(batch_size=2, processes=1)) == [2, 2, 1]
+
+    for thread in threads:
+        thread.refresh_from_db()
+        assert thread.last_post_id == thread.first_post_id
+
+
+def test_synchronize_categories_matches_category_synchronize(default_category):
+    thread = post_thread(default_category)
+    reply_thread(thread)
+    post_thread(default_category, is_hidden=True)
+    last_thread = post_thread(
+        default_category,
+        title="Last thread",
+        started_on=thread.last_post_on + timedelta(minutes=5),
+    )
+
+    Category.objects.filter(id=default_category.id).update(
+        threads=0, posts=0, last_thread=None, last_thread_title=None
+    )
+
+    assert synchronize_categories([default_category.id]) == 1
+
+    default_category.refresh_from_db()
+    assert default_category.threads == 2
+    assert default_category.posts == 3
+    assert default_category.last_thread_id == last_thread.id
+    assert default_category.last_thread_title == "Last thread"
+
+
+def test_synchronize_categories_empties_category_without_threads(default_category):
+    thread = post_thread(default_category)
+    Thread.objects.filter(id=thread.id).delete()
+
+    synchronize_categories([default_category.id])
+
+    default_category.refresh_from_db()
+    assert default_category.threads == 0
+    assert default_category.posts == 0
+    assert default_category.last_thread is None
@@ -32,7 +32,7 @@ class SynchronizeThreadsTests(TestCase):
         command = synchronizethreads.Command()
 
         out = StringIO()
-        call_command(command, stdout=out)
+        call_command(command, "--processes=1", "--batch-size=3", stdout=out)
 
         for i, thread in enumerate(threads):
             db_thread = category.thread_set.get(id=thread.id)
@@ -255,14 +255,11 @@ class ThreadMergeApiTests(ThreadsApiTestCase):
         )
 
         # posts reads are kept
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        self.assertEqual(
-            list(postreads.values_list("post_id", flat=True)),
-            [self.thread.first_post_id, other_thread.first_post_id],
-        )
-        self.assertEqual(postreads.filter(thread=other_thread).count(), 2)
-        self.assertEqual(postreads.filter(category=self.other_category).count(), 2)
+        read_thread = self.user.readthread_set.get()
+        self.assertEqual(read_thread.thread, other_thread)
+        self.assertEqual(read_thread.category, self.other_category)
+        self.assertTrue(read_thread.is_post_read(self.thread.first_post_id))
+        self.assertTrue(read_thread.is_post_read(other_thread.first_post_id))
 
     @patch_other_category_acl({"can_merge_threads": True})
     @patch_category_acl({"can_merge_threads": True})
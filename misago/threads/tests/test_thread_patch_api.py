@@ -386,8 +386,8 @@ class ThreadMoveApiTests(ThreadPatchApiTestCase):
         """api moves thread reads together with thread"""
         poststracker.save_read(self.user, self.thread.first_post)
 
-        self.assertEqual(self.user.postread_set.count(), 1)
-        self.user.postread_set.get(category=self.category)
+        self.assertEqual(self.user.readthread_set.count(), 1)
+        self.user.readthread_set.get(category=self.category)
 
         response = self.patch(
             self.api_link,
@@ -400,10 +400,8 @@ class ThreadMoveApiTests(ThreadPatchApiTestCase):
         self.assertEqual(response.status_code, 200)
 
         # thread read was moved to new category
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        self.assertEqual(postreads.count(), 1)
-        postreads.get(category=self.dst_category)
+        self.assertEqual(self.user.readthread_set.count(), 1)
+        self.user.readthread_set.get(category=self.dst_category)
 
     @patch_other_category_acl({"can_start_threads": 2})
     @patch_category_acl({"can_move_threads": True})
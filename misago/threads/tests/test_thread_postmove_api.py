@@ -530,11 +530,13 @@ class ThreadPostMoveApiTestCase(AuthenticatedUserTestCase):
 
         other_thread = Thread.objects.get(pk=other_thread.pk)
 
-        # postreads were removed
-        postreads = self.user.postread_set.order_by("id")
+        # moved posts reads were not moved
+        read_threads = self.user.readthread_set.order_by("id")
 
-        postreads_threads = list(postreads.values_list("thread_id", flat=True))
-        self.assertEqual(postreads_threads, [self.thread.pk])
+        read_threads_ids = list(read_threads.values_list("thread_id", flat=True))
+        self.assertEqual(read_threads_ids, [self.thread.pk])
 
-        postreads_categories = list(postreads.values_list("category_id", flat=True))
-        self.assertEqual(postreads_categories, [self.category.pk])
+        read_threads_categories = list(
+            read_threads.values_list("category_id", flat=True)
+        )
+        self.assertEqual(read_threads_categories, [self.category.pk])
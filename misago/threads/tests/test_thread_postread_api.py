@@ -36,8 +36,9 @@ class PostReadApiTests(ThreadsApiTestCase):
         response = self.client.post(self.api_link)
         self.assertEqual(response.status_code, 200)
 
-        self.assertEqual(self.user.postread_set.count(), 1)
-        self.user.postread_set.get(post=self.post)
+        read_thread = self.user.readthread_set.get(thread=self.thread)
+        self.assertTrue(read_thread.is_post_read(self.post.pk))
+        self.assertFalse(read_thread.is_post_read(self.thread.first_post_id))
 
         # one post read, first post is still unread
         self.assertFalse(response.json()["thread_is_read"])
@@ -51,8 +52,9 @@ class PostReadApiTests(ThreadsApiTestCase):
         )
         self.assertEqual(response.status_code, 200)
 
-        self.assertEqual(self.user.postread_set.count(), 2)
-        self.user.postread_set.get(post=self.thread.first_post)
+        read_thread = self.user.readthread_set.get(thread=self.thread)
+        self.assertEqual(read_thread.read_post_id, self.post.pk)
+        self.assertEqual(read_thread.read_posts, [])
 
         # both posts are read
         self.assertTrue(response.json()["thread_is_read"])
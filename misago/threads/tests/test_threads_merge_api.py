@@ -688,14 +688,11 @@ class ThreadsMergeApiTests(ThreadsApiTestCase):
         self.assertEqual([t.pk for t in Thread.objects.all()], [new_thread.pk])
 
         # posts reads are kept
-        postreads = self.user.postread_set.filter(post__is_event=False).order_by("id")
-
-        self.assertEqual(
-            list(postreads.values_list("post_id", flat=True)),
-            [self.thread.first_post_id, thread.first_post_id],
-        )
-        self.assertEqual(postreads.filter(thread=new_thread).count(), 2)
-        self.assertEqual(postreads.filter(category=self.category).count(), 2)
+        read_thread = self.user.readthread_set.get()
+        self.assertEqual(read_thread.thread, new_thread)
+        self.assertEqual(read_thread.category, self.category)
+        self.assertTrue(read_thread.is_post_read(self.thread.first_post_id))
+        self.assertTrue(read_thread.is_post_read(thread.first_post_id))
 
         # subscriptions are kept
         self.assertEqual(self.user.subscription_set.count(), 1)
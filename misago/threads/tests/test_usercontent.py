@@ -0,0 +1,141 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+
+from ..management.commands import deleteusercontent
+from ..models import Post, Thread
+from ..test import like_post, post_thread, reply_thread
+from ..usercontent import (
+    anonymize_user_events,
+    anonymize_user_in_last_likes,
+    delete_user_threads_and_posts,
+)
+
+
+def run_command(*args):
+    command = deleteusercontent.Command()
+
+    out = StringIO()
+    call_command(command, *args, stdout=out)
+    return out.getvalue().strip().splitlines()[-1].strip()
+
+
+def test_user_threads_are_deleted(default_category, user, other_user):
+    user_thread = post_thread(default_category, poster=user)
+    reply_thread(user_thread, poster=other_user)
+    other_thread = post_thread(default_category, poster=other_user)
+
+    list(delete_user_threads_and_posts(user))
+
+    assert not Thread.objects.filter(id=user_thread.id).exists()
+    assert Thread.objects.filter(id=other_thread.id).exists()
+
+    default_category.refresh_from_db()
+    assert default_category.threads == 1
+    assert default_category.posts == 1
+    assert default_category.last_thread_id == other_thread.id
+
+
+def test_user_posts_are_deleted_and_threads_are_synchronized(
+    default_category, user, other_user
+):
+    thread = post_thread(default_category, poster=other_user)
+    reply_thread(thread, poster=user)
+    reply_thread(thread, poster=user)
+
+    list(delete_user_threads_and_posts(user))
+
+    assert not Post.objects.filter(poster=user).exists()
+
+    thread.refresh_from_db()
+    assert thread.replies == 0
+    assert thread.last_post_id == thread.first_post_id
+    assert thread.last_poster_name == other_user.username
+
+    default_category.refresh_from_db()
+    assert default_category.posts == 1
+
+
+def test_threads_left_without_posts_are_deleted(default_category, user, other_user):
+    thread = post_thread(default_category, poster=user)
+    Thread.objects.filter(id=thread.id).update(starter=other_user)
+
+    list(delete_user_threads_and_posts(user))
+
+    assert not Thread.objects.filter(id=thread.id).exists()
+
+    default_category.refresh_from_db()
+    assert default_category.threads == 0
+    assert default_category.last_thread is None
+
+
+def test_deletion_reports_progress_in_batches(default_category, user, other_user):
+    thread = post_thread(default_category, poster=other_user)
+    for _ in range(5):
+        reply_thread(thread, poster=user)
+
+    assert list(delete_user_threads_and_posts(user, batch_size=2)) == [
+        ("posts", 2),
+        ("posts", 2),
+        ("posts", 1),
+    ]
+
+
+def test_deletion_removes_user_from_last_likes(thread, user, other_user):
+    post = thread.first_post
+    like_post(post, user)
+    like_post(post, other_user)
+
+    list(delete_user_threads_and_posts(user))
+
+    post.refresh_from_db()
+    assert post.last_likes == [{"id": other_user.id, "username": other_user.username}]
+
+
+def test_user_is_anonymized_in_last_likes(thread, user, other_user):
+    post = thread.first_post
+    like_post(post, user)
+    like_post(post, other_user)
+
+    user.username = "Deleted"
+    list(anonymize_user_in_last_likes(user))
+
+    post.refresh_from_db()
+    assert post.last_likes == [
+        {"id": other_user.id, "username": other_user.username},
+        {"id": None, "username": "Deleted"},
+    ]
+
+
+def test_user_is_anonymized_in_events(thread, user):
+    event = reply_thread(thread, is_event=True)
+    Post.objects.filter(id=event.id).update(
+        event_type="changed_owner",
+        event_context={"user": {"id": user.id, "username": user.username}},
+    )
+
+    user.username = "Deleted"
+    assert anonymize_user_events(user) == 1
+
+    event.refresh_from_db()
+    assert event.event_context == {
+        "user": {"id": None, "username": "Deleted", "url": reverse("misago:index")}
+    }
+
+
+def test_command_deletes_user_content(default_category, user):
+    thread = post_thread(default_category, poster=user)
+
+    assert run_command(str(user.id)) == "Done"
+    assert not Thread.objects.filter(id=thread.id).exists()
+
+
+def test_command_handles_user_without_content(user):
+    assert run_command(str(user.id)) == "No content was found"
+
+
+def test_command_requires_existing_user(db):
+    with pytest.raises(deleteusercontent.CommandError):
+        run_command("4200")
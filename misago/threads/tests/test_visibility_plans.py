@@ -0,0 +1,143 @@
+from django.test import override_settings
+
+from ...cache.versionedcache import clear_versioned_caches
+
+from ..models import Post, Thread
+from ..permissions import exclude_invisible_posts, exclude_invisible_threads
+from ..permissions.threads import (
+    PostsVisibilityPlan,
+    ThreadsVisibilityPlan,
+    get_threads_visibility_key,
+    get_visibility_plan,
+)
+
+
+def test_threads_visibility_plan_buckets_category_ids(user_acl, default_category):
+    plan = ThreadsVisibilityPlan(user_acl, [default_category])
+    assert plan.show_accepted_visible == (default_category.id,)
+
+
+def test_exclude_invisible_threads_shows_visible_thread(
+    user_acl, default_category, thread
+):
+    queryset = exclude_invisible_threads(user_acl, [default_category], Thread.objects)
+    assert list(queryset) == [thread]
+
+
+def test_exclude_invisible_threads_hides_other_users_hidden_thread(
+    user_acl, default_category, hidden_thread
+):
+    queryset = exclude_invisible_threads(user_acl, [default_category], Thread.objects)
+    assert not queryset.exists()
+
+
+def test_exclude_invisible_threads_returns_empty_queryset_without_categories(
+    user_acl, thread
+):
+    queryset = exclude_invisible_threads(user_acl, [], Thread.objects)
+    assert not queryset.exists()
+
+
+def test_exclude_invisible_posts_shows_visible_post(user_acl, default_category, post):
+    queryset = exclude_invisible_posts(
+        user_acl, [default_category], Post.objects.filter(id=post.id)
+    )
+    assert list(queryset) == [post]
+
+
+def test_visibility_plan_is_not_cached_if_local_cache_is_disabled(
+    user_acl, default_category
+):
+    plan = get_visibility_plan(ThreadsVisibilityPlan, user_acl, [default_category])
+    other_plan = get_visibility_plan(
+        ThreadsVisibilityPlan, user_acl, [default_category]
+    )
+    assert plan is not other_plan
+
+
+@override_settings(MISAGO_LOCAL_CACHE_SIZE=10)
+def test_visibility_plan_is_reused_for_same_acl_and_categories(
+    user_acl, other_user_acl, default_category
+):
+    plan = get_visibility_plan(ThreadsVisibilityPlan, user_acl, [default_category])
+    other_plan = get_visibility_plan(
+        ThreadsVisibilityPlan, other_user_acl, [default_category]
+    )
+    assert plan is other_plan
+
+
+@override_settings(MISAGO_LOCAL_CACHE_SIZE=10)
+def test_visibility_plan_is_not_reused_for_other_categories(
+    user_acl, root_category, default_category
+):
+    plan = get_visibility_plan(PostsVisibilityPlan, user_acl, [default_category])
+    other_plan = get_visibility_plan(
+        PostsVisibilityPlan, user_acl, [root_category, default_category]
+    )
+    assert plan is not other_plan
+
+
+@override_settings(MISAGO_LOCAL_CACHE_SIZE=10)
+def test_cached_visibility_plans_are_cleared_with_versioned_caches(
+    user_acl, default_category
+):
+    plan = get_visibility_plan(ThreadsVisibilityPlan, user_acl, [default_category])
+    clear_versioned_caches()
+    other_plan = get_visibility_plan(
+        ThreadsVisibilityPlan, user_acl, [default_category]
+    )
+    assert plan is not other_plan
+
+
+@override_settings(MISAGO_LOCAL_CACHE_SIZE=10)
+def test_visibility_plan_is_not_cached_for_patched_acl(user_acl, default_category):
+    patched_acl = user_acl.copy()
+    plan = get_visibility_plan(PostsVisibilityPlan, patched_acl, [default_category])
+    other_plan = get_visibility_plan(
+        PostsVisibilityPlan, patched_acl, [default_category]
+    )
+    assert plan is not other_plan
+
+
+@override_settings(MISAGO_LOCAL_CACHE_SIZE=10)
+def test_cached_visibility_plan_applies_current_user_id(
+    user, user_acl, other_user_acl, default_category, thread
+):
+    thread.starter = user
+    thread.is_unapproved = True
+    thread.save()
+
+    queryset = exclude_invisible_threads(user_acl, [default_category], Thread.objects)
+    assert list(queryset) == [thread]
+
+    queryset = exclude_invisible_threads(
+        other_user_acl, [default_category], Thread.objects
+    )
+    assert not queryset.exists()
+
+
+def test_threads_visibility_key_is_shared_by_anonymous_users(
+    default_category, anonymous_user_acl
+):
+    key = get_threads_visibility_key(anonymous_user_acl, [default_category])
+    assert key
+    assert anonymous_user_acl["user_id"] not in key
+
+
+def test_threads_visibility_key_includes_user_id_if_plan_depends_on_user(
+    user_acl, other_user_acl, default_category
+):
+    key = get_threads_visibility_key(user_acl, [default_category])
+    other_key = get_threads_visibility_key(other_user_acl, [default_category])
+    assert key != other_key
+
+
+def test_threads_visibility_key_is_shared_by_moderators(
+    superuser_acl, default_category
+):
+    key = get_threads_visibility_key(superuser_acl, [default_category])
+    assert key[-1] == (default_category.id,)
+
+
+def test_threads_visibility_key_is_none_for_patched_acl(user_acl, default_category):
+    assert get_threads_visibility_key(user_acl.copy(), [default_category]) is None
@@ -0,0 +1,189 @@
+import json
+from typing import Iterator
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.urls import reverse
+
+from ..notifications.models import Notification, WatchedThread
+from .anonymize import ANONYMIZABLE_EVENTS
+from .models import Post, PostLike, Thread
+from .synchronize import synchronize_categories, synchronize_threads
+
+DEFAULT_BATCH_SIZE = 500
+
+REMOVE_FROM_LAST_LIKES_SQL = """
+UPDATE {table} SET last_likes = (
+    SELECT COALESCE(jsonb_agg(item ORDER BY position), '[]'::jsonb)
+    FROM jsonb_array_elements(last_likes) WITH ORDINALITY AS likes(item, position)
+    WHERE item->>'id' IS DISTINCT FROM %(user_id)s
+)
+WHERE id = ANY(%(posts_ids)s) AND last_likes @> %(contains)s::jsonb
+"""
+
+ANONYMIZE_IN_LAST_LIKES_SQL = """
+UPDATE {table} SET last_likes = (
+    SELECT COALESCE(
+        jsonb_agg(
+            CASE WHEN item->>'id' = %(user_id)s
+            THEN jsonb_build_object('id', NULL, 'username', %(username)s::text)
+            ELSE item END
+            ORDER BY position
+        ),
+        '[]'::jsonb
+    )
+    FROM jsonb_array_elements(last_likes) WITH ORDINALITY AS likes(item, position)
+)
+WHERE id = ANY(%(posts_ids)s) AND last_likes @> %(contains)s::jsonb
+"""
+
+
+def delete_user_threads_and_posts(
+    user, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[tuple[str, int]]:
+    """Deletes user's threads and posts in batches.
+
+    Yields tuple with name of the stage ("likes", "threads" or "posts") and
+    number of rows handled after each batch. Every batch is ran in its own
+    transaction together with recount of threads and categories it changed,
+    so deletion that was interrupted can be resumed by running it again.
+    """
+    Notification.objects.filter(Q(thread__starter=user) | Q(post__poster=user)).delete()
+
+    WatchedThread.objects.filter(thread__starter=user).delete()
+
+    for count in remove_user_from_last_likes(user, batch_size):
+        yield "likes", count
+    for count in delete_user_threads(user, batch_size):
+        yield "threads", count
+    for count in delete_user_posts(user, batch_size):
+        yield "posts", count
+
+
+def count_user_content(user) -> dict[str, int]:
+    return {
+        "likes": PostLike.objects.filter(liker=user).count(),
+        "threads": Thread.objects.filter(starter=user).count(),
+        "posts": Post.objects.filter(poster=user).count(),
+    }
+
+
+def remove_user_from_last_likes(user, batch_size: int) -> Iterator[int]:
+    for posts_ids in get_user_liked_posts_batches(user, batch_size):
+        update_last_likes(
+            REMOVE_FROM_LAST_LIKES_SQL,
+            {
+                "user_id": str(user.id),
+                "posts_ids": posts_ids,
+                "contains": json.dumps([{"id": user.id}]),
+            },
+        )
+        yield len(posts_ids)
+
+
+def anonymize_user_in_last_likes(
+    user, batch_size: int = DEFAULT_BATCH_SIZE
+) -> Iterator[int]:
+    for posts_ids in get_user_liked_posts_batches(user, batch_size):
+        update_last_likes(
+            ANONYMIZE_IN_LAST_LIKES_SQL,
+            {
+                "user_id": str(user.id),
+                "username": user.username,
+                "posts_ids": posts_ids,
+                "contains": json.dumps([{"id": user.id}]),
+            },
+        )
+        yield len(posts_ids)
+
+
+def get_user_liked_posts_batches(user, batch_size: int) -> Iterator[list[int]]:
+    queryset = (
+        PostLike.objects.filter(liker=user)
+        .order_by("post_id")
+        .values_list("post_id", flat=True)
+        .distinct()
+    )
+
+    last_post_id = 0
+    while True:
+        posts_ids = list(queryset.filter(post_id__gt=last_post_id)[:batch_size])
+        if not posts_ids:
+            return
+
+        yield posts_ids
+        last_post_id = posts_ids[-1]
+
+
+def update_last_likes(sql: str, params: dict):
+    with connection.cursor() as cursor:
+        cursor.execute(sql.format(table=Post._meta.db_table), params)
+
+
+def anonymize_user_events(user) -> int:
+    return Post.objects.filter(
+        is_event=True,
+        event_type__in=ANONYMIZABLE_EVENTS,
+        event_context__user__id=user.id,
+    ).update(
+        event_context={
+            "user": {
+                "id": None,
+                "username": user.username,
+                "url": reverse("misago:index"),
+            }
+        }
+    )
+
+
+def delete_user_threads(user, batch_size: int) -> Iterator[int]:
+    queryset = Thread.objects.filter(starter=user).order_by("id")
+
+    while True:
+        with transaction.atomic():
+            threads = list(queryset[:batch_size])
+            if not threads:
+                return
+
+            send_delete_signals("delete_thread", threads)
+            Thread.objects.filter(id__in=[t.id for t in threads]).delete()
+            synchronize_categories(set(t.category_id for t in threads))
+
+        yield len(threads)
+
+
+def delete_user_posts(user, batch_size: int) -> Iterator[int]:
+    queryset = Post.objects.filter(poster=user).order_by("id")
+
+    while True:
+        with transaction.atomic():
+            posts = list(queryset[:batch_size])
+            if not posts:
+                return
+
+            threads_ids = set(p.thread_id for p in posts)
+            categories_ids = set(p.category_id for p in posts)
+
+            send_delete_signals("delete_post", posts)
+            Post.objects.filter(id__in=[p.id for p in posts]).delete()
+
+            # Threads that were left without posts are deleted with them
+            empty_threads = Thread.objects.filter(id__in=threads_ids).exclude(
+                Exists(Post.objects.filter(thread=OuterRef("pk")))
+            )
+            send_delete_signals("delete_thread", empty_threads)
+            empty_threads.delete()
+
+            synchronize_threads(threads_ids)
+            synchronize_categories(categories_ids)
+
+        yield len(posts)
+
+
+def send_delete_signals(signal_name: str, instances):
+    from . import signals
+
+    signal = getattr(signals, signal_name)
+    if signal.has_listeners():
+        for instance in instances:
+            signal.send(sender=instance)
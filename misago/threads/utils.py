@@ -2,7 +2,7 @@ from urllib.parse import urlparse
 
 from django.urls import Resolver404, resolve
 
-from .models import PostLike
+from .likes import get_liked_posts_ids
 
 
 def add_categories_to_items(root_category, categories, items):
@@ -20,15 +20,9 @@ def add_likes_to_posts(user, posts):
     if user.is_anonymous:
         return
 
-    posts_map = {}
+    liked_posts_ids = get_liked_posts_ids(user, [post.id for post in posts])
     for post in posts:
-        posts_map[post.id] = post
-        post.is_liked = False
-
-    queryset = PostLike.objects.filter(liker=user, post_id__in=posts_map.keys())
-
-    for like in queryset.values("post_id"):
-        posts_map[like["post_id"]].is_liked = True
+        post.is_liked = post.id in liked_posts_ids
 
 
 SUPPORTED_THREAD_ROUTES = {
@@ -10,6 +10,7 @@ from ...notifications.models import WatchedThread
 from ...notifications.threads import get_watched_threads
 from ...readtracker import threadstracker
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.readstate import exclude_read_posts, filter_read_posts
 from ..models import Post, Thread
 from ..participants import make_participants_aware
 from ..permissions import exclude_invisible_posts, exclude_invisible_threads
@@ -239,7 +240,7 @@ def filter_read_threads_queryset(request, categories, list_type, queryset):
 
     queryset = queryset.filter(id__in=visible_posts.distinct().values("thread"))
 
-    read_posts = visible_posts.filter(id__in=request.user.postread_set.values("post"))
+    read_posts = filter_read_posts(request.user, visible_posts)
 
     if list_type == "new":
         # new threads have no entry in reads table
@@ -247,9 +248,7 @@ def filter_read_threads_queryset(request, categories, list_type, queryset):
 
     if list_type == "unread":
         # unread threads were read in past but have new posts
-        unread_posts = visible_posts.exclude(
-            id__in=request.user.postread_set.values("post")
-        )
+        unread_posts = exclude_read_posts(request.user, visible_posts)
         queryset = queryset.filter(id__in=read_posts.distinct().values("thread"))
         queryset = queryset.filter(id__in=unread_posts.distinct().values("thread"))
         return queryset
@@ -1,16 +1,33 @@
+import mimetypes
+from urllib.parse import quote
+
 from django.templatetags.static import static
 from django.core.exceptions import PermissionDenied
-from django.http import Http404
+from django.http import FileResponse, Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
+from django.utils.cache import patch_vary_headers
+from django.utils.http import content_disposition_header
 
 from ...conf import settings
+from ...core.utils import accepts_webp
+from ..attachmenttypescache import get_attachment_types_download_roles
+from ..attachmentvariants import THUMBNAIL_WEBP, WEBP
 from ..models import Attachment, AttachmentType
 
+REDIRECT = "redirect"
+X_ACCEL_REDIRECT = "x-accel-redirect"
+X_SENDFILE = "x-sendfile"
+STREAM = "stream"
+
 
 def attachment_server(request, pk, secret, thumbnail=False):
     try:
-        url = serve_file(request, pk, secret, thumbnail)
-        return redirect(url)
+        attachment, filename = serve_file(request, pk, secret, thumbnail)
+        response = send_file(attachment, filename)
+        if attachment.is_image:
+            # WebP variant is served to clients accepting it
+            patch_vary_headers(response, ["Accept"])
+        return response
     except PermissionDenied:
         error_image = request.settings.attachment_403_image
         if not error_image:
@@ -36,13 +53,72 @@ def serve_file(request, pk, secret, thumbnail):
         allow_file_download(request, attachment)
 
     if attachment.is_image:
+        variant = get_webp_variant(request, attachment, thumbnail)
+        if variant:
+            return attachment, variant["name"]
+
         if thumbnail and attachment.thumbnail:
-            return attachment.thumbnail.url
-        return attachment.image.url
+            return attachment, attachment.thumbnail.name
+        return attachment, attachment.image.name
 
     if thumbnail:
         raise Http404()
-    return attachment.file.url
+    return attachment, attachment.file.name
+
+
+def get_webp_variant(request, attachment, thumbnail):
+    if not attachment.variants or not accepts_webp(request):
+        return None
+
+    if thumbnail:
+        return attachment.variants.get(THUMBNAIL_WEBP)
+
+    # Lossy copy of full image is only served instead of original if enabled
+    if settings.MISAGO_ATTACHMENT_WEBP_FULL_IMAGES:
+        return attachment.variants.get(WEBP)
+
+    return None
+
+
+def send_file(attachment, filename):
+    if attachment.is_image:
+        storage = attachment.image.storage
+    else:
+        storage = attachment.file.storage
+
+    # Stored file may be thumbnail or variant in other format than original
+    content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+
+    serve_mode = settings.MISAGO_ATTACHMENT_SERVE_MODE
+    if serve_mode == STREAM:
+        try:
+            file = storage.open(filename, "rb")
+        except FileNotFoundError:
+            raise Http404()
+
+        response = FileResponse(
+            file,
+            as_attachment=attachment.is_file,
+            filename=attachment.filename,
+            content_type=content_type,
+        )
+    elif serve_mode in (X_ACCEL_REDIRECT, X_SENDFILE):
+        response = HttpResponse(content_type=content_type)
+        if serve_mode == X_ACCEL_REDIRECT:
+            internal_url = settings.MISAGO_ATTACHMENT_INTERNAL_URL.rstrip("/")
+            response["X-Accel-Redirect"] = "%s/%s" % (internal_url, quote(filename))
+        else:
+            response["X-Sendfile"] = storage.path(filename)
+        if attachment.is_file:
+            response["Content-Disposition"] = content_disposition_header(
+                True, attachment.filename
+            )
+    else:
+        return redirect(storage.url(filename))
+
+    # Files are served after permission check, so they can't be cached publicly
+    response["Cache-Control"] = "private"
+    return response
 
 
 def allow_file_download(request, attachment):
@@ -54,7 +130,8 @@ def allow_file_download(request, attachment):
         if not request.user_acl["can_download_other_users_attachments"]:
             raise PermissionDenied()
 
-    allowed_roles = set(r.pk for r in attachment.filetype.limit_downloads_to.all())
+    download_roles = get_attachment_types_download_roles(request.cache_versions)
+    allowed_roles = download_roles.get(attachment.filetype_id)
     if allowed_roles:
         user_roles = set(r.pk for r in request.user.get_roles())
         if not user_roles & allowed_roles:
@@ -7,6 +7,7 @@ from django.utils.translation import pgettext
 from django.views import View
 
 from ...readtracker.cutoffdate import get_cutoff_date
+from ...readtracker.readstate import get_post_is_read_expression
 from ..permissions import exclude_invisible_posts
 from ..viewmodels import ForumThread, PrivateThread
 
@@ -91,7 +92,7 @@ class GetFirstUnreadPostMixin:
         if user.is_authenticated:
             cutoff_date = get_cutoff_date(self.request.settings, user)
             expired_posts = Q(posted_on__lt=cutoff_date)
-            read_posts = Q(id__in=user.postread_set.values("post"))
+            read_posts = get_post_is_read_expression(user)
 
             first_unread = (
                 posts_queryset.exclude(expired_posts | read_posts)
@@ -4,6 +4,9 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 
 from ...conf import settings
+from ..lookup import lookup_users
+
+MENTION_SUGGESTIONS = 10
 
 User = get_user_model()
 
@@ -14,11 +17,8 @@ def mention_suggestions(request):
 
     query = request.query_params.get("q", "").lower().strip()[:100]
     if query:
-        queryset = User.objects.filter(slug__startswith=query, is_active=True).order_by(
-            "slug"
-        )[:10]
-
-        for user in queryset:
+        queryset = User.objects.filter(is_active=True)
+        for user in lookup_users(query, MENTION_SUGGESTIONS, queryset=queryset):
             try:
                 avatar = user.avatars[-1]["url"]
             except IndexError:
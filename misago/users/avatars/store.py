@@ -1,4 +1,5 @@
 import os
+from concurrent.futures import ThreadPoolExecutor
 from hashlib import md5
 from io import BytesIO
 
@@ -24,33 +25,63 @@ def delete_avatar(user, delete_tmp=True, delete_src=True):
 
     for avatar in user.avatar_set.all():
         avatar.image.delete(save=False)
+        if avatar.webp_image:
+            avatar.webp_image.delete(save=False)
     user.avatar_set.all().delete()
 
 
 def store_avatar(user, image):
+    """Stores avatar in all sizes set in MISAGO_AVATARS_SIZES.
+
+    Image is decoded once and every size is resized from it in parallel
+    threads, then all avatars are inserted in single query.
+    """
     from ..models import Avatar
 
     image = normalize_image(image)
+    sizes = sorted(settings.MISAGO_AVATARS_SIZES, reverse=True)
+
+    def render_avatar(size):
+        avatar = Avatar(user=user, size=size)
+        resized_image = image.resize((size, size), Resampling.LANCZOS)
+        avatar.image.save("avatar", render_png(resized_image), save=False)
+        if settings.MISAGO_AVATARS_WEBP:
+            avatar.webp_image.save(
+                "avatar.webp", render_webp(resized_image), save=False
+            )
+        return avatar
 
-    avatars = []
-    for size in sorted(settings.MISAGO_AVATARS_SIZES, reverse=True):
-        image_stream = BytesIO()
-
-        image = image.resize((size, size), Resampling.LANCZOS)
-        image.save(image_stream, "PNG")
+    if len(sizes) > 1 and settings.MISAGO_AVATARS_THREADS > 1:
+        with ThreadPoolExecutor(settings.MISAGO_AVATARS_THREADS) as executor:
+            avatars = list(executor.map(render_avatar, sizes))
+    else:
+        avatars = [render_avatar(size) for size in sizes]
 
-        avatars.append(
-            Avatar.objects.create(
-                user=user,
-                size=size,
-                image=ContentFile(image_stream.getvalue(), "avatar"),
-            )
-        )
+    Avatar.objects.bulk_create(avatars)
 
-    user.avatars = [{"size": a.size, "url": a.url} for a in avatars]
+    user.avatars = [get_avatar_data(a) for a in avatars]
     user.save(update_fields=["avatars"])
 
 
+def render_png(image):
+    image_stream = BytesIO()
+    image.save(image_stream, "PNG")
+    return ContentFile(image_stream.getvalue())
+
+
+def render_webp(image):
+    image_stream = BytesIO()
+    image.save(image_stream, "WEBP", quality=settings.MISAGO_AVATARS_WEBP_QUALITY)
+    return ContentFile(image_stream.getvalue())
+
+
+def get_avatar_data(avatar):
+    data = {"size": avatar.size, "url": avatar.url}
+    if avatar.webp_image:
+        data["webp"] = avatar.webp_image.url
+    return data
+
+
 def store_new_avatar(user, image, delete_tmp=True, delete_src=True):
     delete_avatar(user, delete_tmp=delete_tmp, delete_src=delete_src)
     store_avatar(user, image)
@@ -80,7 +111,8 @@ def store_original_avatar(user):
 def upload_to(instance, filename):
     spread_path = md5(get_random_string(64).encode()).hexdigest()
     secret = get_random_string(32)
-    filename_clean = "%s.png" % get_random_string(32)
+    extension = os.path.splitext(filename)[1] or ".png"
+    filename_clean = "%s%s" % (get_random_string(32), extension)
 
     return os.path.join(
         "avatars", spread_path[:2], spread_path[2:4], secret, filename_clean
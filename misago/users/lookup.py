@@ -0,0 +1,61 @@
+from typing import Optional
+
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, IntegerField, Q, Value, When, Window
+from django.db.models.functions import RowNumber
+
+from .utils import slugify_username
+
+User = get_user_model()
+
+PREFIX_MATCH = 0
+SUBSTRING_MATCH = 1
+
+
+def lookup_users(
+    query: str,
+    prefix_limit: int,
+    substring_limit: int = 0,
+    queryset: Optional[object] = None,
+) -> list:
+    """Returns users with slugs matching query in single ranked query.
+
+    Up to prefix_limit users with slugs starting with query come first,
+    followed by up to substring_limit users with slugs containing it.
+    Both groups are ordered by slug. Lookups are served by trigram index
+    on user's slug.
+    """
+    slug = slugify_username(query)
+    if not slug:
+        return []
+
+    if queryset is None:
+        queryset = User.objects.all()
+
+    if not substring_limit:
+        return list(
+            queryset.filter(slug__startswith=slug).order_by("slug")[:prefix_limit]
+        )
+
+    queryset = (
+        queryset.filter(slug__contains=slug)
+        .annotate(
+            match=Case(
+                When(slug__startswith=slug, then=Value(PREFIX_MATCH)),
+                default=Value(SUBSTRING_MATCH),
+                output_field=IntegerField(),
+            )
+        )
+        .annotate(
+            match_position=Window(
+                RowNumber(), partition_by=[F("match")], order_by=F("slug").asc()
+            )
+        )
+        .filter(
+            Q(match=PREFIX_MATCH, match_position__lte=prefix_limit)
+            | Q(match=SUBSTRING_MATCH, match_position__lte=substring_limit)
+        )
+        .order_by("match", "slug")
+    )
+
+    return list(queryset)
@@ -0,0 +1,21 @@
+import misago.users.avatars.store
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("misago_users", "0027_user_slug_trgm"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="avatar",
+            name="webp_image",
+            field=models.ImageField(
+                blank=True,
+                max_length=255,
+                null=True,
+                upload_to=misago.users.avatars.store.upload_to,
+            ),
+        ),
+    ]
@@ -8,6 +8,9 @@ class Avatar(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     size = models.PositiveIntegerField(default=0)
     image = models.ImageField(max_length=255, upload_to=store.upload_to)
+    webp_image = models.ImageField(
+        max_length=255, blank=True, null=True, upload_to=store.upload_to
+    )
 
     @property
     def url(self):
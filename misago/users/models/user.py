@@ -6,6 +6,7 @@ from django.contrib.auth.models import AnonymousUser as DjangoAnonymousUser
 from django.contrib.auth.models import PermissionsMixin
 from django.contrib.auth.models import UserManager as BaseUserManager
 from django.contrib.postgres.fields import ArrayField, HStoreField
+from django.contrib.postgres.indexes import GinIndex
 from django.core.mail import send_mail
 from django.db import models
 from django.db.models import Q
@@ -294,6 +295,11 @@ class User(AbstractBaseUser, PluginDataModel, PermissionsMixin):
                 fields=["is_deleting_account"],
                 condition=Q(is_deleting_account=True),
             ),
+            GinIndex(
+                name="misago_user_slug_trgm",
+                fields=["slug"],
+                opclasses=["gin_trgm_ops"],
+            ),
         ]
 
     def clean(self):
@@ -435,7 +441,7 @@ class User(AbstractBaseUser, PluginDataModel, PermissionsMixin):
 
                 from ..signals import username_changed
 
-                username_changed.send(sender=self)
+                username_changed.send(sender=self, old_username=old_username)
 
                 return namechange
 
@@ -3,8 +3,8 @@ from django.core.exceptions import PermissionDenied
 from django.utils.translation import pgettext, pgettext_lazy
 
 from ..search import SearchProvider
+from .lookup import lookup_users
 from .serializers import UserCardSerializer
-from .utils import slugify_username
 
 HEAD_RESULTS = 8
 TAIL_RESULTS = 8
@@ -38,23 +38,11 @@ class SearchUsers(SearchProvider):
 
 
 def search_users(**filters):
-    queryset = User.objects.order_by("slug").select_related(
-        "rank", "ban_cache", "online_tracker"
-    )
+    queryset = User.objects.select_related("rank", "ban_cache", "online_tracker")
 
     if not filters.get("search_disabled", False):
         queryset = queryset.filter(is_active=True)
 
-    username = slugify_username(filters.get("username", ""))
-
-    results = []
-
-    # lets grab head and tail results:
-    results += list(queryset.filter(slug__startswith=username)[:HEAD_RESULTS])
-    results += list(
-        queryset.filter(slug__contains=username).exclude(
-            pk__in=[r.pk for r in results]
-        )[:TAIL_RESULTS]
+    return lookup_users(
+        filters.get("username", ""), HEAD_RESULTS, TAIL_RESULTS, queryset=queryset
     )
-
-    return results
@@ -2,7 +2,7 @@ from pathlib import Path
 from unittest.mock import Mock
 
 from django.core.exceptions import ValidationError
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.crypto import get_random_string
 from PIL import Image
 
@@ -88,6 +88,59 @@ class AvatarsStoreTests(TestCase):
             with self.assertRaises(Avatar.DoesNotExist):
                 Avatar.objects.get(pk=removed_avatar.pk)
 
+    @override_settings(MISAGO_AVATARS_THREADS=1)
+    def test_store_without_threads(self):
+        """store stores avatar sizes when threads are disabled"""
+        user = create_test_user("User", "user@example.com")
+
+        test_image = Image.new("RGBA", (100, 100), 0)
+        store.store_new_avatar(user, test_image)
+
+        user.refresh_from_db()
+        self.assertEqual(
+            [avatar["size"] for avatar in user.avatars],
+            sorted(settings.MISAGO_AVATARS_SIZES, reverse=True),
+        )
+
+        store.delete_avatar(user)
+
+    def test_store_resizes_every_size_from_source_image(self):
+        """store resizes every avatar size from source image"""
+        user = create_test_user("User", "user@example.com")
+
+        test_image = Image.new("RGBA", (500, 500), 0)
+        store.store_new_avatar(user, test_image)
+
+        for avatar in user.avatar_set.all():
+            with Image.open(avatar.image.path) as image:
+                self.assertEqual(image.size, (avatar.size, avatar.size))
+                self.assertEqual(image.format, "PNG")
+            self.assertFalse(avatar.webp_image)
+
+        store.delete_avatar(user)
+
+    @override_settings(MISAGO_AVATARS_WEBP=True)
+    def test_store_webp(self):
+        """store stores webp avatars alongside png ones"""
+        user = create_test_user("User", "user@example.com")
+
+        test_image = Image.new("RGBA", (100, 100), 0)
+        store.store_new_avatar(user, test_image)
+
+        user.refresh_from_db()
+        webp_paths = []
+        for avatar in user.avatar_set.all():
+            with Image.open(avatar.webp_image.path) as image:
+                self.assertEqual(image.format, "WEBP")
+            webp_paths.append(Path(avatar.webp_image.path))
+
+        for avatar in user.avatars:
+            self.assertTrue(avatar["webp"].endswith(".webp"))
+
+        store.delete_avatar(user)
+        for webp_path in webp_paths:
+            self.assertFalse(webp_path.exists())
+
 
 class AvatarSetterTests(TestCase):
     def setUp(self):
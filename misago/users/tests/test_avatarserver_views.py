@@ -31,6 +31,25 @@ class AvatarServerTests(TestCase):
         self.assertEqual(response.status_code, 302)
         self.assertEqual(response["location"], self.user.avatars[0]["url"])
 
+    def test_get_user_webp_avatar(self):
+        """avatar server redirects browser accepting webp to webp avatar"""
+        self.user.avatars[1]["webp"] = "/media/avatar.webp"
+        self.user.save()
+
+        avatar_url = reverse(
+            "misago:user-avatar", kwargs={"pk": self.user.pk, "size": 200}
+        )
+
+        response = self.client.get(avatar_url, HTTP_ACCEPT="image/webp,*/*")
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], "/media/avatar.webp")
+        self.assertIn("Accept", response["vary"])
+
+        response = self.client.get(avatar_url)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], self.user.avatars[1]["url"])
+        self.assertIn("Accept", response["vary"])
+
     def test_get_notfound_user_avatar(self):
         """avatar server handles deleted user avatar requests"""
         avatar_url = reverse(
@@ -0,0 +1,57 @@
+from ..lookup import lookup_users
+from ..models import User
+from ..test import create_test_user
+
+
+def create_users(*usernames):
+    return [
+        create_test_user(username, "%s@example.com" % username.lower())
+        for username in usernames
+    ]
+
+
+def test_lookup_returns_users_with_slugs_starting_with_query(db):
+    bob, bobby, _ = create_users("Bob", "Bobby", "Tobob")
+    assert lookup_users("bob", 10) == [bob, bobby]
+
+
+def test_lookup_normalizes_query(db):
+    (user,) = create_users("Bob_Ross")
+    assert lookup_users(" BOB_ro ", 10) == [user]
+
+
+def test_lookup_limits_prefix_matches(db):
+    bob, _, bobbie = create_users("Bob", "Bobby", "Bobbie")
+    assert lookup_users("bob", 2) == [bob, bobbie]
+
+
+def test_lookup_returns_prefix_matches_before_substring_matches(db):
+    tobob, bob, abob = create_users("Tobob", "Bob", "Abob")
+    assert lookup_users("bob", 10, 10) == [bob, abob, tobob]
+
+
+def test_lookup_limits_prefix_and_substring_matches_separately(db):
+    create_users("Bob", "Bobby", "Bobbie", "Abob", "Tobob", "Zbob")
+
+    results = lookup_users("bob", 2, 2)
+    assert [user.slug for user in results] == ["bob", "bobbie", "abob", "tobob"]
+
+
+def test_lookup_uses_single_query(db, django_assert_num_queries):
+    create_users("Bob", "Bobby", "Abob")
+
+    with django_assert_num_queries(1):
+        lookup_users("bob", 2, 2)
+
+
+def test_lookup_filters_given_queryset(db):
+    bob, bobby = create_users("Bob", "Bobby")
+    User.objects.filter(id=bobby.id).update(is_active=False)
+
+    queryset = User.objects.filter(is_active=True)
+    assert lookup_users("bob", 10, 10, queryset=queryset) == [bob]
+
+
+def test_lookup_returns_nothing_for_empty_query(db):
+    create_users("Bob")
+    assert lookup_users("  ", 10, 10) == []
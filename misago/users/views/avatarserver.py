@@ -1,8 +1,10 @@
 from django.contrib.auth import get_user_model
 from django.shortcuts import redirect
 from django.templatetags.static import static
+from django.utils.cache import patch_vary_headers
 
 from ...conf import settings
+from ...core.utils import accepts_webp
 
 User = get_user_model()
 
@@ -19,7 +21,15 @@ def user_avatar(request, pk, size):
     for avatar in user.avatars:
         if avatar["size"] >= size:
             found_avatar = avatar
-    return redirect(found_avatar["url"])
+
+    if found_avatar.get("webp") and accepts_webp(request):
+        response = redirect(found_avatar["webp"])
+    else:
+        response = redirect(found_avatar["url"])
+
+    # WebP avatar is served to clients accepting it
+    patch_vary_headers(response, ["Accept"])
+    return response
 
 
 def blank_avatar(request):